@@ -0,0 +1,60 @@
+"""
+Updates per second of a bar graph of 5000 bars with a brush per bar, whose heights change on every update (as in
+`bargraph_pg`): a new `BarGraphItem` added to the plot each time, compared to a persistent `BarsItem` updated in place.
+Each update is painted; the time of the update itself (without painting) is also given.
+"""
+import time
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtWidgets import QApplication
+
+from sdupy.vis.bars import BarsItem
+
+BARS = 5000
+UPDATES = 50
+
+app = QApplication.instance() or QApplication([])
+
+rng = np.random.default_rng(0)
+x = np.arange(BARS)
+heights = rng.uniform(0, 1, (UPDATES, BARS))
+brushes = [pg.intColor(i, BARS) for i in range(BARS)]
+
+
+def run(update):
+    widget = pg.PlotWidget()
+    widget.resize(1000, 600)
+    widget.show()
+    state = {}
+    update_time = 0
+    start = time.perf_counter()
+    for i in range(UPDATES):
+        t = time.perf_counter()
+        update(widget.getPlotItem(), state, heights[i])
+        update_time += time.perf_counter() - t
+        app.processEvents()
+        widget.grab()  # paint synchronously
+    elapsed = time.perf_counter() - start
+    widget.close()
+    return UPDATES / elapsed, update_time / UPDATES
+
+
+def recreate(plot_item, state, height):
+    if 'item' in state:
+        plot_item.removeItem(state['item'])
+    state['item'] = pg.BarGraphItem(x=x, height=height, width=0.8, brushes=brushes)
+    plot_item.addItem(state['item'])
+
+
+def in_place(plot_item, state, height):
+    if 'item' not in state:
+        state['item'] = BarsItem()
+        plot_item.addItem(state['item'])
+    state['item'].set_bars(x=x, height=height, width=0.8, brushes=brushes)
+
+
+for name, update in [('new item', recreate), ('updated in place', in_place)]:
+    rate, update_time = run(update)
+    print("{} bars, {:16s}: {:6.1f} updates/s ({:6.2f} ms per update without painting)".format(
+        BARS, name, rate, update_time * 1e3))
@@ -0,0 +1,44 @@
+"""
+Recompute time after changing one column of a wide reactive DataFrame: column-level notifications vs. observing
+the whole frame.
+"""
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+
+from sdupy.pyreactive import reactive, wait_for_var
+from sdupy.pyreactive.wrappers.pandas import DataFrame
+
+ROWS = 10000000
+COLUMNS = 8
+
+
+@reactive
+def column_mean(column):
+    return column.mean()
+
+
+@reactive
+def frame_column_mean(df, name):
+    return df[name].mean()
+
+
+async def measure(make_results):
+    df = DataFrame(pd.DataFrame({str(i): np.random.rand(ROWS) for i in range(COLUMNS)}))
+    results = make_results(df)
+    start = time.perf_counter()
+    df['0'] = np.random.rand(ROWS)
+    await wait_for_var()
+    return time.perf_counter() - start, results
+
+
+async def main():
+    t, _ = await measure(lambda df: [column_mean(df[str(i)]) for i in range(COLUMNS)])
+    print("column-level: {:8.3f} ms".format(t * 1e3))
+    t, _ = await measure(lambda df: [frame_column_mean(df, str(i)) for i in range(COLUMNS)])
+    print("whole frame:  {:8.3f} ms".format(t * 1e3))
+
+
+asyncio.run(main())
@@ -0,0 +1,34 @@
+"""
+Throughput of the headless export (`sdupy.export`) of a window with a plot and an image driven by a frame counter, to a
+PNG sequence compressed in a thread pool and in a single thread. Run with `QT_QPA_PLATFORM=offscreen`.
+"""
+import asyncio
+import tempfile
+
+import numpy as np
+
+FRAMES = 100
+
+
+async def main():
+    import sdupy
+    from sdupy import vis
+    from sdupy.export import PngSequenceSink, export_frames, sweep
+
+    window = sdupy.window("export benchmark")
+    window.resize(1280, 720)
+    frame = sdupy.var(0)
+    t = np.linspace(0, 10, 10000)
+    vis.plot_pg("plot", sdupy.reactive(lambda i: np.sin(t + i / 10))(frame))
+    vis.image_pg("image", sdupy.reactive(lambda i: np.random.default_rng(i).integers(0, 255, (512, 512), np.uint8))(frame))
+
+    for workers in [None, 1]:
+        with tempfile.TemporaryDirectory() as directory:
+            stats = await export_frames(window, sweep(frame, range(FRAMES)), PngSequenceSink(directory, max_workers=workers))
+        print("{} PNG workers: {:6.1f} FPS (per frame: settle {:5.1f} ms, grab {:5.1f} ms, waiting for the sink {:5.1f} ms)"
+              .format(workers or 'all', stats.fps, stats.settle_time / stats.frames * 1e3,
+                      stats.grab_time / stats.frames * 1e3, stats.wait_time / stats.frames * 1e3))
+    window.close()
+
+
+asyncio.run(main())
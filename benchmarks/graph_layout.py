@@ -0,0 +1,72 @@
+"""
+Drawing a graph with `vis.graph` internals: construction of the items for graphs with given positions up to 100k nodes
+(all labeled), and the layout of a graph without positions from scratch, warm-started after adding a node and from the
+cache.
+
+`networkx.spring_layout` needs scipy for graphs of 500 nodes or more.
+"""
+import gc
+import importlib
+import time
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtWidgets import QApplication
+
+from sdupy.pyreactive import unwrap
+
+graph = importlib.import_module('sdupy.vis.graph')  # `sdupy.vis.graph` is also a function
+
+app = QApplication.instance() or QApplication([])
+
+
+def make_nodes(size, with_pos):
+    rng = np.random.default_rng(0)
+    positions = rng.uniform(0, 100, (size, 2))
+    neighbours = rng.integers(0, size, (size, 2))
+    nodes = {}
+    for i in range(size):
+        nodes[i] = dict(edges=neighbours[i].tolist(), label='node {}'.format(i))
+        if with_pos:
+            nodes[i]['pos'] = positions[i]
+    return nodes
+
+
+def draw(widget, nodes):
+    start = time.perf_counter()
+    graph_item = graph._draw_graph(nodes, [], widget)
+    unwrap(graph_item)
+    app.processEvents()
+    widget.grab()  # paint synchronously
+    return graph_item, time.perf_counter() - start
+
+
+def make_widget():
+    widget = pg.PlotWidget()
+    widget.item = widget.getPlotItem()
+    widget.resize(1000, 800)
+    widget.show()
+    return widget
+
+
+for size in [1000, 10000, 100000]:
+    widget = make_widget()
+    item, elapsed = draw(widget, make_nodes(size, with_pos=True))
+    print("{:7d} nodes with positions: {:8.1f} ms".format(size, elapsed * 1e3))
+    del item
+    gc.collect()  # release the items while the widget still exists
+    widget.close()
+
+for size in [200, 450]:
+    widget = make_widget()
+    nodes = make_nodes(size, with_pos=False)
+    item, cold = draw(widget, nodes)
+    nodes = dict(nodes)
+    nodes[size] = dict(edges=[0], label='new')
+    item, warm = draw(widget, nodes)
+    item, cached = draw(widget, nodes)
+    print("{:7d} nodes layout: from scratch {:8.1f} ms, one node added {:8.1f} ms, cached {:8.1f} ms".format(
+        size, cold * 1e3, warm * 1e3, cached * 1e3))
+    del item
+    gc.collect()  # release the items while the widget still exists
+    widget.close()
@@ -0,0 +1,71 @@
+"""
+Work done for widgets that are hidden: 20 widgets, each showing the result of a chain of 3 reactive stages of one source
+var, with all of them visible, half of them hidden and all of them hidden. Counts the stage calls and the notifications
+per change of the source. Run with `QT_QPA_PLATFORM=offscreen`.
+"""
+import asyncio
+import time
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication, QWidget
+
+WIDGETS = 20
+STAGES = 3
+CHANGES = 50
+
+
+async def main():
+    from sdupy.pyreactive import reactive, var, wait_for_var
+    from sdupy.widgets.helpers import trigger_if_visible
+
+    app = QApplication.instance() or QApplication([])
+    calls = [0]
+    notifications = [0]
+
+    @reactive
+    def stage(a):
+        calls[0] += 1
+        return np.sqrt(a + 1)
+
+    source = var(np.zeros(10 ** 5))
+    widgets, triggers = [], []
+    for _ in range(WIDGETS):
+        result = source
+        for _ in range(STAGES):
+            result = stage(result)
+        widget = QWidget()
+        widget.resize(100, 100)
+        widget.show()
+        trigger = trigger_if_visible(result, widget)
+        notify = trigger._notifier.notify_func
+
+        def counting_notify(notify=notify):
+            notifications[0] += 1
+            return notify()
+
+        trigger._notifier.notify_func = counting_notify
+        widgets.append(widget)
+        triggers.append(trigger)
+    app.processEvents()
+    await wait_for_var()
+
+    for hidden in [0, WIDGETS // 2, WIDGETS]:
+        for i, widget in enumerate(widgets):
+            widget.setVisible(i >= hidden)
+        app.processEvents()
+        await wait_for_var()
+        calls[0] = notifications[0] = 0
+        start = time.perf_counter()
+        for i in range(CHANGES):
+            source.set(np.full(10 ** 5, i))
+            await wait_for_var()
+            app.processEvents()
+        elapsed = time.perf_counter() - start
+        print("{:2d} of {} widgets hidden: {:6.1f} stage calls, {:6.1f} notifications, {:6.2f} ms per change".format(
+            hidden, WIDGETS, calls[0] / CHANGES, notifications[0] / CHANGES, elapsed / CHANGES * 1e3))
+
+    for widget in widgets:
+        widget.close()
+
+
+asyncio.run(main())
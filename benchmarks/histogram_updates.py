@@ -0,0 +1,50 @@
+"""
+Updates of `HistogramItem` (as in `histogram_pg`): changing only the number of bins of a histogram of 3*10^7 values, and
+appending chunks of 10^5 values to a growing stream, compared to recomputing `np.histogram` over all the data.
+"""
+import time
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+from sdupy.vis.histogram import HistogramItem
+
+SIZE = 3 * 10 ** 7
+CHUNK = 10 ** 5
+CHUNKS = 100
+
+app = QApplication.instance() or QApplication([])
+
+data = np.random.default_rng(0).normal(size=SIZE)
+bin_counts = [10, 20, 50, 100, 200, 500]
+
+start = time.perf_counter()
+for bins in bin_counts:
+    np.histogram(data, bins)
+full = (time.perf_counter() - start) / len(bin_counts)
+
+item = HistogramItem()
+item.set_histogram(data, bin_counts[0])
+start = time.perf_counter()
+item.set_histogram(data, bin_counts[1], data_changed=False)  # sorts the data
+first = time.perf_counter() - start
+start = time.perf_counter()
+for bins in bin_counts[2:]:
+    item.set_histogram(data, bins, data_changed=False)
+rebinned = (time.perf_counter() - start) / (len(bin_counts) - 2)
+print("changing bins of {} values: np.histogram {:8.1f} ms, sorted {:8.3f} ms (first rebinning {:8.1f} ms)".format(
+    SIZE, full * 1e3, rebinned * 1e3, first * 1e3))
+
+stream = data[:CHUNK * CHUNKS]
+start = time.perf_counter()
+for i in range(1, CHUNKS + 1):
+    np.histogram(stream[:i * CHUNK], 100, (-5, 5))
+full = (time.perf_counter() - start) / CHUNKS
+
+item = HistogramItem()
+start = time.perf_counter()
+for i in range(1, CHUNKS + 1):
+    item.set_histogram(stream[:i * CHUNK], 100, (-5, 5), append_only=True)
+incremental = (time.perf_counter() - start) / CHUNKS
+print("appending chunks of {} values (up to {}): np.histogram {:8.1f} ms, incremental {:8.3f} ms".format(
+    CHUNK, CHUNK * CHUNKS, full * 1e3, incremental * 1e3))
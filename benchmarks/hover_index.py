@@ -0,0 +1,47 @@
+"""
+Hit-testing the point under the mouse cursor with `GridIndex` (as in the hover handling of `vis.graph`) compared to
+pyqtgraph's `ScatterPlotItem.pointsAt`, for up to a million points.
+"""
+import time
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtWidgets import QApplication
+
+from sdupy.widgets.point_index import GridIndex
+
+QUERIES = 100
+
+app = QApplication.instance() or QApplication([])
+
+for size in [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]:
+    rng = np.random.default_rng(0)
+    points = rng.uniform(0, 1000, (size, 2))
+    queries = rng.uniform(0, 1000, (QUERIES, 2))
+
+    widget = pg.PlotWidget()
+    widget.resize(1000, 800)
+    widget.show()
+    scatter = pg.ScatterPlotItem(pos=points, size=10)
+    widget.addItem(scatter)
+    app.processEvents()
+    widget.grab()
+    view_box = widget.getPlotItem().getViewBox()
+
+    start = time.perf_counter()
+    for x, y in queries:
+        scatter.pointsAt(pg.Point(x, y))
+    points_at = (time.perf_counter() - start) / QUERIES
+
+    index = GridIndex(points)
+    start = time.perf_counter()
+    index.near(0, 0, 5)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    for x, y in queries:
+        index.near(x, y, 5, view_box.viewPixelSize())
+    near = (time.perf_counter() - start) / QUERIES
+
+    print("{:8d} points: pointsAt {:8.3f} ms, GridIndex {:6.3f} ms (built in {:7.1f} ms)".format(
+        size, points_at * 1e3, near * 1e3, build * 1e3))
+    widget.close()
@@ -0,0 +1,46 @@
+"""
+Peak memory allocated per frame when converting a BGR frame for display and rendering it with pyqtgraph, for the previous
+conversion (fancy indexing, i.e. a copy) and the current one (strided views).
+"""
+import tracemalloc
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtWidgets import QApplication
+
+from sdupy.vis import image_to_mpl, image_to_pg
+
+app = QApplication.instance() or QApplication([])
+
+
+def image_to_mpl_copying(image):
+    return image[..., [2, 1, 0]]
+
+
+def image_to_pg_copying(image):
+    return np.transpose(np.flip(image_to_mpl_copying(image), axis=0), axes=(1, 0, 2))
+
+
+def allocated_mb(func):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def render(item, image):
+    item.setImage(image, autoLevels=False, levels=(0, 255))
+    item.render()
+
+
+frame = np.random.randint(0, 255, (2048, 2048, 3), dtype=np.uint8)
+item = pg.ImageItem()
+render(item, image_to_pg(frame))  # allocate the buffers reused by pyqtgraph
+
+print("frame size:                    {:7.1f} MB".format(frame.nbytes / 2 ** 20))
+print("image_to_mpl, copying:         {:7.1f} MB".format(allocated_mb(lambda: image_to_mpl_copying(frame))))
+print("image_to_mpl, view:            {:7.1f} MB".format(allocated_mb(lambda: image_to_mpl(frame))))
+print("image_to_pg + render, copying: {:7.1f} MB".format(allocated_mb(lambda: render(item, image_to_pg_copying(frame)))))
+print("image_to_pg + render, view:    {:7.1f} MB".format(allocated_mb(lambda: render(item, image_to_pg(frame)))))
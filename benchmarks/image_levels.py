@@ -0,0 +1,70 @@
+"""
+Per-frame GUI-thread cost of showing 16-bit 4k frames with auto-levels in `PgImage` (the widget of `vis.image_pg_adv`:
+sampled levels and a histogram computed in a background thread) compared to a plain `pg.ImageView` (levels and histogram
+computed on the GUI thread).
+"""
+import time
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtWidgets import QApplication
+
+from sdupy.widgets.image_levels import estimate_levels, sampled_histogram
+
+HEIGHT, WIDTH = 2160, 3840
+FRAMES = 20
+
+
+def make_frames():
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 4096, (HEIGHT, WIDTH), dtype=np.uint16) for i in range(4)]
+    for frame in frames:
+        frame[rng.integers(0, HEIGHT, 10), rng.integers(0, WIDTH, 10)] = 65535  # hot pixels
+    return frames
+
+
+def measure(view, frames):
+    view.resize(1200, 800)
+    view.show()
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        view.setImage(frames[i % len(frames)].copy(), autoLevels=True, autoRange=False)  # a new frame, not cached
+        QApplication.processEvents()
+    return (time.perf_counter() - start) / FRAMES
+
+
+def main():
+    import sdupy
+    from sdupy import vis
+    from sdupy.widgets.pyqtgraph import PgImage
+
+    frames = make_frames()
+    window = sdupy.window("image levels benchmark")
+    view = vis.widget("image", PgImage, window=window)
+    print("PgImage:      {:6.1f} ms per frame, levels: {}".format(measure(view, frames) * 1e3, view.getLevels()))
+    window.close()
+
+    view = pg.ImageView()
+    print("pg.ImageView: {:6.1f} ms per frame, levels: {}".format(measure(view, frames) * 1e3, view.getLevels()))
+
+    # the levels and the histogram alone
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        frame = frames[i % len(frames)].copy()
+        view.quickMinMax(frame)
+        view.imageItem.getHistogram()
+    print("pg.ImageView levels and histogram: {:6.1f} ms per frame".format((time.perf_counter() - start) / FRAMES * 1e3))
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        frame = frames[i % len(frames)].copy()
+        estimate_levels(frame)
+        sampled_histogram(frame)
+    print("sampled levels and histogram:      {:6.1f} ms per frame".format((time.perf_counter() - start) / FRAMES * 1e3))
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        frame = frames[i % len(frames)].copy()
+    print("(copying the frame:                {:6.1f} ms)".format((time.perf_counter() - start) / FRAMES * 1e3))
+    view.close()
+
+
+main()
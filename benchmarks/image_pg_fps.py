@@ -0,0 +1,61 @@
+"""
+Frames per second of a 2k x 2k image stream shown with `vis.image_pg` (a persistent `ImageItem` updated in place),
+compared to creating a new `ImageItem` for each frame.
+"""
+import asyncio
+import time
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+SIZE = 2048
+FRAMES = 30
+
+
+def make_image_item(image):
+    # a new item for each frame, as `vis.image_pg` did before updating a persistent item
+    from pyqtgraph import ImageItem
+    from sdupy.vis._helpers import levels_for
+
+    item = ImageItem(image, autoRange=False, autoLevels=False, axisOrder='row-major', levels=levels_for(image))
+    item.setAutoDownsample(True)
+    return item
+
+
+async def measure(window, image, frames):
+    from sdupy.pyreactive import wait_for_var
+
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        image.set(frames[i % len(frames)])
+        await wait_for_var()
+        window.render_scheduler.flush()
+        QApplication.processEvents()
+    return FRAMES / (time.perf_counter() - start)
+
+
+async def main():
+    import sdupy
+    from sdupy import vis
+    from sdupy.pyreactive import reactive
+
+    for dtype in [np.uint8, np.uint16]:
+        frames = [np.random.randint(0, np.iinfo(dtype).max, (SIZE, SIZE), dtype=dtype) for i in range(4)]
+
+        # each case has its own window, so that the widgets have the same size
+        window = sdupy.window("image_pg benchmark - persistent {}".format(dtype.__name__))
+        image = sdupy.var(frames[0])
+        vis.image_pg("image", image, window=window)
+        fps = await measure(window, image, frames)
+        print("{:6s} persistent item: {:6.1f} FPS".format(dtype.__name__, fps))
+        window.close()
+
+        window = sdupy.window("image_pg benchmark - new item {}".format(dtype.__name__))
+        image = sdupy.var(frames[0])
+        vis.draw_pg("image", 'image', [reactive(make_image_item)(image)], window=window)
+        fps = await measure(window, image, frames)
+        print("{:6s} new item:        {:6.1f} FPS".format(dtype.__name__, fps))
+        window.close()
+
+
+asyncio.run(main())
@@ -0,0 +1,65 @@
+"""
+Updating an overlay of many rectangles of which one has moved: `pg_hold_items` (as in `draw_pg`), which removes all the
+items and adds the new ones, compared to `KeyedItems` (as in `draw_pg(..., keyed=True)`), which replaces only the moved
+one.
+"""
+import gc
+import time
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtWidgets import QApplication, QGraphicsRectItem
+
+from sdupy.pyreactive import unwrap
+from sdupy.vis._helpers import KeyedItems, pg_hold_items
+
+UPDATES = 20
+
+app = QApplication.instance() or QApplication([])
+
+
+def make_rect(x, y):
+    item = QGraphicsRectItem(x, y, 1, 1)
+    item.setPen(pg.mkPen('y'))
+    return item
+
+
+def measure(update, size):
+    widget = pg.PlotWidget()
+    widget.resize(1000, 800)
+    widget.show()
+    rng = np.random.default_rng(0)
+    items = {i: make_rect(*rng.uniform(0, 100, 2)) for i in range(size)}
+    state = update(widget.getPlotItem(), items, None)
+    app.processEvents()
+    start = time.perf_counter()
+    for i in range(UPDATES):
+        items = dict(items)
+        items[i] = make_rect(*rng.uniform(0, 100, 2))  # one rectangle has moved
+        state = update(widget.getPlotItem(), items, state)
+        widget.grab()
+    elapsed = (time.perf_counter() - start) / UPDATES
+    del state
+    gc.collect()  # release the items while the widget still exists
+    widget.close()
+    return elapsed
+
+
+def hold_all(plot_item, items, held):
+    held = held or [None]
+    held[0] = None
+    gc.collect()  # the previous items are removed when the previous call is released
+    held[0] = pg_hold_items(plot_item, *items.values())
+    unwrap(held[0])
+    return held
+
+
+def keyed(plot_item, items, holder):
+    holder = holder or KeyedItems(plot_item)
+    holder.update(items)
+    return holder
+
+
+for size in [1000, 5000, 20000]:
+    print("{:6d} rectangles, one moved: remove-all/add-all {:8.1f} ms, keyed {:8.1f} ms".format(
+        size, measure(hold_all, size) * 1e3, measure(keyed, size) * 1e3))
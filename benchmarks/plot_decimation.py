@@ -0,0 +1,61 @@
+"""
+Zoom latency of a long signal shown with `DecimatedPlotDataItem` (as in `plot_pg(..., decimate=True)`) compared to a
+`PlotDataItem` with pyqtgraph's own peak downsampling and clipping to the view, for visible spans covering six orders of
+magnitude. Pass the number of samples as the argument (10**8 by default).
+"""
+import sys
+import time
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtWidgets import QApplication
+
+from sdupy.vis.decimation import DecimatedPlotDataItem
+
+SIZE = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 8
+REPEATS = 5
+APPEND = 10 ** 5
+
+app = QApplication.instance() or QApplication([])
+
+
+def measure(item, set_data, signal):
+    widget = pg.PlotWidget()
+    widget.resize(1000, 600)
+    widget.show()
+    widget.addItem(item)
+    start = time.perf_counter()
+    set_data(signal)
+    widget.autoRange()
+    app.processEvents()
+    widget.grab()
+    print("{:12s} first frame: {:8.1f} ms".format(type(item).__name__, (time.perf_counter() - start) * 1e3))
+    rng = np.random.default_rng(0)
+    span = SIZE
+    while span >= SIZE / 10 ** 6:
+        start = time.perf_counter()
+        for i in range(REPEATS):
+            x = rng.uniform(0, SIZE - span)
+            widget.setXRange(x, x + span, padding=0)
+            app.processEvents()
+            widget.grab()  # paint synchronously
+        print("    span {:12d}: {:8.1f} ms".format(int(span), (time.perf_counter() - start) / REPEATS * 1e3))
+        span /= 10
+    widget.close()
+
+
+signal = np.cumsum(np.random.default_rng(1).normal(size=SIZE)).astype(np.float32)
+signal[::SIZE // 7] = 10 * np.abs(signal).max()  # single-sample peaks that must stay visible
+
+decimated = DecimatedPlotDataItem()
+measure(decimated, decimated.set_signal, signal)
+start = time.perf_counter()
+for i in range(REPEATS):
+    decimated.pyramid.append(signal[:APPEND])
+print("appending {} samples to the pyramid: {:.1f} ms".format(
+    APPEND, (time.perf_counter() - start) / REPEATS * 1e3))
+
+plain = pg.PlotDataItem()
+plain.setDownsampling(auto=True, method='peak')
+plain.setClipToView(True)
+measure(plain, plain.setData, signal)
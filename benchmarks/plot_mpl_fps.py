@@ -0,0 +1,32 @@
+"""
+Frames per second of `vis.plot_mpl` when the plotted data changes, for various numbers of points. A frame is the update
+of the reactive graph followed by the (idle) redraw of the canvas.
+"""
+import asyncio
+import time
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+
+async def main():
+    import sdupy
+    from sdupy import vis
+    from sdupy.pyreactive import wait_for_var
+
+    sdupy.window("plot_mpl benchmark")
+    FRAMES = 20
+    for n in [10000, 100000, 1000000]:
+        y = sdupy.var(np.random.randn(n).cumsum())
+        vis.plot_mpl("plot {}".format(n), y, label="random")
+        await wait_for_var()
+        QApplication.processEvents()
+        start = time.perf_counter()
+        for i in range(FRAMES):
+            y.set(np.random.randn(n).cumsum())
+            await wait_for_var()
+            QApplication.processEvents()
+        print("{:8d} points: {:7.1f} FPS".format(n, FRAMES / (time.perf_counter() - start)))
+
+
+asyncio.run(main())
@@ -0,0 +1,63 @@
+"""
+Frame time of 10 curves fed with 10 kHz each at 60 FPS, shown with `StreamingPlotDataItem` (as in
+`plot_pg(..., stream=True, max_samples=...)`) compared to recreating the curves from the whole history each frame (as
+`plot_pg` without `stream` does). A frame must take less than 16.7 ms.
+"""
+import time
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtWidgets import QApplication
+
+from sdupy.vis.streaming import StreamingPlotDataItem
+
+CURVES = 10
+RATE = 10000
+FPS = 60
+SECONDS = 5
+WINDOW = 2 * RATE  # samples shown by each streaming curve
+
+app = QApplication.instance() or QApplication([])
+
+
+def run(name, update):
+    widget = pg.PlotWidget()
+    widget.resize(1000, 600)
+    widget.show()
+    rng = np.random.default_rng(0)
+    history = np.zeros((CURVES, 0))
+    per_frame = RATE // FPS
+    times = []
+    for frame in range(SECONDS * FPS):
+        history = np.concatenate([history, rng.normal(size=(CURVES, per_frame)).cumsum(axis=1)], axis=1)
+        start = time.perf_counter()
+        update(widget, history)
+        app.processEvents()  # paints the widget
+        times.append(time.perf_counter() - start)
+    widget.close()
+    times = np.array(times[FPS:])  # skip the warm-up
+    print("{:10s} mean frame: {:6.1f} ms, last second: {:6.1f} ms, frames over budget: {:.0%}".format(
+        name, times.mean() * 1e3, times[-FPS:].mean() * 1e3, np.mean(times > 1 / FPS)))
+
+
+streams = []
+
+
+def update_streams(widget, history):
+    if not streams:
+        for i in range(CURVES):
+            streams.append(StreamingPlotDataItem(WINDOW, pen=(i, CURVES)))
+            widget.addItem(streams[-1])
+            streams[-1].enable_downsampling()
+    for item, y in zip(streams, history):
+        item.set_stream(y)
+
+
+def update_rebuild(widget, history):
+    widget.clear()
+    for i, y in enumerate(history):
+        widget.plot(y, pen=(i, CURVES))
+
+
+run('streaming', update_streams)
+run('rebuild', update_rebuild)
@@ -0,0 +1,74 @@
+"""
+Pan/zoom latency and peak memory when showing a huge memory-mapped 16-bit image with `PyramidImageItem` compared to a
+plain `ImageItem` (which is what `image_pg_adv` uses). Pass the image size as the argument (16384 by default; the plain
+path needs a few times the image size of memory).
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtWidgets import QApplication
+
+from sdupy.widgets.pyramid_image import PyramidImageItem
+
+SIZE = int(sys.argv[1]) if len(sys.argv) > 1 else 16384
+ZOOMS = 10
+
+app = QApplication.instance() or QApplication([])
+
+
+def make_image(path):
+    image = np.lib.format.open_memmap(path, mode='w+', dtype=np.uint16, shape=(SIZE, SIZE))
+    for row in range(0, SIZE, 1024):
+        image[row:row + 1024] = np.random.randint(0, 4096, (min(1024, SIZE - row), SIZE), dtype=np.uint16)
+    image.flush()
+    return np.load(path, mmap_mode='r')
+
+
+def settle(widget, item):
+    app.processEvents()
+    while isinstance(item, PyramidImageItem) and item.pending_tiles():
+        time.sleep(0.001)
+        app.processEvents()
+    widget.grab()  # paint synchronously
+
+
+def measure(image, item, set_image):
+    widget = pg.PlotWidget()
+    widget.resize(1000, 800)
+    widget.show()
+    widget.addItem(item)
+    tracemalloc.start()
+    start = time.perf_counter()
+    set_image(image)
+    widget.autoRange()
+    settle(widget, item)
+    first = time.perf_counter() - start
+    rng = np.random.default_rng(0)
+    start = time.perf_counter()
+    for i in range(ZOOMS):
+        size = SIZE / 2 ** rng.integers(0, 8)
+        x, y = rng.uniform(0, SIZE - size, 2)
+        widget.setRange(xRange=(x, x + size), yRange=(y, y + size), padding=0)
+        settle(widget, item)
+    zoom = (time.perf_counter() - start) / ZOOMS
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    widget.close()
+    return first, zoom, peak
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    image = make_image(os.path.join(tmp, 'image.npy'))
+    for name, item, set_image in [
+        ('pyramid', PyramidImageItem(), lambda im: item.setImage(im)),
+        ('ImageItem', pg.ImageItem(axisOrder='row-major'), lambda im: item.setImage(im, levels=(0, 4095))),
+    ]:
+        first, zoom, peak = measure(image, item, set_image)
+        print("{:10s} first frame: {:8.1f} ms, pan/zoom: {:8.1f} ms, peak numpy memory: {:8.1f} MB".format(
+            name, first * 1e3, zoom * 1e3, peak / 2 ** 20))
+    del image
@@ -0,0 +1,37 @@
+"""
+Ingestion rate of `scatter_data_to_array` (used by `vis.scatter_pg`) for the supported kinds of input, and the size of
+the resulting records. Pass the number of records as the argument (10**6 by default; lists of dicts use a tenth).
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from sdupy.vis._helpers import scatter_data_to_array
+
+SIZE = int(float(sys.argv[1])) if len(sys.argv) > 1 else 10 ** 6
+
+
+def make_columns(size):
+    rng = np.random.default_rng(0)
+    labels = np.array(['cell {}'.format(i) for i in range(size)], dtype=object)
+    return dict(x=rng.normal(size=size), y=rng.normal(size=size), n=rng.integers(0, 10, size),
+                kind=rng.choice(['alpha', 'beta', 'gamma'], size), label=labels)
+
+
+def measure(name, data, size):
+    start = time.perf_counter()
+    data_ar, fields = scatter_data_to_array(data)
+    elapsed = time.perf_counter() - start
+    print("{:16s} {:10.0f} records/s, {:4d} bytes per record, fields: {}".format(
+        name, size / elapsed, data_ar.dtype.itemsize, [name for name, flags in fields]))
+    return data_ar
+
+
+columns = make_columns(SIZE)
+measure('dict of arrays', columns, SIZE)
+measure('DataFrame', pd.DataFrame(dict(columns, kind=pd.Categorical(columns['kind']))), SIZE)
+measure('structured array', scatter_data_to_array(columns)[0], SIZE)
+records = pd.DataFrame(make_columns(SIZE // 10)).to_dict('records')
+measure('list of dicts', records, len(records))
@@ -0,0 +1,18 @@
+"""
+Overhead of the version bookkeeping compared to the comparisons it replaces.
+"""
+import timeit
+
+import numpy as np
+
+from sdupy.pyreactive import var, version
+
+N = 100000
+
+v = var(0)
+print("Var.set:            {:8.3f} us".format(timeit.timeit(lambda: v.set(1), number=N) / N * 1e6))
+print("version(var):       {:8.3f} us".format(timeit.timeit(lambda: version(v), number=N) / N * 1e6))
+
+a = np.zeros(1000000)
+b = a.copy()
+print("1M-element '==':    {:8.3f} us".format(timeit.timeit(lambda: (a == b).all(), number=100) / 100 * 1e6))
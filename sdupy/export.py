@@ -0,0 +1,250 @@
+"""
+Export of windows and widgets to image files and videos, also without a display (run with `QT_QPA_PLATFORM=offscreen`).
+
+`export_frames` steps source vars through a sequence of values, waits until the change has propagated to the widgets and
+writes what they show to a `FrameSink`, e.g. a PNG sequence or a video encoded by ffmpeg. For example::
+
+    async def main():
+        w = window('report')
+        frame = var(0)
+        vis.image_pg('camera', load_frame(frame))
+        stats = await export_frames(w, sweep(frame, range(1000)), FfmpegSink('review.mp4', fps=25))
+        print(stats.fps)
+"""
+import asyncio
+import os
+import subprocess
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Iterable, List, Mapping, NamedTuple, Optional, Union
+
+import numpy as np
+from PyQt5.QtGui import QImage
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from sdupy.pyreactive import Var, wait_for_var
+from sdupy.pyreactive.refresher import get_default_refresher
+from sdupy.render_scheduler import find_render_scheduler
+
+Target = Union[QWidget, str]
+
+
+def target_widget(target: Target) -> QWidget:
+    """
+    The widget to export: the given one (e.g. a `MainWindow`) or the widget of the given name in the current window.
+    """
+    if isinstance(target, str):
+        from sdupy.windows import window
+        return window().obtain_widget(target, None)[0]
+    return target
+
+
+async def settle(widget: QWidget, max_rounds=100):
+    """
+    Wait until the changes of the vars have propagated to the widgets of the window containing `widget`: run the
+    pending notifications and the pending renders (see `RenderScheduler`) until there are none left.
+    """
+    refresher = get_default_refresher()
+    scheduler = find_render_scheduler(widget)
+    for _ in range(max_rounds):
+        await wait_for_var()
+        await asyncio.sleep(0)  # let the tasks started by the notifications run
+        QApplication.processEvents()
+        if scheduler is not None and scheduler.pending():
+            scheduler.flush()
+            continue
+        if refresher.task is None or refresher.task.done():
+            break
+
+
+def grab_image(widget: QWidget) -> QImage:
+    """
+    Render `widget` (with its children) to an image. It works also for widgets that are not shown on a screen.
+    """
+    return widget.grab().toImage().convertToFormat(QImage.Format_RGBA8888)
+
+
+def image_to_array(image: QImage) -> np.ndarray:
+    """
+    A copy of an RGBA8888 image as a `height x width x 4` array.
+    """
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    rows = np.frombuffer(bits, dtype=np.uint8).reshape(image.height(), image.bytesPerLine())
+    return rows[:, :image.width() * 4].reshape(image.height(), image.width(), 4).copy()
+
+
+async def export_image(target: Target, path: str):
+    """
+    Save what `target` shows, after the pending changes have propagated, to an image file (the format is given by the
+    extension of `path`).
+    """
+    widget = target_widget(target)
+    await settle(widget)
+    if not grab_image(widget).save(path):
+        raise IOError("cannot save the image to '{}'".format(path))
+
+
+class FrameSink:
+    """
+    Destination of the frames exported by `export_frames`. `write` is called in the GUI thread, so the slow parts (e.g.
+    compression) should be done in background threads; `close` waits for them.
+    """
+
+    def write(self, index: int, image: QImage):
+        raise NotImplementedError()
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class _PooledSink(FrameSink):
+    # runs the writes in a thread pool, with at most `max_pending` frames waiting (so the memory used is bounded)
+    def __init__(self, max_workers, max_pending):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._pending = []  # type: List[Future]
+        self.max_pending = max_pending
+        self.wait_time = 0.0  # time spent on waiting for the pool [s]
+
+    def _submit(self, func, *args):
+        for future in [f for f in self._pending if f.done()]:
+            future.result()  # raise the errors of the writes as soon as possible
+            self._pending.remove(future)
+        if len(self._pending) >= self.max_pending:
+            self._wait_for(self._pending.pop(0))
+        self._pending.append(self._executor.submit(func, *args))
+
+    def _wait_for(self, future: Future):
+        start = time.perf_counter()
+        future.result()
+        self.wait_time += time.perf_counter() - start
+
+    def close(self):
+        for future in self._pending:
+            self._wait_for(future)
+        self._pending = []
+        self._executor.shutdown()
+
+
+class PngSequenceSink(_PooledSink):
+    """
+    Writes the frames to `directory` as PNG files named with `pattern`, compressing them in `max_workers` threads.
+    """
+
+    def __init__(self, directory: str, pattern='frame_{:06d}.png', max_workers: int = None):
+        max_workers = max_workers or os.cpu_count() or 1
+        super().__init__(max_workers, max_pending=2 * max_workers)
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.pattern = pattern
+
+    def write(self, index, image):
+        self._submit(self._save, image, os.path.join(self.directory, self.pattern.format(index)))
+
+    @staticmethod
+    def _save(image: QImage, path):
+        if not image.save(path, 'PNG'):
+            raise IOError("cannot save the image to '{}'".format(path))
+
+
+class FfmpegSink(_PooledSink):
+    """
+    Pipes the frames to an `ffmpeg` process encoding them to `path` (by default with H.264). The frames are converted
+    and written to the pipe in a background thread, so the encoder runs in parallel with the rendering. All the frames
+    must have the same size.
+    """
+
+    def __init__(self, path: str, fps: float = 30, codec='libx264', pix_fmt='yuv420p', ffmpeg='ffmpeg',
+                 extra_args: Iterable[str] = (), max_pending=8):
+        super().__init__(max_workers=1, max_pending=max_pending)  # one worker keeps the order of the frames
+        self.path = path
+        self.fps = fps
+        self.codec = codec
+        self.pix_fmt = pix_fmt
+        self.ffmpeg = ffmpeg
+        self.extra_args = list(extra_args)
+        self._process = None  # type: Optional[subprocess.Popen]
+        self._size = None
+
+    def _start(self, width, height):
+        self._size = (width, height)
+        command = [self.ffmpeg, '-y', '-loglevel', 'error',
+                   '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', '{}x{}'.format(width, height), '-r', str(self.fps),
+                   '-i', '-',
+                   '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2',  # yuv420p needs even dimensions
+                   '-c:v', self.codec, '-pix_fmt', self.pix_fmt] + self.extra_args + [self.path]
+        self._process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, index, image):
+        size = (image.width(), image.height())
+        if self._process is None:
+            self._start(*size)
+        assert size == self._size, "all the frames must have the same size ({} != {})".format(size, self._size)
+        self._submit(self._write, image)
+
+    def _write(self, image: QImage):
+        self._process.stdin.write(image_to_array(image).data)
+
+    def close(self):
+        super().close()
+        if self._process is not None:
+            self._process.stdin.close()
+            if self._process.wait() != 0:
+                raise IOError("ffmpeg failed to encode '{}'".format(self.path))
+            self._process = None
+
+
+class ExportStats(NamedTuple):
+    frames: int
+    elapsed: float  # total time [s]
+    settle_time: float  # time spent on waiting for the propagation of the changes [s]
+    grab_time: float  # time spent on rendering the widgets to images [s]
+    wait_time: float  # time spent on waiting for the sink (i.e. the sink was the bottleneck) [s]
+
+    @property
+    def fps(self) -> float:
+        return self.frames / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def sweep(var: Var, values: Iterable[Any]) -> Iterable[Mapping[Var, Any]]:
+    """
+    Frames for `export_frames` setting `var` to each of `values` in turn.
+    """
+    return ({var: value} for value in values)
+
+
+async def export_frames(target: Target, frames: Iterable[Mapping[Var, Any]], sink: FrameSink,
+                        first_index=0) -> ExportStats:
+    """
+    For each of `frames` (a mapping from vars to their values), set the vars, wait until the change has propagated (see
+    `settle`) and write what `target` (e.g. a `MainWindow` or a widget name) shows to `sink`. The sink is closed at the
+    end. Return the timings of the export.
+
+    The widgets must be shown (on the `offscreen` platform nothing appears on the screen), otherwise the values they
+    show are not updated (see `TriggerIfVisible`).
+    """
+    widget = target_widget(target)
+    settle_time = grab_time = 0.0
+    count = 0
+    start = time.perf_counter()
+    with sink:
+        for index, values in enumerate(frames, first_index):
+            for var, value in values.items():
+                var.set(value)
+            t0 = time.perf_counter()
+            await settle(widget)
+            t1 = time.perf_counter()
+            image = grab_image(widget)
+            t2 = time.perf_counter()
+            sink.write(index, image)
+            settle_time += t1 - t0
+            grab_time += t2 - t1
+            count += 1
+    return ExportStats(frames=count, elapsed=time.perf_counter() - start, settle_time=settle_time,
+                       grab_time=grab_time, wait_time=getattr(sink, 'wait_time', 0.0))
@@ -8,6 +8,7 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QCloseEvent
 from PyQt5.QtWidgets import QDockWidget, QMainWindow, QMenu, QWidget
 
+from sdupy.render_scheduler import RenderScheduler
 from sdupy.utils import ignore_errors
 from . import widgets
 from .widgets.common.register import FactoryDesc
@@ -32,6 +33,7 @@ class MainWindow(QMainWindow):
         self.setWindowTitle(title)
 
         self.widgets = {}  # type: Dict[str, WidgetInstance]
+        self.render_scheduler = RenderScheduler(self)  # widgets of this window render through it
 
         self.file_menu = QMenu('&App', self)
         self.save_layout_action = self.file_menu.addAction('&Save state', ignore_errors(self.save_state_to_file),
@@ -1,11 +1,13 @@
 from sdupy.pyreactive.refresher import wait_for_var
-from .common import is_wrapper, unwrap, unwrap_exception, unwrapped, notify, updating
-from .decorators import reactive, reactive_finalizable
+from .common import is_wrapper, unwrap, unwrap_exception, unwrapped, notify, updating, version, copy_on_write
+from .decorators import Changes, reactive, reactive_finalizable
 from .var import Constant, Var, Wrapped, const, var, volatile
+from .utils import reactive_map
 
 __all__ = [
     'reactive',
     'reactive_finalizable',
+    'Changes',
     'wait_for_var',
     'is_wrapper',
     'unwrap',
@@ -19,6 +21,9 @@ __all__ = [
     'var',
     'volatile',
     'updating',
+    'copy_on_write',
+    'version',
+    'reactive_map',
 ]
 
 @reactive
@@ -41,6 +41,14 @@ class Wrapped(Generic[T]):
         """
         pass
 
+    @property
+    def __version__(self) -> int:
+        """
+        A number that is increased whenever the value may have changed (i.e. whenever the observers are notified).
+        Comparing it with a previously stored one is much cheaper than comparing the values.
+        """
+        return self.__notifier__.version
+
     def __repr__(self):
         try:
             r = repr(self.__inner__)
@@ -82,6 +90,16 @@ def unwrapped(v: Union[T, Wrapped[T]]) -> T:
         return v
 
 
+def version(v) -> int:
+    """
+    Return the version of `v` (see `Wrapped.__version__`). Non-wrapped values never change, so their version is 0.
+    """
+    if is_wrapper(v):
+        return v.__version__
+    else:
+        return 0
+
+
 # "wrapped" is in var.py
 
 def notify(v: Wrapped[T]):
@@ -94,3 +112,14 @@ def updating(v: Wrapped[T]) -> Generator[T, None, None]:
         yield unwrapped(v)
     finally:
         notify(v)
+
+
+@contextmanager
+def copy_on_write(v: Wrapped[T]) -> Generator[T, None, None]:
+    """
+    Modify a copy of the value and set it back when done. The previous value stays intact, so it can be safely shared
+    (e.g. passed as a read-only view, see `settings.readonly_arrays`).
+    """
+    value = unwrapped(v).copy()
+    yield value
+    v.__inner__ = value
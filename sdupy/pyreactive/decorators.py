@@ -6,7 +6,7 @@ import logging
 import traceback
 from contextlib import suppress
 from functools import wraps
-from typing import Callable, Iterable, Union, overload
+from typing import Any, Callable, Dict, FrozenSet, Iterable, NamedTuple, Union, overload
 
 import asyncio_extras
 
@@ -53,11 +53,33 @@ def stop_hiding_nested_calls(f: Callable):
     return wrapper
 
 
+class Changes(NamedTuple):
+    """
+    Passed as the `changes` argument to functions decorated with `@reactive(changes=True)`.
+    """
+    changed: FrozenSet[str]
+    """
+    Names of the arguments that changed since the previous successful call (all of them on the first call). Positional
+    arguments without a name (i.e. `*args`) are identified by their index converted to str. The `dep_only_args` are
+    reported by their names too and a change of any of `other_deps` as `'other_deps'`.
+    """
+    previous: Any
+    """
+    The result of the previous successful call (`None` on the first call).
+    """
+    versions: Dict[str, int]
+    """
+    Versions of the arguments in this call (see `version`), by the same names as in `changed`, e.g. to key caches of
+    values computed from arrays that may be modified in place.
+    """
+
+
 class Reactive:
-    def __init__(self, pass_args, other_deps, dep_only_args):
+    def __init__(self, pass_args, other_deps, dep_only_args, changes=False):
         self.dep_only_args = dep_only_args
         self.other_deps = other_deps
         self.pass_args = set(pass_args)
+        self.changes = changes
 
     @hide_nested_calls
     def __call__(self, func):
@@ -135,13 +157,20 @@ def reactive(f: Callable) -> Callable:
 @overload
 def reactive(pass_args: Iterable[str] = None,
              other_deps: Iterable[str] = None,
-             dep_only_args: Iterable[str] = None) -> Callable:
+             dep_only_args: Iterable[str] = None,
+             changes: bool = False) -> Callable:
     pass
 
 
 def reactive(pass_args: Iterable[str] = None,
              other_deps: Iterable[str] = None,
-             dep_only_args: Iterable[str] = None):
+             dep_only_args: Iterable[str] = None,
+             changes: bool = False):
+    """
+    :param changes: Pass a `Changes` object as the `changes` argument of the function, so it can recompute only
+                    the parts that depend on the changed arguments. The function must declare `changes=None`; it is
+                    `None` if the function is called with non-reactive arguments only.
+    """
     if callable(pass_args):
         # a shortcut that allows simple @reactive instead of @reactive()
         return reactive()(pass_args)
@@ -150,7 +179,7 @@ def reactive(pass_args: Iterable[str] = None,
     dep_only_args = set(dep_only_args or [])
     other_deps = other_deps or []
 
-    return Reactive(pass_args=pass_args, other_deps=other_deps, dep_only_args=dep_only_args)
+    return Reactive(pass_args=pass_args, other_deps=other_deps, dep_only_args=dep_only_args, changes=changes)
 
 
 @overload
@@ -161,7 +190,8 @@ def reactive_finalizable(f: Callable) -> Callable:
 @overload
 def reactive_finalizable(pass_args: Iterable[str] = None,
                          other_deps: Iterable[str] = None,
-                         dep_only_args: Iterable[str] = None) -> Callable:
+                         dep_only_args: Iterable[str] = None,
+                         changes: bool = False) -> Callable:
     pass
 
 
@@ -194,7 +224,14 @@ class ReactiveCm(Reactive):
 def reactive_finalizable(pass_args: Iterable[str] = None,
                          other_deps: Iterable[str] = None,
                          dep_only_args: Iterable[str] = None,
-                         ):
+                         changes: bool = False):
+    """
+    Like `reactive`, but decorates a generator that yields the result once, like for `contextlib.contextmanager`. The
+    rest of the generator is run when the result is not needed anymore: before the next call (when the arguments have
+    changed) or when the result is released (also when the new arguments are errors). The value of the `yield`
+    expression of a (non-async) generator tells which one it is (True before the next call), so that e.g. the resources
+    can be reused by the next call (they are the `previous` result of `changes`, see `reactive`).
+    """
     if callable(pass_args):
         # a shortcut that allows simple @reactive instead of @reactive()
         return reactive_finalizable()(pass_args)
@@ -203,7 +240,7 @@ def reactive_finalizable(pass_args: Iterable[str] = None,
     dep_only_args = set(dep_only_args or [])
     other_deps = other_deps or []
 
-    deco = ReactiveCm(pass_args, dep_only_args, other_deps)
+    deco = ReactiveCm(pass_args=pass_args, other_deps=other_deps, dep_only_args=dep_only_args, changes=changes)
 
     def wrap(f):
         if inspect.isasyncgenfunction(f):
@@ -24,6 +24,7 @@ class DummyNotifier:
     def __init__(self, priority):
         self.priority = priority
         self.name = 'dummy'
+        self.version = 0
 
     def add_observer(self, notifier: 'Notifier'):
         pass
@@ -92,6 +93,7 @@ class Notifier:
         assert is_notify_func(notify_func)
         self.notify_func = notify_func
         self.calls = 0
+        self.version = 0  # increased on every notification; compare with a stored value to detect changes
         self.stats = dict()
         self.frame = None
         all_notifiers.add(self)
@@ -102,6 +104,7 @@ class Notifier:
 
     def notify_observers(self):
         self.calls += 1
+        self.version += 1
         for observer in self._observers:
             get_default_refresher().schedule_call(observer)
 
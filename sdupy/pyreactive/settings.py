@@ -4,3 +4,17 @@ Log all exceptions in reactive evaluation immediately. Normally they are silentl
 """
 
 HIDE_IRREVELANT_STACK_FRAMES = True
+
+readonly_arrays = False
+"""
+Pass numpy arrays unwrapped from reactive arguments as read-only views, so they can be shared between reactive
+functions without defensive copies. Use `copy_on_write()` to modify such an array.
+"""
+
+detect_array_mutations = False
+"""
+Log an error when a numpy array passed to a reactive function was modified in place without notifying the observers
+(e.g. without `notify()`, `updating()` or `copy_on_write()`). It checksums every array argument, so use it for debugging
+only. Since nothing notices such a modification, it is detected only when the function is called again (e.g. because
+another argument has changed).
+"""
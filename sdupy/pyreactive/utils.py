@@ -1,10 +1,13 @@
-from typing import Iterable
+from typing import Any, Callable, Hashable, Iterable
 
+from sdupy.pyreactive.common import version
 from sdupy.pyreactive.decorators import reactive
 from sdupy.pyreactive.var import NotInitializedError, volatile, SilentError
 
 
 def bind_vars(*settable_vars, readonly_vars=tuple()):
+    written_versions = dict()  # id(var) -> version of the var just after we have set it
+
     def set_if_inequal(var_to_set, new_value):
         try:
             is_equal = (var_to_set.__inner__ == new_value)
@@ -17,12 +20,20 @@ def bind_vars(*settable_vars, readonly_vars=tuple()):
             pass
         var_to_set.__inner__ = new_value
 
-    @reactive
-    def set_all(value):
+    @reactive(pass_args=['source'], dep_only_args=['source_dep'])
+    def set_all(source):
+        if written_versions.get(id(source)) == version(source):
+            return  # it's only an echo of our own change; don't compare the (possibly big) values
+        try:
+            value = source.__inner__
+        except Exception as e:
+            raise SilentError() from e
         for var in settable_vars:
-            set_if_inequal(var, value)
+            if var is not source:
+                set_if_inequal(var, value)
+                written_versions[id(var)] = version(var)
 
-    return [volatile(set_all(var)) for var in tuple(settable_vars) + tuple(readonly_vars)]
+    return [volatile(set_all(var, source_dep=var)) for var in tuple(settable_vars) + tuple(readonly_vars)]
 
 
 def none_if_error(v):
@@ -64,3 +75,34 @@ def silence_error(func):
             raise SilentError() from e
 
     return wrapped
+
+
+def reactive_map(func: Callable[[Any], Any], collection, key: Callable[[Any], Hashable] = None):
+    """
+    Apply `func` to every element of the (reactive) `collection` and return a reactive list of the results.
+
+    One result is cached per key and `func` is called again only for elements that are new or changed (i.e. the
+    element under the given key is not the same object as before). Results for keys that disappeared are dropped.
+
+    :param key: A function returning a key for an element; the position in the collection is used if not given.
+    """
+    cache = dict()  # key -> (element, result)
+
+    @reactive
+    def map_all(collection):
+        new_cache = dict()
+        results = []
+        for index, element in enumerate(collection):
+            element_key = key(element) if key is not None else index
+            cached = cache.get(element_key)
+            if cached is not None and cached[0] is element:
+                result = cached[1]
+            else:
+                result = func(element)
+            new_cache[element_key] = (element, result)
+            results.append(result)
+        cache.clear()
+        cache.update(new_cache)
+        return results
+
+    return map_all(collection)
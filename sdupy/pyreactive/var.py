@@ -1,6 +1,8 @@
 import asyncio
 import inspect
 import logging
+import weakref
+import zlib
 from abc import abstractmethod
 from builtins import NotImplementedError
 from contextlib import contextmanager, suppress
@@ -9,10 +11,12 @@ from itertools import chain
 from traceback import FrameSummary, format_stack, format_list
 from typing import Any, Dict, List, Set, Tuple, TypeVar, Generic, Sequence
 
+import numpy as np
+
 from sdupy.pyreactive.decorators import HideStackHelper, hide_nested_calls, stop_hiding_nested_calls
 from . import settings
-from .common import Wrapped, is_wrapper, unwrapped
-from .decorators import DecoratedFunction, reactive
+from .common import Wrapped, is_wrapper, unwrapped, version
+from .decorators import Changes, DecoratedFunction, reactive
 from .forwarder import ConstForwarders, MutatingForwarders
 from .notifier import DummyNotifier, Notifier, ScopedName
 
@@ -190,10 +194,13 @@ class ArgsHelper:
             except Exception as e:
                 raise Exception('during binding {}{}'.format(callable.__name__, signature)) from e
             args_names = list(signature.parameters)
+            positional_names = [name for name, parameter in signature.parameters.items()
+                                if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD)]
 
             self.args = bound_args.args
             self.kwargs = bound_args.kwargs
-            self.args_names = args_names[0:len(self.args)]
+            # the arguments collected by `*args` have no names
+            self.args_names = positional_names[0:len(self.args)]
             self.args_names += [None] * (len(self.args) - len(self.args_names))
             self.kwargs_indices = [(args_names.index(name) if name in args_names else None)
                                    for name in self.kwargs.keys()]
@@ -210,13 +217,42 @@ class ArgsHelper:
         return ((index, name, arg) for index, (name, arg) in zip(self.kwargs_indices, self.kwargs.items()))
 
 
+_array_checksums = weakref.WeakKeyDictionary()  # type: Dict[Notifier, Tuple[int, int, int]]
+
+
+def _check_array_mutation(arg: Wrapped, array: np.ndarray, arg_name: str, func_name: str):
+    if array.dtype.hasobject or isinstance(arg.__notifier__, DummyNotifier):
+        return
+    checksum = zlib.crc32(np.ascontiguousarray(array).data)
+    current = (arg.__version__, id(array), checksum)
+    previous = _array_checksums.get(arg.__notifier__)
+    if previous is not None and previous[:2] == current[:2] and previous[2] != checksum:
+        logging.error("array passed as '{}' to '{}' was modified in place without notifying observers"
+                      .format(arg_name, func_name))
+    _array_checksums[arg.__notifier__] = current
+
+
+def unwrapped_arg(arg, arg_name='', func_name=''):
+    """
+    Unwrap an argument for a reactive function (see `settings.readonly_arrays` and `settings.detect_array_mutations`).
+    """
+    value = unwrapped(arg)
+    if isinstance(value, np.ndarray) and is_wrapper(arg):
+        if settings.detect_array_mutations:
+            _check_array_mutation(arg, value, arg_name, func_name)
+        if settings.readonly_arrays and value.flags.writeable:
+            value = value.view()
+            value.flags.writeable = False
+    return value
+
+
 def rewrap_args(args_helper: ArgsHelper, pass_args, func_name) -> Tuple[List[Any], Dict[str, Any]]:
     def rewrap(index, name, arg):
         try:
             if index in pass_args or name in pass_args:
                 return arg
             else:
-                return unwrapped(arg)
+                return unwrapped_arg(arg, name or str(index), func_name)
         except Exception as exception:
             e = ArgEvalError(name or str(index), func_name)
             e.__cause__ = exception
@@ -266,6 +302,11 @@ class Proxy(Wrapped[T], ConstForwarders, MutatingForwarders):
     def __inner__(self) -> T:
         return self._other_var.__inner__
 
+    @property
+    def __version__(self) -> int:
+        # don't wait until our notifier is called by the refresher
+        return self._other_var.__version__
+
     def __getattr__(self, item):
         return getattr(self._target().__inner__, item)
 
@@ -503,9 +544,11 @@ class ReactiveProxy(LazySwitchableProxy):
         self.decorated = decorated  # type: DecoratedFunction
 
         # use dep_only_args
+        self._dep_only_args = {}  # name -> arg (or a list of them), for `Changes`
         for name in decorated.decorator.dep_only_args:
             if name in kwargs:
                 arg = kwargs[name]  # fixme use "pop"
+                self._dep_only_args[name] = arg
 
                 if isinstance(arg, (list, tuple)):
                     for a in arg:
@@ -523,6 +566,10 @@ class ReactiveProxy(LazySwitchableProxy):
         self.args = self.args_helper.args
         self.kwargs = self.args_helper.kwargs
         self._update_in_progress = False
+        # used with @reactive(changes=True)
+        self._seen_versions = None  # type: Dict[str, int]  # versions of arguments at the last successful call
+        self._pending_versions = None  # type: Dict[str, int]
+        self._last_result = None
 
         observe_args(self.args_helper, self.decorated.decorator.pass_args, self._args_notifier)
 
@@ -556,6 +603,8 @@ class ReactiveProxy(LazySwitchableProxy):
         try:
             # self._update_in_progress = True
             args, kwargs = rewrap_args(self.args_helper, self.decorated.decorator.pass_args, self.__notifier__.name)
+            if self.decorated.decorator.changes:
+                self._pass_changes(args, kwargs)
             res = self.decorated.really_call(args, kwargs)
             # self._update_in_progress = False
             # print(f"exit {self.__notifier__.name} {id(self)}")
@@ -565,6 +614,36 @@ class ReactiveProxy(LazySwitchableProxy):
             # print(f"error {self.__notifier__.name} {id(self)}")
             raise
 
+    def _arg_versions(self) -> Dict[str, int]:
+        pass_args = self.decorated.decorator.pass_args
+        versions = {name or str(index): version(arg)
+                    for index, name, arg in chain(self.args_helper.iterate_args(), self.args_helper.iterate_kwargs())
+                    if index not in pass_args and name not in pass_args and name != 'changes'}
+        # versions never decrease, so the sum of them changes whenever one of them does
+        for name, arg in self._dep_only_args.items():
+            versions[name] = sum(version(a) for a in arg) if isinstance(arg, (list, tuple)) else version(arg)
+        if self.decorated.decorator.other_deps:
+            versions['other_deps'] = sum(version(dep) for dep in self.decorated.decorator.other_deps)
+        return versions
+
+    def _pass_changes(self, args: List[Any], kwargs: Dict[str, Any]):
+        versions = self._arg_versions()
+        if self._seen_versions is None:
+            changed = frozenset(versions)
+        else:
+            changed = frozenset(name for name, v in versions.items() if self._seen_versions.get(name) != v)
+        self._pending_versions = versions
+        changes = Changes(changed=changed, previous=self._last_result, versions=versions)
+        if 'changes' in self.args_helper.args_names:
+            args[self.args_helper.args_names.index('changes')] = changes
+        else:
+            kwargs['changes'] = changes
+
+    def _call_succeeded(self, res):
+        if self.decorated.decorator.changes:
+            self._seen_versions = self._pending_versions
+            self._last_result = res
+
     @abstractmethod
     def _update(self, retval=None):
         pass
@@ -575,6 +654,7 @@ class SyncReactiveProxy(ReactiveProxy):
         with self._handle_exception(reraise=True):
             res = self._call()
             self._set_ref(res)
+            self._call_succeeded(res)
         return retval
 
 
@@ -583,6 +663,7 @@ class AsyncReactiveProxy(ReactiveProxy):
         with self._handle_exception(reraise=True):
             res = await self._call()
             self._set_ref(res)
+            self._call_succeeded(res)
         return retval
 
 
@@ -592,22 +673,40 @@ class CmReactiveProxy(ReactiveProxy):
         self.cm = None
 
     def _update(self, retval=None):
-        self._cleanup()
-
         with self._handle_exception(reraise=True):
-            self.cm = self._call()
+            try:
+                cm = self._call()  # evaluates the arguments; the body of the generator isn't run yet
+            except Exception:
+                self._cleanup()  # there will be no next call to reuse the previous result
+                raise
+            self._cleanup(rerun=True)
+            self.cm = cm
             res = self.cm.__enter__()
             self._set_ref(res)
+            self._call_succeeded(res)
         return retval
 
     def __del__(self):
         self._cleanup()
 
-    def _cleanup(self):
+    def _cleanup(self, rerun=False):
+        """
+        Finalize the result of the previous call. For the generators of `reactive_finalizable`, `rerun` becomes the
+        value of the `yield` expression.
+        """
         try:
             if self.cm:
-                self.cm.__exit__(None, None, None)
-                self.cm = None
+                cm, self.cm = self.cm, None
+                gen = getattr(cm, 'gen', None)  # the generator of `contextlib.contextmanager`
+                if gen is None:
+                    cm.__exit__(None, None, None)
+                else:
+                    try:
+                        gen.send(rerun)
+                    except StopIteration:
+                        pass
+                    else:
+                        raise RuntimeError("generator didn't stop")
         except Exception:
             logging.exception("ignoring exception in cleanup")
 
@@ -624,6 +723,7 @@ class AsyncCmReactiveProxy(ReactiveProxy):
             self.cm = self._call()
             res = await self.cm.__aenter__()
             self._set_ref(res)
+            self._call_succeeded(res)
         return retval
 
     def __del__(self):
@@ -1,10 +1,43 @@
+import logging
+from contextlib import suppress
+
+import numpy as np
 from matplotlib import pyplot as plt
+from matplotlib.artist import Artist
 
 from .. import reactive_finalizable
 from ..var import Wrapper
 from ..wrapping import getter, reactive_setter
 
 
+def _artists(plot_res):
+    if isinstance(plot_res, (list, tuple)):
+        for i in plot_res:
+            yield from _artists(i)
+    elif isinstance(plot_res, Artist):
+        yield plot_res
+
+
+def _figure_widget(axes: plt.Axes):
+    canvas = axes.get_figure().canvas
+    widget = canvas.parentWidget() if hasattr(canvas, 'parentWidget') else None
+    return widget if hasattr(widget, 'invalidate_background') else None
+
+
+def redraw(axes: plt.Axes, full=True):
+    """
+    Redraw the figure containing `axes`. Unless `full` is set, only the animated artists are redrawn if the figure
+    widget supports it (see `Figure.set_blit`).
+    """
+    widget = _figure_widget(axes)
+    if widget is not None:
+        if full:
+            widget.invalidate_background()
+        widget.draw()
+    else:
+        axes.get_figure().canvas.draw_idle()
+
+
 def default_remove_plot(plot_res, axes: plt.Axes):
     if isinstance(plot_res, list) or isinstance(plot_res, tuple):
         for i in plot_res:
@@ -24,22 +57,163 @@ def remove_plot_hist2d(plot_res, axes: plt.Axes):
     plot_res[3].remove()
 
 
-def plot_method(unbound_method, remove_func=default_remove_plot):
-    @reactive_finalizable()
-    def wrapped(self, *args, **kwargs):
-        res = unbound_method(self, *args, **kwargs)
-        figure = self.get_figure()
-        assert figure is not None
-        canvas = figure.canvas
-        canvas.draw_idle()
-        yield res
+def _same_kwargs(a: dict, b: dict):
+    if a.keys() != b.keys():
+        return False
+    for k, v in a.items():
+        if v is b[k]:
+            continue
+        try:
+            if not bool(v == b[k]):
+                return False
+        except Exception:  # e.g. arrays with an ambiguous truth value
+            return False
+    return True
+
+
+def _split_fmt(args):
+    if args and isinstance(args[-1], str):
+        return args[:-1], args[-1]
+    return args, None
+
+
+def update_plot(plot_res, axes: plt.Axes, prev_args, *args, **kwargs):
+    if len(plot_res) != 1:
+        return False
+    data, fmt = _split_fmt(args)
+    if _split_fmt(prev_args)[1] != fmt or len(data) not in (1, 2) or len(data) != len(_split_fmt(prev_args)[0]):
+        return False
+    y = np.asarray(data[-1])
+    if y.ndim != 1:
+        return False
+    x = np.asarray(data[0]) if len(data) == 2 else np.arange(len(y))
+    plot_res[0].set_data(x, y)
+    return True
+
+
+def update_imshow(plot_res, axes: plt.Axes, prev_args, X, *args, **kwargs):
+    X = np.asarray(X)
+    if args or X.shape != plot_res.get_array().shape and 'extent' not in kwargs:
+        return False  # the default extent depends on the shape
+    plot_res.set_data(X)
+    if X.ndim == 2 and not {'norm', 'vmin', 'vmax'} & kwargs.keys():
+        plot_res.autoscale()
+    return True
+
+
+def update_axvline(plot_res, axes: plt.Axes, prev_args, x=0, *args, **kwargs):
+    if args != tuple(prev_args[1:]):
+        return False
+    plot_res.set_xdata([x, x])
+    return True
+
+
+def update_axhline(plot_res, axes: plt.Axes, prev_args, y=0, *args, **kwargs):
+    if args != tuple(prev_args[1:]):
+        return False
+    plot_res.set_ydata([y, y])
+    return True
+
+
+def update_scatter(plot_res, axes: plt.Axes, prev_args, x, y, *args, s=None, c=None, **kwargs):
+    if args or len(prev_args) != 2:
+        return False
+    if c is not None:
+        c = np.asarray(c)
+        if plot_res.get_array() is None or not np.issubdtype(c.dtype, np.number) or c.ndim != 1:
+            return False
+    plot_res.set_offsets(np.column_stack([np.ravel(x), np.ravel(y)]))
+    if s is not None:
+        plot_res.set_sizes(np.atleast_1d(s))
+    if c is not None:
+        plot_res.set_array(c)
+        if not {'norm', 'vmin', 'vmax'} & kwargs.keys():
+            plot_res.autoscale()
+    return True
+
+
+class PlotHolder:
+    """
+    Keeps the result of a plot method between updates, so that the artists can be updated in place (keeping their
+    identity, style and legend entries) instead of being removed and plotted again.
+    """
+
+    def __init__(self, unbound_method, remove_func, update_func, data_kwargs):
+        self.unbound_method = unbound_method
+        self.remove_func = remove_func
+        self.update_func = update_func
+        self.data_kwargs = frozenset(data_kwargs)
+        self.res = None
+        self.axes = None  # type: plt.Axes
+        self.args = None
+        self.kwargs = None
+
+    def _style_kwargs(self, kwargs):
+        return {k: v for k, v in kwargs.items() if k not in self.data_kwargs}
+
+    def _given_data_kwargs(self, kwargs):
+        return {k for k in self.data_kwargs if kwargs.get(k) is not None}
+
+    def _try_update(self, axes, args, kwargs):
+        if (self.res is None or self.update_func is None or axes is not self.axes
+                or not _same_kwargs(self._style_kwargs(kwargs), self._style_kwargs(self.kwargs))
+                # e.g. the colors were given before and aren't now: the artist is made again with the defaults
+                or self._given_data_kwargs(kwargs) != self._given_data_kwargs(self.kwargs)):
+            return False
+        if not self.update_func(self.res, axes, self.args, *args, **kwargs):
+            return False
+        axes.relim()
+        axes.autoscale_view()
+        return True
+
+    def plot(self, axes: plt.Axes, args, kwargs):
+        try:
+            updated = self._try_update(axes, args, kwargs)
+            if not updated:
+                self.remove(draw=False)
+                self.res = self.unbound_method(axes, *args, **kwargs)
+                self.axes = axes
+        except Exception:
+            self.remove()
+            raise
+        self.args = args
+        self.kwargs = kwargs
+        full = not updated
+        widget = _figure_widget(axes)
+        if widget is not None and widget.blit:
+            for artist in _artists(self.res):
+                if not artist.get_animated():  # e.g. plotted before the blitting was enabled
+                    artist.set_animated(True)
+                    full = True  # the cached background still contains it
+        redraw(axes, full=full)
+        return self.res
+
+    def remove(self, draw=True):
+        res, self.res = self.res, None
+        if res and self.remove_func:
+            self.remove_func(res, self.axes)
+            if draw:
+                with suppress(RuntimeError):  # the Qt canvas may be already deleted
+                    redraw(self.axes)
+
+
+def plot_method(unbound_method, remove_func=default_remove_plot, update_func=None, data_kwargs=()):
+    """
+    :param update_func: `update_func(plot_res, axes, prev_args, *args, **kwargs)` should update the result of the
+                        previous call in place and return True, or return False if a new plot is needed. It is called
+                        only if the keyword arguments (except `data_kwargs`) haven't changed.
+    """
 
-        if res and remove_func:
-            remove_func(res, self.axes)
-            canvas.draw_idle()
+    @reactive_finalizable(pass_args=['holder'])
+    def wrapped(holder: PlotHolder, self, *args, **kwargs):
+        assert self.get_figure() is not None
+        rerun = yield holder.plot(self, args, kwargs)
+        if not rerun:
+            holder.remove()
+        # otherwise the artists are kept to be updated in place by the next call
 
     def wrapped2(self, *args, **kwargs):
-        return wrapped(self, *args, **kwargs)
+        return wrapped(PlotHolder(unbound_method, remove_func, update_func, data_kwargs), self, *args, **kwargs)
 
     return wrapped2
 
@@ -50,9 +224,9 @@ class ReactiveAxes(Wrapper):
         super().__init__(axes)
 
     # Plotting.Basic
-    plot = plot_method(plt.Axes.plot)
+    plot = plot_method(plt.Axes.plot, update_func=update_plot)
     errorbar = plot_method(plt.Axes.errorbar)
-    scatter = plot_method(plt.Axes.scatter)
+    scatter = plot_method(plt.Axes.scatter, update_func=update_scatter, data_kwargs=['s', 'c'])
     plot_date = plot_method(plt.Axes.plot_date)
     step = plot_method(plt.Axes.step)
     loglog = plot_method(plt.Axes.loglog)
@@ -72,13 +246,13 @@ class ReactiveAxes(Wrapper):
     fill = plot_method(plt.Axes.fill)
 
     # Plotting.Spans
-    axhline = plot_method(plt.Axes.axhline)
+    axhline = plot_method(plt.Axes.axhline, update_func=update_axhline)
     axhspan = plot_method(plt.Axes.axhspan)
-    axvline = plot_method(plt.Axes.axvline)
+    axvline = plot_method(plt.Axes.axvline, update_func=update_axvline)
     axvspan = plot_method(plt.Axes.axvspan)
 
     # Plotting.Array
-    imshow = plot_method(plt.Axes.imshow)
+    imshow = plot_method(plt.Axes.imshow, update_func=update_imshow)
     matshow = plot_method(plt.Axes.matshow)
     pcolor = plot_method(plt.Axes.pcolor)
     pcolorfast = plot_method(plt.Axes.pcolorfast)
@@ -99,8 +273,8 @@ class ReactiveAxes(Wrapper):
 
     get_xlim = getter(plt.Axes.get_xlim, ['xlim'])
     set_xlim = reactive_setter(plt.Axes.set_xlim, ['xlim'])
-    get_ylim = getter(plt.Axes.get_xlim, ['xlim'])
-    set_ylim = reactive_setter(plt.Axes.set_xlim, ['xlim'])
+    get_ylim = getter(plt.Axes.get_ylim, ['ylim'])
+    set_ylim = reactive_setter(plt.Axes.set_ylim, ['ylim'])
 
     def legend(self, *args, **kwargs):
         return self.__inner__.legend(*args, **kwargs)
@@ -0,0 +1,102 @@
+from typing import Iterable
+
+import pandas as pd
+
+from ..common import is_wrapper, unwrap
+from ..decorators import reactive
+from ..notifier import Notifier
+from ..var import Wrapper
+from ..wrapping import get_subnotifier
+
+
+@reactive(pass_args=['self'], dep_only_args=['_additional_deps'])
+def _get_column(self, column):
+    return unwrap(self)[column]
+
+
+@reactive(pass_args=['self'], dep_only_args=['_additional_deps'])
+def _get_columns(self):
+    return unwrap(self).columns
+
+
+@reactive(pass_args=['self'], dep_only_args=['_additional_deps'])
+def _get_appended_rows(self):
+    return range(self._appended_from, len(unwrap(self)))
+
+
+class DataFrame(Wrapper):
+    """
+    A reactive `pandas.DataFrame` with column-level notifications.
+
+    Observers of the whole frame (e.g. reactive functions that take it as an argument) are notified on any change,
+    while the result of `frame[column]` is updated only when that column changes (or the whole frame is replaced).
+    """
+
+    def __init__(self, df: pd.DataFrame = None):
+        super().__init__(df if df is not None else pd.DataFrame())
+        self._appended_from = len(self._raw)
+
+    def _column_notifier(self, column) -> Notifier:
+        return get_subnotifier(self, 'column ' + str(column))
+
+    def _notify_observers(self, subnotifiers: Iterable[Notifier]):
+        for notifier in subnotifiers:
+            notifier.notify_observers()
+        self._notifier.notify_observers()
+
+    def set(self, df: pd.DataFrame):
+        self._raw = df
+        self._exception = None
+        self._appended_from = len(df)
+        self._notify_observers([get_subnotifier(self, 'frame')])
+
+    def __getitem__(self, column):
+        if is_wrapper(column):
+            deps = [self._notifier]
+        elif isinstance(column, list):
+            deps = [get_subnotifier(self, 'frame')] + [self._column_notifier(c) for c in column]
+        else:
+            deps = [get_subnotifier(self, 'frame'), self._column_notifier(column)]
+        return _get_column(self, column, _additional_deps=deps)
+
+    def __setitem__(self, column, value):
+        df = self._raw
+        new_column = column not in df.columns
+        df[column] = value
+        self._appended_from = len(df)
+        notifiers = [self._column_notifier(column)]
+        if new_column:
+            notifiers.append(get_subnotifier(self, 'columns'))
+        self._notify_observers(notifiers)
+
+    def append(self, rows: pd.DataFrame):
+        """
+        Append rows to the frame. All columns (and `columns()` if there are new ones) are notified and `appended_rows()`
+        tells which rows are new.
+
+        If both the frame and `rows` have the default index (e.g. `rows` given as a dict of lists), the appended rows
+        continue its numbering; otherwise the labels of `rows` are kept.
+        """
+        if not isinstance(rows, pd.DataFrame):
+            rows = pd.DataFrame(rows)
+        df = self._raw
+        if len(df.columns) == 0:
+            self._raw = rows
+        else:
+            default_index = isinstance(df.index, pd.RangeIndex) and isinstance(rows.index, pd.RangeIndex)
+            self._raw = pd.concat([df, rows], ignore_index=default_index)
+        notifiers = [self._column_notifier(column) for column in self._raw.columns]
+        if not df.columns.equals(self._raw.columns):
+            notifiers.append(get_subnotifier(self, 'columns'))
+        self._notify_observers(notifiers)
+
+    def columns(self):
+        return _get_columns(self, _additional_deps=[get_subnotifier(self, 'frame'), get_subnotifier(self, 'columns')])
+
+    def appended_rows(self):
+        """
+        Positions of the rows that were only appended since the last other change of the frame. A consumer that has
+        processed the first `n` rows may process only `frame.iloc[n:]` if `n` is within this range (or equal to its
+        end); otherwise it must recompute everything.
+        """
+        return _get_appended_rows(self, _additional_deps=[self._notifier])
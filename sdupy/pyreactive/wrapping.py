@@ -8,9 +8,12 @@ from .notifier import Notifier, ScopedName
 def get_subnotifier(self: Notifier, name: str) -> Notifier:
     if name is None or name == '':
         return self.__notifier__
-    if not hasattr(self, '_subnotifiers'):
-        setattr(self, '_subnotifiers', dict())
-    return self._subnotifiers.setdefault(name, Notifier("subnotifier " + name))
+    subnotifiers = self.__dict__.setdefault('_subnotifiers', dict())
+    notifier = subnotifiers.get(name)
+    if notifier is None:
+        with ScopedName("subnotifier " + name):
+            notifier = subnotifiers[name] = Notifier()
+    return notifier
 
 
 def observable_method(unbound_method, observed: Sequence[str], notified: Sequence[str]):
@@ -0,0 +1,110 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QWidget
+
+
+class RenderScheduler:
+    """
+    Collects render requests (redraws, layout updates, pulls of reactive values) from the widgets of a window and runs
+    them at most once per frame. Requests with the same key made before the frame is rendered are merged, so a fast
+    source feeding many widgets causes at most `fps` renders per second of each widget.
+
+    If the window is hidden or minimized, `background_fps` is used instead of `fps`.
+    """
+
+    def __init__(self, window: QWidget = None, fps: float = 60, background_fps: float = 2):
+        self.window = window
+        self.fps = fps
+        self.background_fps = background_fps
+
+        self.frames = 0  # number of rendered frames
+        self.dropped_frames = 0  # number of requests merged with a pending one (i.e. never shown)
+        self.render_time = 0.0  # total time spent on rendering [s]
+        self.last_render_time = 0.0  # time spent on rendering the last frame [s]
+
+        self._pending = OrderedDict()
+        self._last_frame = 0.0
+        self._timer = QTimer()
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    def current_fps(self) -> float:
+        if self.window is not None and (not self.window.isVisible() or self.window.isMinimized()):
+            return self.background_fps
+        return self.fps
+
+    def schedule(self, key: Hashable, func: Callable[[], None]):
+        """
+        Call `func` in the next frame. If a request with the same `key` is already pending, it's replaced.
+        """
+        if key in self._pending:
+            self.dropped_frames += 1
+        self._pending[key] = func
+        if not self._timer.isActive():
+            self._start_timer()
+
+    def cancel(self, key: Hashable):
+        self._pending.pop(key, None)
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def _start_timer(self):
+        delay = self._last_frame + 1 / self.current_fps() - time.perf_counter()
+        self._timer.start(max(0, int(delay * 1000)))
+
+    def flush(self):
+        """
+        Render all pending requests now. Requests made while rendering are rendered in the same frame, unless the same
+        key has already been rendered in it.
+        """
+        self._timer.stop()
+        start = time.perf_counter()
+        rendered = set()
+        deferred = OrderedDict()
+        while self._pending:
+            key, func = self._pending.popitem(last=False)
+            if key in rendered:
+                deferred[key] = func
+                continue
+            rendered.add(key)
+            try:
+                func()
+            except Exception:
+                logging.exception("ignoring exception when rendering {}".format(key))
+        self._last_frame = time.perf_counter()
+        self.last_render_time = self._last_frame - start
+        self.render_time += self.last_render_time
+        self.frames += 1
+        self._pending = deferred
+        if self._pending:
+            self._start_timer()
+
+    def stats(self) -> dict:
+        return dict(frames=self.frames, dropped_frames=self.dropped_frames, render_time=self.render_time,
+                    last_render_time=self.last_render_time)
+
+
+def find_render_scheduler(widget: QWidget):
+    while widget is not None:
+        scheduler = getattr(widget, 'render_scheduler', None)
+        if scheduler is not None:
+            return scheduler
+        widget = widget.parentWidget()
+    return None
+
+
+def request_render(widget: QWidget, key: Hashable, func: Callable[[], None]):
+    """
+    Call `func` in the next frame of the window containing `widget`, or immediately if the widget is not in a window
+    that has a `RenderScheduler`.
+    """
+    scheduler = find_render_scheduler(widget)
+    if scheduler is not None:
+        scheduler.schedule(key, func)
+    else:
+        func()
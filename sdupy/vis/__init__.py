@@ -8,6 +8,7 @@ import pyqtgraph as pg
 from PyQt5.QtCore import QRectF, QPointF
 from PyQt5.QtGui import QKeySequence
 from PyQt5.QtWidgets import QGraphicsItem, QDockWidget, QWidget, QMenu, QAction, QMenuBar, QTreeWidgetItem
+from pyqtgraph import ImageItem
 from pyqtgraph.parametertree import ParameterTree, Parameter
 
 import sdupy
@@ -18,15 +19,23 @@ from sdupy.pyreactive.utils import bind_vars
 from sdupy.pyreactive.wrappers.axes import ReactiveAxes
 from sdupy.utils import ignore_errors
 from sdupy.vis._helpers import make_graph_item_pg, set_zvalue, make_plot_item_pg, set_scatter_data_pg, \
-    pg_hold_items_unroll, make_histogram_item_pg, make_bargraph_item_pg
-from sdupy.vis.globals import global_refs, store_global_ref
+    pg_hold_items_unroll, set_histogram_data_pg, set_bargraph_data_pg, set_decimated_data_pg, \
+    set_stream_data_pg, KeyedItems, update_keyed_items_pg_unroll
+from sdupy.vis.globals import global_refs, store_global_ref, obtain_persistent_item
 from sdupy.widgets import Figure, Slider, VarsTable, CheckBox, ComboBox
 from sdupy.widgets.common.qt_property_var import QtSignaledVar
 from sdupy.widgets.helpers import paramtree_get_root_parameters, trigger_if_visible
 from sdupy.widgets.pyqtgraph import PgPlot, PgParamTree, TaskParameter, PgScatter, ActionParameter, LegendItemSample
 from sdupy.widgets.tables import ArrayTable
 from sdupy.windows import WindowSpec
-from ._helpers import image_to_mpl, image_to_pg, make_pg_image_item, levels_for, pg_hold_items
+from ._helpers import image_to_mpl, image_to_pg, levels_for, pg_hold_items, update_pg_image_item
+from .bars import BarsItem
+from .decimation import MinMaxPyramid, DecimatedPlotDataItem
+from .histogram import IncrementalHistogram, HistogramItem
+from .streaming import StreamBuffer, StreamingPlotDataItem
+from .view_range import ViewRange, ViewRangeWatcher
+from .stacks import FrameStack, ArrayStack, ImageFilesStack, PrefetchingStack, npy_stack, as_frame_stack, \
+    is_frame_stack_source
 from .utils import *
 
 Place = str | QWidget
@@ -94,19 +103,73 @@ def plot_mpl(widget_name: Place, *args, plot_fn='plot', window=None, **kwargs):
         ax.legend()
 
 
-def draw_pg(place: Place, label, items: Sequence[Wrapped[QGraphicsItem] | QGraphicsItem], zvalue=None, window=None):
+def draw_pg(place: Place, label, items: Sequence[Wrapped[QGraphicsItem] | QGraphicsItem], zvalue=None, window=None,
+            keyed=False):
+    """
+    Show the graphics `items`. When they change, all the previous items are removed from the view and the new ones are
+    added.
+
+    With `keyed`, `items` is a mapping from keys to items (possibly wrapped) instead, and only the items of the added or removed keys (or
+    whose item is another object than before) are added to or removed from the view, which matters for thousands of
+    items of which only a few change. Return the `KeyedItems` holding them (e.g. for its `last_ops` statistics).
+    """
     from sdupy.widgets.pyqtgraph import PgFigure
     w = widget(place, PgFigure, window=window)
+    if keyed:
+        key = ('draw_pg', label)
+        holder = obtain_persistent_item(w, key, lambda: KeyedItems(w.view))
+        holder.zvalue = zvalue
+        store_global_ref((w, key), trigger_if_visible(update_keyed_items_pg_unroll(holder, items), w))
+        return holder
     global_refs[(w, label)] = trigger_if_visible(pg_hold_items_unroll(w.view, items, zvalue=zvalue), w)
 
 
 def image_pg(place: Place, image: Optional[np.ndarray], window=None, label=None, zvalue=None, **kwargs):
+    from sdupy.widgets.pyqtgraph import PgFigure
+    w = widget(place, PgFigure, window=window)
+
+    def make_item():
+        item = ImageItem(axisOrder='row-major')
+        item.setAutoDownsample(True)
+        w.view.addItem(item)
+        return item
+
+    key = ('image_pg', label)
+    item = obtain_persistent_item(w, key, make_item)
+    set_zvalue(zvalue, item)
     with ScopedName(name=place+('.'+label if label else '')):
-        items = [make_pg_image_item(image, **kwargs)]
-        draw_pg(place, ('__image__', label), items, zvalue=zvalue, window=window)
+        store_global_ref((w, key), trigger_if_visible(update_pg_image_item(item, image, **kwargs), w))
+
+
+def image_pg_pyramid(place: Place, image: Optional[np.ndarray], window=None, label=None, zvalue=None, **kwargs):
+    """
+    Show a huge (e.g. memory-mapped) row-major image. Only the tiles intersecting the view are rendered, at the
+    resolution matching the screen. See `PyramidImageItem`.
+    """
+    from sdupy.widgets.pyqtgraph import PgFigure
+    from sdupy.widgets.pyramid_image import PyramidImageItem
+    w = widget(place, PgFigure, window=window)
+
+    def make_item():
+        item = PyramidImageItem()
+        w.view.addItem(item)
+        return item
 
+    key = ('image_pg_pyramid', label)
+    item = obtain_persistent_item(w, key, make_item)
+    set_zvalue(zvalue, item)
+    set_image = reactive(pass_args=['self'])(PyramidImageItem.setImage)
+    store_global_ref((w, key), trigger_if_visible(set_image(item, image, **kwargs), w))
 
-def image_pg_adv(place: Place, image: np.ndarray, window=None, extent=None, **kwargs):
+
+def image_pg_adv(place: Place, image: np.ndarray | FrameStack | str | Sequence[str], window=None, extent=None,
+                 **kwargs):
+    """
+    :param image: An array, a `FrameStack`, a path to a `.npy` file or a list (or a tuple) of paths to image files (one
+                  frame per file). The frames of a stack, a memory-mapped array (e.g. `np.load(path, mmap_mode='r')`)
+                  or files are loaded only when shown (and prefetched around the current one); the time axis is the
+                  first one and the ROI plot is not available for them.
+    """
     from sdupy.widgets.pyqtgraph import PgImage
 
     w = widget(place, PgImage, window=window)
@@ -119,6 +182,9 @@ def image_pg_adv(place: Place, image: np.ndarray, window=None, extent=None, **kw
         set_image_args.setdefault('autoHistogramRange', True)
         if image is None:
             image = np.zeros((1, 1))
+        if is_frame_stack_source(image):
+            image = as_frame_stack(image)
+            set_image_args.setdefault('axes', dict(t=0, y=1, x=2, c=3 if image.ndim == 4 else None))
         if 'axes' not in set_image_args:
             if image.ndim == 4:
                 set_image_args['axes'] = dict(t=0, y=1, x=2, c=3)
@@ -141,12 +207,11 @@ def image_pg_adv(place: Place, image: np.ndarray, window=None, extent=None, **kw
     global_refs[(w, '__image__')] = trigger_if_visible(set_image(image, extent, **kwargs), w)
 
 
-def image_slice_pg_adv(place: Place, image: np.ndarray, window=None, **kwargs):
+def image_slice_pg_adv(place: Place, image: np.ndarray | FrameStack | str | Sequence[str], window=None, **kwargs):
     return image_pg_adv(place, image, window, axes=dict(t=0, y=1, x=2), **kwargs)
 
 
 def graph_pg(place: Place, pos, adj, window=None, label=None, zvalue=None, **kwargs):
-    print("image_pg")
     items = [make_graph_item_pg(pos, adj, **kwargs)]
     draw_pg(place, ('__graph__', label), items, window=window, zvalue=zvalue)
     return items[0]
@@ -157,28 +222,88 @@ graph = graph_pg
 
 
 
-def plot_pg(place: Place, *args, label=None, window=None, **kwargs):
+def plot_pg(place: Place, *args, label=None, window=None, decimate=False, append_only=False, stream=False,
+            max_samples=None, **kwargs):
+    """
+    Plot `y` or `x, y` (`x` must be non-decreasing when `decimate` is set).
+
+    With `decimate`, a min/max envelope pyramid of the signal is computed once and only the envelope of the visible
+    range (about two points per pixel) is drawn, so that zooming stays fast for signals with hundreds of millions of
+    samples (see `DecimatedPlotDataItem`). If also `append_only` is set, the samples seen before are assumed unchanged
+    when the data changes and only the new ones are added to the pyramid.
+
+    With `stream`, the data is assumed to grow: only the samples after the ones seen before are appended to the buffers
+    of a persistent curve (see `StreamingPlotDataItem`), and if `max_samples` is given, only the last `max_samples`
+    samples are shown.
+    """
     w = widget(place, PgPlot, window=window)
     if label and "name" not in kwargs:
         w.view.addLegend(sampleType=LegendItemSample)
         kwargs["name"] = label
 
+    if decimate or stream:
+        def make_item():
+            item = DecimatedPlotDataItem(**kwargs) if decimate else StreamingPlotDataItem(max_samples, **kwargs)
+            w.view.addItem(item)
+            if stream:
+                item.enable_downsampling()
+            return item
+
+        # the item is made again if the options it's made with change
+        options = dict(kwargs, decimate=decimate, max_samples=max_samples)
+        item = obtain_persistent_item(w, ('plot_pg', label), make_item, options, discard=w.view.removeItem)
+        if decimate:
+            data = set_decimated_data_pg(item, *args, append_only=append_only)
+        else:
+            data = set_stream_data_pg(item, *args)
+        r = trigger_if_visible(data, w)
+        store_global_ref((w, label), r)
+        return r
+
     plot_item = make_plot_item_pg(w.view, *args, **kwargs)
     r = trigger_if_visible(plot_item, w)
     store_global_ref((w, label), r)
     return r
 
-def histogram_pg(place: Place, *args, label=None, window=None, **kwargs):
+def histogram_pg(place: Place, *args, label=None, window=None, append_only=False, **kwargs):
+    """
+    Show the histogram of the data, with the arguments of `np.histogram` (and `pen` and `brush` of the bars).
+
+    The bars are a persistent `HistogramItem` updated in place. When only the binning changes, the data is sorted once
+    and the following histograms are found by binary search instead of a pass over the data. With `append_only`, the
+    data is assumed to grow and only the new values are counted into fixed bins.
+    """
     w = widget(place, PgPlot, window=window)
-    plot_item = make_histogram_item_pg(w.view, *args, **kwargs)
-    r = trigger_if_visible(plot_item, w)
+    bar_graph_args = {key: kwargs.pop(key) for key in ('pen', 'brush') if key in kwargs}
+
+    def make_item():
+        item = HistogramItem(**bar_graph_args)
+        w.view.addItem(item)
+        return item
+
+    item = obtain_persistent_item(w, ('histogram_pg', label), make_item)
+    if bar_graph_args:
+        item.setOpts(**bar_graph_args)
+    r = trigger_if_visible(set_histogram_data_pg(item, *args, append_only=append_only, **kwargs), w)
     store_global_ref((w, label), r)
     return r
 
-def bargraph_pg(place: Place, *args, label=None, window=None, **kwargs):
+def bargraph_pg(place: Place, *, label=None, window=None, **kwargs):
+    """
+    Show bars given with the options of `pg.BarGraphItem` (e.g. `x`, `height`, `width`, `brushes`).
+
+    The bars are a persistent `BarsItem` updated in place, and the pens and brushes are converted to Qt objects only when
+    they change.
+    """
     w = widget(place, PgPlot, window=window)
-    plot_item = make_bargraph_item_pg(w.view, *args, **kwargs)
-    r = trigger_if_visible(plot_item, w)
+
+    def make_item():
+        item = BarsItem()
+        w.view.addItem(item)
+        return item
+
+    item = obtain_persistent_item(w, ('bargraph_pg', label), make_item)
+    r = trigger_if_visible(set_bargraph_data_pg(item, **kwargs), w)
     store_global_ref((w, label), r)
     return r
 
@@ -466,6 +591,31 @@ def set_titles_mpl(place: Place, title=None, x=None, y=None):
     vis.widget(place).tight_layout()
 
 
+def set_blit_mpl(place: Place, enabled=True, window=None):
+    """
+    Enable (or disable) the blitting mode of a matplotlib figure: the plots (e.g. from `plot_mpl`) are redrawn over a
+    cached background instead of redrawing the whole figure. See `Figure.set_blit`.
+    """
+    widget(place, Figure, window=window).set_blit(enabled)
+
+
+
+def view_range(place: Place, rate_limit: float = 30, factory=PgPlot, window=None) -> Var[ViewRange]:
+    """
+    A var with the range shown by the plot (pyqtgraph or matplotlib): `(xmin, xmax, ymin, ymax, pixel_width,
+    pixel_height)`, where the pixel size is in the units of the data. It's updated when the plot is panned, zoomed or
+    resized, at most `rate_limit` times per second (see `ViewRangeWatcher`). The widget is created with `factory` if
+    it doesn't exist.
+    """
+    w = widget(place, factory, window=window)
+    if isinstance(w, Figure):
+        view = w.axes
+    else:
+        view = w.view if isinstance(w.view, pg.ViewBox) else w.view.getViewBox()
+    watcher = obtain_persistent_item(w, ('view_range',), lambda: ViewRangeWatcher(view, rate_limit))
+    watcher.set_rate_limit(rate_limit)
+    return watcher.var
+
 
 def pg_extent(place: Place, name, value=(0, 0, 1, 1)):
     extent_xy = value[0], value[2]
@@ -1,17 +1,22 @@
-from numbers import Number, Integral
+import weakref
 from typing import Mapping, Sequence
 from builtins import isinstance
 from collections import OrderedDict
 
 import numpy as np
 from PyQt5.QtCore import QRectF, QPointF
-from pyqtgraph import ImageItem, GraphItem, PlotItem, ScatterPlotWidget, BarGraphItem
+from pyqtgraph import ImageItem, GraphItem, PlotItem, ScatterPlotWidget
 
 from sdupy.pyreactive import reactive, reactive_finalizable
+from sdupy.widgets.image_levels import estimate_levels
 
 
 @reactive
 def image_to_mpl(image: np.ndarray, is_bgr=True):
+    """
+    Convert the image to the form accepted by matplotlib. For 1- and 3-channel images the result is a view of the input
+    (the channel order is reversed using a negative stride), so no data is copied.
+    """
 #    if image.dtype not in [np.uint8, np.uint16, np.float32]:
 #        is_bgr
 #        assert bad
@@ -22,7 +27,7 @@ def image_to_mpl(image: np.ndarray, is_bgr=True):
             return image[..., [0, 0, 0, 1]]
         elif image.shape[2] == 3:
             if is_bgr:
-                return image[..., [2, 1, 0]]
+                return image[..., ::-1]
                 # return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
         elif image.shape[2] == 4:
             if is_bgr:
@@ -48,27 +53,95 @@ def pg_hold_items_unroll(pg_parent, items, zvalue=None):
 @reactive_finalizable
 def pg_hold_items(pg_parent, *items, zvalue=None):
     vb = pg_parent.vb if hasattr(pg_parent, 'vb') else pg_parent
+    items = [item for item in items if item is not None]
     ar = vb.autoRangeEnabled()  # it slow downs when inserting many objects
-    vb.disableAutoRange()
+    if items:
+        vb.disableAutoRange()
 
     for item in items:
-        if item is not None:
-            if zvalue is not None:
-                assert item is not None
-                item.setZValue(zvalue)
-            pg_parent.addItem(item)
-    vb.enableAutoRange(x=ar[0], y=ar[0])
+        if zvalue is not None:
+            item.setZValue(zvalue)
+        pg_parent.addItem(item)
+    if items:
+        vb.enableAutoRange(x=ar[0], y=ar[1])
     yield
-    ar = vb.autoRangeEnabled()  # it slow downs when inserting many objects
-    vb.disableAutoRange()
-    for item in items:
-        if item is not None:
+    if items:
+        ar = vb.autoRangeEnabled()  # it slow downs when inserting many objects
+        vb.disableAutoRange()
+        for item in items:
             pg_parent.removeItem(item)
-    vb.enableAutoRange(x=ar[0], y=ar[0])
+        vb.enableAutoRange(x=ar[0], y=ar[1])
+
+
+class KeyedItems:
+    """
+    Items of a view identified by keys. `update` reconciles the items shown with the new ones: only the items of the
+    keys that have been added or removed, or whose item is another object than before, are added to or removed from the
+    scene. An item that is the same object as before is left alone, so modifying items in place (e.g. `setRect` of an
+    item obtained with `obtain_persistent_item`) costs no scene operations at all.
+
+    The numbers of scene operations are counted in `last_ops` (for the last update) and `total_ops`.
+    """
+
+    def __init__(self, pg_parent, zvalue=None):
+        self.pg_parent = pg_parent
+        self.zvalue = zvalue
+        self.items = OrderedDict()  # key -> item
+        self.last_ops = dict(added=0, removed=0, kept=0)
+        self.total_ops = dict(added=0, removed=0, kept=0)
+        self.updates = 0
+
+    def update(self, items: Mapping):
+        items = OrderedDict((key, item) for key, item in items.items() if item is not None)
+        to_remove = [key for key, item in self.items.items() if items.get(key) is not item]
+        to_add = [key for key, item in items.items() if self.items.get(key) is not item]
+
+        if self.zvalue is not None:
+            # also for the kept items, since `zvalue` may have changed (Qt ignores setting the same value)
+            for item in items.values():
+                item.setZValue(self.zvalue)
+        vb = self.pg_parent.vb if hasattr(self.pg_parent, 'vb') else self.pg_parent
+        if to_remove or to_add:
+            ar = vb.autoRangeEnabled()  # it slow downs when inserting many objects
+            vb.disableAutoRange()
+            for key in to_remove:
+                self.pg_parent.removeItem(self.items.pop(key))
+            for key in to_add:
+                self.pg_parent.addItem(items[key])
+            vb.enableAutoRange(x=ar[0], y=ar[1])
+        self.items = items
+
+        self.last_ops = dict(added=len(to_add), removed=len(to_remove), kept=len(items) - len(to_add))
+        for op, count in self.last_ops.items():
+            self.total_ops[op] += count
+        self.updates += 1
+
+    def clear(self):
+        self.update({})
+
+
+@reactive(pass_args=['holder'])
+def update_keyed_items_pg_unroll(holder: KeyedItems, items: Mapping):
+    # the items may be wrapped too; passed as separate arguments, they are unwrapped and observed
+    if items is None:
+        items = {}
+    return update_keyed_items_pg(holder, list(items.keys()), *items.values())
+
+
+@reactive(pass_args=['holder'])
+def update_keyed_items_pg(holder: KeyedItems, keys, *items):
+    holder.update(dict(zip(keys, items)))
+    return holder
 
 
 @reactive
 def image_to_pg(image: np.ndarray, is_bgr=True, do_flip=True):
+    """
+    Convert the image to the column-major form used by pyqtgraph by default. The channel order, the flip and the axis
+    order are all expressed as strides, so for 1- and 3-channel images the result is a view of the input and the only
+    pass over the data is made by pyqtgraph when rendering it. Alternatively, show the image unconverted with
+    `axisOrder='row-major'`.
+    """
     image = image_to_mpl(image, is_bgr)
     if do_flip:
         image = np.flip(image, axis=0)
@@ -83,27 +156,57 @@ def image_to_pg(image: np.ndarray, is_bgr=True, do_flip=True):
     return image
 
 
-def levels_for(image: np.ndarray):
+def levels_for(image: np.ndarray, key=None):
+    """
+    Fixed levels for uint8 and float images, levels estimated from a sample of the pixels for other types (e.g. uint16
+    images from cameras, which seldom use the whole range). The estimate is cached for `key` (see `cached_for_image`).
+    """
     if image.dtype == np.uint8:
         return (0, 255)
     elif image.dtype == np.float32 or image.dtype == np.float64:
         return (0.0, 1.0)
+    elif image.dtype.kind in 'iu':
+        return estimate_levels(image, key=key)[0]
 
 
-@reactive
-def make_pg_image_item(image, extent=None, **kwargs):
+_image_item_extents = weakref.WeakKeyDictionary()
+
+
+def _same_levels(a, b):
+    if a is None or b is None:
+        return a is b
+    a, b = np.asarray(a), np.asarray(b)
+    return a.shape == b.shape and bool(np.all(a == b))
+
+
+@reactive(pass_args=['item'], changes=True)
+def update_pg_image_item(item: ImageItem, image, extent=None, changes=None, **kwargs):
+    """
+    Show `image` in an existing `item`, so no graphics item is created for a new image. Levels and the lookup table are
+    passed to the item only if they have changed and the rect is set only if the extent or the image shape has changed.
+    """
     if image is None:
-        return None
-    image_args = kwargs
-    image_args.setdefault('autoRange', False)
+        item.clear()
+        return item
+    image_args = dict(kwargs)
     image_args.setdefault('autoLevels', False)
-    image_args.setdefault('axisOrder', 'row-major')
-    image_args.setdefault('levels', levels_for(image))
-    item = ImageItem(image, **image_args)
-    if extent is not None:
+    levels = image_args.pop('levels', None)
+    if levels is None and not image_args['autoLevels']:
+        levels = levels_for(image, key=changes.versions['image'] if changes is not None else None)
+    if levels is not None and not _same_levels(item.getLevels(), levels):
+        image_args['levels'] = levels
+    lut = image_args.pop('lut', None)
+    if lut is not item.lut:  # also when it's not given anymore
+        item.setLookupTable(lut, update=False)
+    shape_changed = item.image is None or item.image.shape[:2] != image.shape[:2]
+    item.setImage(image, **image_args)
+    if extent is not None and (shape_changed or _image_item_extents.get(item) != tuple(extent)):
         xmin, xmax, ymin, ymax = extent
         item.setRect(QRectF(QPointF(xmin, ymin), QPointF(xmax, ymax)))
-    item.setAutoDownsample(True)
+        _image_item_extents[item] = tuple(extent)
+    elif extent is None and item in _image_item_extents:
+        item.resetTransform()  # back to the pixel coordinates
+        del _image_item_extents[item]
     return item
 
 
@@ -124,27 +227,29 @@ def make_plot_item_pg(plot_item: PlotItem, *args, **kwargs):
     plot_item.removeItem(item)
 
 
-@reactive_finalizable
-def make_bargraph_item_pg(plot_item: PlotItem, *args, **kwargs):
-    item = BarGraphItem(**kwargs)
-    plot_item.addItem(item)
-    yield item
-    plot_item.removeItem(item)
+@reactive(pass_args=['item'])
+def set_decimated_data_pg(item, *args, append_only=False):
+    item.set_signal(*args, append_only=append_only)
+    return item
 
 
-@reactive_finalizable
-def make_histogram_item_pg(plot_item: PlotItem, *args, **kwargs):
-    BAR_GRAPH_KEYS = ("pen", "brush")
-    bar_graph_args = {}
-    for key in BAR_GRAPH_KEYS:
-        if key in kwargs:
-            bar_graph_args[key] = kwargs.pop(key)
-    y, x = np.histogram(*args, **kwargs)
-    width = x[1:] - x[:-1]
-    item = BarGraphItem(x=x[:-1], height=y, width=width, **bar_graph_args)
-    plot_item.addItem(item)
-    yield item
-    plot_item.removeItem(item)
+@reactive(pass_args=['item'])
+def set_stream_data_pg(item, *args):
+    item.set_stream(*args)
+    return item
+
+
+@reactive(pass_args=['item'])
+def set_bargraph_data_pg(item, **kwargs):
+    item.set_bars(**kwargs)
+    return item
+
+
+@reactive(pass_args=['item'], changes=True)
+def set_histogram_data_pg(item, a, *args, append_only=False, changes=None, **kwargs):
+    data_changed = changes is None or 'a' in changes.changed
+    item.set_histogram(a, *args, append_only=append_only, data_changed=data_changed, **kwargs)
+    return item
 
 
 def flatten_dicts(record, prefix=''):
@@ -155,51 +260,104 @@ def flatten_dicts(record, prefix=''):
             yield prefix+k, v
 
 
-@reactive
-def set_scatter_data_pg(widget: ScatterPlotWidget, data):
-    def field_flags(name, ftype, values):
-        if not issubclass(ftype, Number):
-            return dict(mode='enum', values=list(values))
-        return dict(values=list(set(values)))
-
-    if isinstance(data, Sequence) and len(data) > 0 and isinstance(data[0], Mapping):
-        ftypes = OrderedDict()
-        fvalues = OrderedDict()
-
-        def to_acceptable_value(v):
-            if isinstance(v, Number):
-                return v
-            else:
-                return str(v)
-
-        for record in data:
-            for k, v in flatten_dicts(record):
-                acc_val = to_acceptable_value(v)
-                ftypes[k] = type(acc_val)
-                fvalues.setdefault(k, set()).add(acc_val)
-
-        def ftype_to_numpy(ftype):
-            if issubclass(ftype, str):
-                return 'U1024'
-            return ftype
-
-        dtype = [(name, ftype_to_numpy(ftype)) for name, ftype in ftypes.items()]
-        data_ar = np.empty(len(data), dtype=dtype)
-        for i, record in enumerate(data):
-            for k, v in flatten_dicts(record):
-                data_ar[i][k] = to_acceptable_value(v)
-
-        widget.setFields([(name, field_flags(name, ftypes[name], fvalues[name]))
-                          for name in ftypes])
-
-    elif isinstance(data, np.ndarray):
-        widget.setFields([(name, field_flags(name, data.dtype.fields[name][0].type, data[name]))
-                          for name in data.dtype.names])
-        data_ar = data
-
+def _pandas_columns(frame):
+    for name in frame.columns:
+        series = frame[name]
+        if hasattr(series, 'cat'):  # categorical, avoid converting every value to a Python object
+            categories = np.asarray(series.cat.categories.astype(str))
+            codes = np.asarray(series.cat.codes)
+            yield str(name), np.append(categories, 'nan')[codes], list(categories)
+        else:
+            yield str(name), series.to_numpy(), None
+
+
+def _records_column(records, name) -> np.ndarray:
+    values = [record.get(name) for record in records]
+    missing = [value is None for value in values]
+    if any(missing):
+        present = np.asarray([value for value, m in zip(values, missing) if not m])
+        if present.dtype.kind in 'biuf':
+            # a numeric column with some values missing (not an object column of numbers and Nones)
+            column = np.full(len(values), np.nan)
+            column[~np.array(missing)] = present
+            return column
+    return np.asarray(values)
+
+
+def _scatter_column(column: np.ndarray, max_string_length, max_enum_values, enum_values=None):
+    """
+    Return the column converted to a type acceptable by `ScatterPlotWidget` and its field options (or None if the field
+    cannot be filtered or colored by, e.g. strings unique for each record).
+    """
+    if column.dtype.kind in 'biuf':
+        # the first values are enough to tell a continuous column (e.g. coordinates) from a discrete one
+        if enum_values is None and len(np.unique(column[:2 * max_enum_values])) <= max_enum_values:
+            uniques = np.unique(column)
+            enum_values = uniques.tolist() if len(uniques) <= max_enum_values else None
+        return column, dict(values=enum_values) if enum_values is not None else {}
+    if column.dtype.kind == 'V':
+        return column, None
+    if column.dtype.kind in 'US':
+        uniques = np.unique(column)
+    else:
+        # e.g. Python objects; shown as strings with the width of the longest (bounded) value
+        uniques, codes = np.unique(column.astype(str), return_inverse=True)
+        width = min(max_string_length, max(1, int(np.char.str_len(uniques).max(initial=1))))
+        uniques = uniques.astype('U{}'.format(width))
+        column = uniques[codes.reshape(-1)]
+    if enum_values is None:
+        if len(uniques) > max_enum_values:
+            return column, None
+        enum_values = uniques.tolist()
+    return column, dict(mode='enum', values=enum_values)
+
+
+def scatter_data_to_array(data, max_string_length=64, max_enum_values=256):
+    """
+    Convert `data` for `ScatterPlotWidget`: return a structured array and the fields (with their options) to be passed
+    to `setFields`.
+
+    `data` may be a dict of columns (nested dicts give fields named 'a.b'), a pandas DataFrame, a structured array or
+    a list of dicts (records; numbers missing from some of them are NaN). Every column is converted at once: strings
+    are stored with the width of the longest value (at most `max_string_length`) and the values to filter or color by
+    are found with `np.unique` (only for columns with at most `max_enum_values` distinct values; string columns with
+    more are not offered as fields).
+    """
+    enum_values = {}
+    if isinstance(data, np.ndarray) and data.dtype.names is not None:
+        columns = [(name, data[name]) for name in data.dtype.names]
+    elif hasattr(data, 'columns') and hasattr(data, 'to_numpy'):
+        columns = []
+        for name, column, values in _pandas_columns(data):
+            columns.append((name, column))
+            enum_values[name] = values
+    elif isinstance(data, Mapping):
+        columns = [(name, np.asarray(column)) for name, column in flatten_dicts(data)]
+    elif isinstance(data, Sequence) and len(data) > 0 and isinstance(data[0], Mapping):
+        records = [dict(flatten_dicts(record)) for record in data]
+        names = list(OrderedDict((name, None) for record in records for name in record))
+        columns = [(name, _records_column(records, name)) for name in names]
     else:
         raise Exception("data type not supported, you may want to add the support here")
 
+    converted = []
+    fields = []
+    for name, column in columns:
+        column, flags = _scatter_column(column, max_string_length, max_enum_values, enum_values.get(name))
+        converted.append((name, column))
+        if flags is not None:
+            fields.append((name, flags))
+    data_ar = np.empty(len(converted[0][1]) if converted else 0,
+                       dtype=[(name, column.dtype) for name, column in converted])
+    for name, column in converted:
+        data_ar[name] = column
+    return data_ar, fields
+
+
+@reactive
+def set_scatter_data_pg(widget: ScatterPlotWidget, data):
+    data_ar, fields = scatter_data_to_array(data)
+    widget.setFields(fields)
     widget.setData(data_ar)
 
 
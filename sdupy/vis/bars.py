@@ -0,0 +1,52 @@
+"""
+Bar graphs for `bargraph_pg`, updated in place so that thousands of bars can change many times per second.
+"""
+import numpy as np
+import pyqtgraph as pg
+
+GEOMETRY_OPTS = ('x', 'y', 'x0', 'y0', 'x1', 'y1', 'width', 'height')
+STYLE_OPTS = ('pen', 'brush', 'pens', 'brushes')
+
+
+def _style_defaults():
+    return dict(pen=pg.getConfigOption('foreground'), brush=(128, 128, 128), pens=None, brushes=None)
+
+
+def _same_style(a, b):
+    if a is b:
+        return True
+    if isinstance(a, (list, tuple, np.ndarray)) != isinstance(b, (list, tuple, np.ndarray)):
+        return False
+    try:
+        return bool(np.array_equal(np.asarray(a, dtype=object), np.asarray(b, dtype=object)))
+    except Exception:  # e.g. values that can't be compared
+        return False
+
+
+class BarsItem(pg.BarGraphItem):
+    """
+    A `BarGraphItem` updated in place with `set_bars`.
+
+    `BarGraphItem.setOpts` converts the pens and brushes (e.g. an array of a brush per bar) to Qt objects whenever they
+    are passed, so `set_bars` passes them only when they are different than the previous ones.
+    """
+
+    def __init__(self):
+        super().__init__(x=[], height=[], width=1)
+        self.style = _style_defaults()  # the last style given to `setOpts`
+        self.style_updates = 0  # number of updates that changed the style
+
+    def set_bars(self, **opts):
+        """
+        Show the bars given with the options of `BarGraphItem` (`x`, `height`, `width`, `brushes` etc.). The options
+        not given are reset to their defaults.
+        """
+        style = _style_defaults()
+        style.update((key, opts.pop(key)) for key in STYLE_OPTS if key in opts)
+        changed_style = {key: value for key, value in style.items() if not _same_style(value, self.style[key])}
+        if changed_style:
+            self.style_updates += 1
+            self.style = style
+        geometry = {key: None for key in GEOMETRY_OPTS}
+        geometry.update(opts)
+        self.setOpts(**geometry, **changed_style)
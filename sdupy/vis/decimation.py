@@ -0,0 +1,216 @@
+"""
+Min/max decimation of long signals for plotting.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+import pyqtgraph as pg
+
+
+class _GrowableArray:
+    def __init__(self, dtype, capacity=1024):
+        self._data = np.empty(capacity, dtype=dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data[:self._size]
+
+    def resize(self, size):
+        if size > len(self._data):
+            new_data = np.empty(max(size, 2 * len(self._data)), dtype=self._data.dtype)
+            new_data[:self._size] = self._data[:self._size]
+            self._data = new_data
+        self._size = size
+
+    def append(self, values):
+        start = self._size
+        self.resize(start + len(values))
+        self._data[start:self._size] = values
+
+
+class MinMaxPyramid:
+    """
+    Min/max envelopes of a signal `y(x)` (`x` must be non-decreasing) at resolutions decreasing by `factor`. Level `k`
+    holds the minimum and the maximum of each block of `factor**k` consecutive samples (level 0 is the signal itself).
+
+    `points` returns the envelope for a range of `x` at the coarsest level that still has about two points per pixel,
+    so the peaks and dropouts are visible at any zoom, while the cost doesn't depend on the length of the signal.
+    Appending samples updates only the last blocks of each level.
+    """
+
+    def __init__(self, y=None, x=None, factor=4):
+        self.factor = factor
+        self._x = None  # type: Optional[_GrowableArray]  # None means x = index
+        self._mins = []  # level k-1 -> minimums of the blocks of level k
+        self._maxs = []
+        self._y = None  # type: Optional[_GrowableArray]
+        if y is not None:
+            self.append(y, x)
+
+    def __len__(self):
+        return len(self._y) if self._y is not None else 0
+
+    def clear(self):
+        self._x = None
+        self._y = None
+        self._mins = []
+        self._maxs = []
+
+    def append(self, y, x=None):
+        y = np.asarray(y)
+        if len(y) == 0:
+            return
+        if self._y is None:
+            self._y = _GrowableArray(np.result_type(y.dtype, np.float32))
+            if x is not None:
+                self._x = _GrowableArray(np.asarray(x).dtype)
+        assert (x is None) == (self._x is None), "x must be given always or never"
+        old_size = len(self._y)
+        self._y.append(y)
+        if x is not None:
+            assert len(x) == len(y)
+            self._x.append(x)
+        self._update_levels(old_size)
+
+    def _update_levels(self, old_size):
+        # recompute the blocks containing the new samples, level by level
+        lower_min = lower_max = self._y.data
+        block = 1
+        level = 0
+        while len(lower_min) > 1:
+            block *= self.factor
+            if level == len(self._mins):
+                self._mins.append(_GrowableArray(self._y.data.dtype))
+                self._maxs.append(_GrowableArray(self._y.data.dtype))
+            mins, maxs = self._mins[level], self._maxs[level]
+            first = min(old_size // block, len(mins))  # the first block containing new samples
+            start = first * self.factor  # in blocks of the lower level
+            offsets = np.arange(0, len(lower_min) - start, self.factor)
+            mins.resize(first + len(offsets))
+            maxs.resize(first + len(offsets))
+            mins.data[first:] = np.minimum.reduceat(lower_min[start:], offsets)
+            maxs.data[first:] = np.maximum.reduceat(lower_max[start:], offsets)
+            lower_min, lower_max = mins.data, maxs.data
+            level += 1
+
+    def levels(self):
+        return len(self._mins) + 1
+
+    def _x_at(self, indices):
+        if self._x is None:
+            return np.asarray(indices, dtype=float)
+        return self._x.data[indices]
+
+    def x_range(self) -> Tuple[float, float]:
+        return float(self._x_at(0)), float(self._x_at(len(self) - 1))
+
+    def index_range(self, x_min, x_max) -> Tuple[int, int]:
+        """
+        The range of the samples covering [x_min, x_max], including one sample on each side (so the line leaves the
+        view).
+        """
+        size = len(self)
+        if self._x is None:
+            i0, i1 = int(np.floor(x_min)), int(np.ceil(x_max)) + 1
+        else:
+            x = self._x.data
+            i0, i1 = np.searchsorted(x, x_min, side='left'), np.searchsorted(x, x_max, side='right')
+        return max(0, i0 - 1), min(size, i1 + 1)
+
+    def points(self, x_min=-np.inf, x_max=np.inf, pixels=1000) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        The points to draw for the range [x_min, x_max] shown on `pixels` pixels.
+        """
+        if len(self) == 0:
+            return np.zeros(0), np.zeros(0)
+        first, last = self.x_range()
+        x_min, x_max = max(x_min, first), min(x_max, last)
+        i0, i1 = self.index_range(x_min, x_max)
+        level = 0
+        block = 1
+        while level < len(self._mins) and (i1 - i0) / block > pixels:
+            level += 1
+            block *= self.factor
+        if level == 0:
+            return self._x_at(np.arange(i0, i1)), self._y.data[i0:i1]
+        b0, b1 = i0 // block, -(-i1 // block)
+        starts = np.arange(b0, b1) * block
+        ends = np.minimum(starts + block, len(self)) - 1
+        x = np.empty(2 * len(starts), dtype=float)
+        y = np.empty(2 * len(starts), dtype=self._y.data.dtype)
+        x[0::2] = self._x_at(starts)
+        x[1::2] = self._x_at(ends)
+        y[0::2] = self._mins[level - 1].data[b0:b1]
+        y[1::2] = self._maxs[level - 1].data[b0:b1]
+        return x, y
+
+
+class DecimatedPlotDataItem(pg.PlotDataItem):
+    """
+    A `PlotDataItem` showing a long signal through a `MinMaxPyramid`: only the envelope of the visible range, with about
+    two points per pixel of the view, is passed to the item, so zooming and panning cost the same regardless of the
+    length of the signal. The bounds used for auto-ranging are those of the whole signal.
+
+    Style arguments (`pen`, `name`, ...) are those of `PlotDataItem`; the data is set with `set_signal`.
+    """
+
+    def __init__(self, *args, factor=4, **kwargs):
+        super().__init__(**kwargs)
+        self.pyramid = MinMaxPyramid(factor=factor)
+        self._shown = None
+        if args:
+            self.set_signal(*args)
+
+    def set_signal(self, *args, append_only=False):
+        """
+        Set the signal (`y` or `x, y`). If `append_only` is set and the signal is not shorter than the previous one,
+        only the new samples are added to the pyramid (the previous ones are assumed unchanged).
+        """
+        if len(args) == 1:
+            x, y = None, args[0]
+        else:
+            x, y = args
+        y = np.asarray(y)
+        size = len(self.pyramid)
+        if append_only and 0 < size <= len(y):
+            self.pyramid.append(y[size:], None if x is None else np.asarray(x)[size:])
+        else:
+            self.pyramid = MinMaxPyramid(y, x, factor=self.pyramid.factor)
+        self._shown = None
+        self.update_points()
+
+    def update_points(self):
+        view_box = self.getViewBox()
+        if not isinstance(view_box, pg.ViewBox) or view_box.width() <= 0:  # e.g. not added to a ViewBox yet
+            x_min, x_max, pixels = -np.inf, np.inf, 1000
+        else:
+            (x_min, x_max), _ = view_box.viewRange()
+            pixels = int(view_box.width())
+        key = (x_min, x_max, pixels, len(self.pyramid))
+        if key == self._shown:
+            return
+        self._shown = key
+        self.setData(*self.pyramid.points(x_min, x_max, pixels))
+
+    def viewRangeChanged(self, *args, **kwargs):
+        super().viewRangeChanged(*args, **kwargs)
+        self.update_points()
+
+    def viewTransformChanged(self):
+        super().viewTransformChanged()
+        self.update_points()  # e.g. the view has been resized
+
+    def dataBounds(self, ax, frac=1.0, orthoRange=None):
+        if len(self.pyramid) == 0:
+            return None, None
+        if ax == 0:
+            return self.pyramid.x_range()
+        x_min, x_max = orthoRange if orthoRange is not None else (-np.inf, np.inf)
+        _, y = self.pyramid.points(x_min, x_max)
+        if len(y) == 0:
+            return None, None
+        return float(np.nanmin(y)), float(np.nanmax(y))
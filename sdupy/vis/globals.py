@@ -1,5 +1,8 @@
 import gc
 
+import numpy as np
+from PyQt5.QtCore import QObject
+
 from sdupy.pyreactive.var import LazySwitchableProxy
 from sdupy.widgets.helpers import TriggerIfVisible
 
@@ -13,4 +16,46 @@ def store_global_ref(key, value):
             prev._cleanup()
         gc.collect()  # we still rely on destruction
 
-    global_refs[key] = value
\ No newline at end of file
+    global_refs[key] = value
+
+persistent_items = {}  # id of a widget -> {key: (item, options)}
+
+
+def _same_options(a, b):
+    if a is None or b is None:
+        return a is b
+    if a.keys() != b.keys():
+        return False
+    for k, v in a.items():
+        if v is b[k]:
+            continue
+        try:
+            if not bool(np.all(v == b[k])):
+                return False
+        except Exception:  # e.g. values that cannot be compared
+            return False
+    return True
+
+
+def obtain_persistent_item(widget: QObject, key, factory, options: dict = None, discard=None):
+    """
+    Return the item stored for `widget` under `key`, creating it with `factory()` if there is none. Unlike the values in
+    `global_refs`, the item survives the updates, so it can be updated in place. The items of a widget are dropped when
+    it's destroyed.
+
+    `options` are the arguments the item is made with, which cannot be changed later. If they differ from those of the
+    stored item, the stored item is passed to `discard` (e.g. to remove it from the view) and a new one is made.
+    """
+    widget_id = id(widget)
+    items = persistent_items.get(widget_id)
+    if items is None:
+        items = persistent_items[widget_id] = {}
+        widget.destroyed.connect(lambda *args: persistent_items.pop(widget_id, None))
+    entry = items.get(key)
+    if entry is not None and not _same_options(entry[1], options):
+        if discard is not None:
+            discard(entry[0])
+        entry = None
+    if entry is None:
+        entry = items[key] = (factory(), options)
+    return entry[0]
@@ -1,15 +1,18 @@
-from typing import Any, Callable, Iterable, Mapping, Sequence, Set, Tuple, overload
+import asyncio
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Mapping, Sequence, Set, Tuple, overload
 
 import networkx
 import numpy as np
 import pyqtgraph as pg
-from PyQt5.QtCore import QPointF
+from PyQt5.QtCore import QPointF, QRectF, Qt
 from PyQt5.QtGui import QBrush, QColor, QFont
-from pyqtgraph import SpotItem
 
 from sdupy import reactive, reactive_finalizable
 from sdupy.pyreactive import unwrapped
-from sdupy.utils import ignore_errors
+from sdupy.utils import ignore_errors, make_async_using_thread
+from sdupy.widgets.point_index import GridIndex
 
 
 @overload
@@ -29,85 +32,197 @@ def make_node(**kwargs):
     return dict(**kwargs)
 
 
+LAYOUT_CACHE_SIZE = 16
+WARM_START_ITERATIONS = 15
+MAX_VISIBLE_LABELS = 500
+
+_layout_cache = OrderedDict()  # structure of a graph (see `_draw_graph`) -> positions of the nodes
+_last_layouts = weakref.WeakKeyDictionary()  # widget -> {node key: position} of the graph drawn last
+
+
+def _spring_layout(adj: np.ndarray, initial: np.ndarray, fixed: np.ndarray, iterations: int) -> np.ndarray:
+    g = networkx.Graph()
+    g.add_nodes_from(range(len(initial)))
+    g.add_edges_from(adj.tolist())
+    fixed = np.flatnonzero(fixed).tolist() or None
+    positions = networkx.spring_layout(g, pos=dict(enumerate(initial)), fixed=fixed, iterations=iterations, seed=0)
+    return np.array([positions[i] for i in range(len(initial))], dtype=float).reshape(-1, 2)
+
+
+def _initial_positions(keys, adj: np.ndarray, given: np.ndarray, fixed: np.ndarray,
+                       previous: Mapping[Any, np.ndarray]) -> Tuple[np.ndarray, int]:
+    """
+    Positions to start the layout from: the given ones, those from the previous layout and, for the remaining nodes,
+    the mean position of their already placed neighbours (or random ones). Return also the number of reused positions.
+    """
+    positions = given.copy()
+    known = fixed.copy()
+    for index, key in enumerate(keys):
+        if not known[index] and key in previous:
+            positions[index] = previous[key]
+            known[index] = True
+    reused = int(known.sum() - fixed.sum())
+    rng = np.random.default_rng(0)
+    if len(adj) and not known.all():
+        # mean of the placed neighbours, for the edges in both directions at once
+        src = np.concatenate([adj[:, 0], adj[:, 1]])
+        dst = np.concatenate([adj[:, 1], adj[:, 0]])
+        usable = known[dst] & ~known[src]
+        sums = np.zeros_like(positions)
+        counts = np.zeros(len(positions))
+        np.add.at(sums, src[usable], positions[dst[usable]])
+        np.add.at(counts, src[usable], 1)
+        placed = counts > 0
+        scale = 0.05 * (np.ptp(positions[known], axis=0).max() if known.any() else 1.0)
+        # a bit of noise, so that the nodes with the same neighbours don't overlap
+        positions[placed] = sums[placed] / counts[placed, None] + rng.normal(scale=scale, size=(placed.sum(), 2))
+        known |= placed
+    positions[~known] = rng.uniform(-1, 1, ((~known).sum(), 2))
+    return positions, reused
+
+
+class _LabelsItem(pg.GraphicsObject):
+    """
+    Draws the labels of many nodes in one item. Only the labels inside the view are drawn and only if there are at most
+    `MAX_VISIBLE_LABELS` of them (i.e. when zoomed in enough), so the cost doesn't grow with the size of the graph.
+    """
+
+    def __init__(self, positions: np.ndarray, texts: Sequence[str]):
+        super().__init__()
+        self.texts = list(texts)
+        self.positions = positions
+
+    def set_positions(self, positions: np.ndarray):
+        self.prepareGeometryChange()
+        self.positions = positions
+        self.update()
+
+    def boundingRect(self):
+        if len(self.positions) == 0:
+            return QRectF()
+        (xmin, ymin), (xmax, ymax) = self.positions.min(axis=0), self.positions.max(axis=0)
+        return QRectF(xmin, ymin, xmax - xmin, ymax - ymin)
+
+    def paint(self, painter, *args):
+        view = self.viewRect()
+        if view is None or len(self.positions) == 0:
+            return
+        x, y = self.positions[:, 0], self.positions[:, 1]
+        visible = np.flatnonzero((x >= view.left()) & (x <= view.right()) & (y >= view.top()) & (y <= view.bottom()))
+        if len(visible) > MAX_VISIBLE_LABELS:
+            return
+        transform = painter.transform()
+        painter.resetTransform()  # draw in device coordinates, so the text is not scaled with the view
+        painter.setPen(pg.mkPen(pg.getConfigOption('foreground')))
+        for index in visible:
+            p = transform.map(QPointF(x[index], y[index]))
+            painter.drawText(QRectF(p.x() - 100, p.y() - 10, 200, 20), Qt.AlignCenter, self.texts[index])
+
+
 @reactive_finalizable
 def _draw_graph(nodes: Mapping[Any, dict], edges: Sequence[dict], widget=None):
+    """
+    The positions of the nodes without `pos` are found with `networkx.spring_layout` (the nodes with `pos` are fixed).
+    Layouts are cached by the structure of the graph. If the graph shares nodes with the one drawn before in the
+    widget, the layout starts from the previous positions and does only a few iterations. The layout is computed in a
+    background thread (if there is an event loop running); the nodes are shown at the initial positions meanwhile.
+    """
     widget.item.setAspectLocked()
-    graph_item = pg.GraphItem()
-    widget.item.addItem(graph_item)
-    print("redrawing graph")
-    key_for_index = list(nodes.keys())
-    index_for_key = {key: index for index, key in enumerate(key_for_index)}
-    spots = []
-    adj = []
-    brushes = []
-    datas = []
-
-    # edges
-    for edge in edges:
-        adj.append([index_for_key[edge['src']], index_for_key[edge['dst']]])
-    for index, key in enumerate(key_for_index):
-        node = nodes[key]
-        for neigh in node.get('edges', []):
-            adj.append([index, index_for_key[neigh]])
-
-    # positions
-    if not all(('pos' in node for node in nodes.values())):
-        g = networkx.Graph()
-        g.add_nodes_from(nodes.keys())
-        g.add_edges_from(adj)
-        positions = networkx.spring_layout(g)
-        for key, node in nodes.items():
-            node['pos'] = positions[key]
-
-    positions = []
-
-    for index, key in enumerate(key_for_index):
-        node = nodes[key]
-        # {'pos': (x, y), 'size', 'pen', 'brush', 'symbol'}
-        spot = dict()
-        datas.append((key, node))
-        node_pos = node.get('pos')
-        spot['pos'] = node_pos
-        positions.append(node_pos)
-
-        if 'qt_pen' in node:
-            spot['pen'] = node['qt_pen']
+    keys = list(nodes.keys())
+    index_for_key = {key: index for index, key in enumerate(keys)}
+
+    node_edges = [node.get('edges', ()) for node in nodes.values()]
+    src = [index_for_key[edge['src']] for edge in edges]
+    dst = [index_for_key[edge['dst']] for edge in edges]
+    dst += [index_for_key[neigh] for neighs in node_edges for neigh in neighs]
+    src = np.concatenate([np.array(src, dtype=int), np.repeat(np.arange(len(keys)), [len(n) for n in node_edges])])
+    adj = np.stack([src, np.array(dst, dtype=int)], axis=1).reshape(-1, 2)
+
+    fixed = np.array([node.get('pos') is not None for node in nodes.values()], dtype=bool)
+    given = np.zeros((len(keys), 2))
+    if fixed.any():
+        given[fixed] = np.array([node['pos'] for node in nodes.values() if node.get('pos') is not None], dtype=float)
+
+    layout_needed = not fixed.all()
+    structure = (tuple(keys), adj.tobytes(), fixed.tobytes(), given[fixed].tobytes())
+    positions = _layout_cache.get(structure) if layout_needed else given
+    if positions is not None:
+        if layout_needed:
+            _layout_cache.move_to_end(structure)
+        layout_needed = False
+    else:
+        positions, reused = _initial_positions(keys, adj, given, fixed, _last_layouts.get(widget, {}))
+        iterations = WARM_START_ITERATIONS if reused >= 0.5 * (~fixed).sum() else 50
+
+    def brush(node):
         if 'qt_brush' in node:
-            spot['brush'] = node['qt_brush']
-        if 'size' in node:
-            spot['size'] = node['size']
-        # spot['brush'] = node_pos
-        # spot['symbol'] = node_pos
-
-        spots.append(spot)
-
+            return node['qt_brush']
         if 'face_color' in node:
-            brushes.append(QBrush(QColor(*node['face_color'])))
-        else:
-            brushes.append(None)
-
-    print('adj', adj)
-    graph_item.setData(spots=spots,
-                       pos=np.array(positions),
-                       adj=np.array(adj) if len(adj) > 0 else np.ndarray(shape=(0, 2), dtype=int),
-                       data=datas,
-                       pxMode=True)
+            return QBrush(QColor(*node['face_color']))
+        return None
+
+    node_list = list(nodes.values())
+    graph_kwargs = dict(adj=adj, data=list(nodes.items()), pxMode=True)
+    brushes = [brush(node) for node in node_list]
+    if any(b is not None for b in brushes):
+        default = pg.mkBrush(100, 100, 150)
+        graph_kwargs['symbolBrush'] = [b if b is not None else default for b in brushes]
+    if any('qt_pen' in node for node in node_list):
+        default = pg.mkPen(pg.getConfigOption('foreground'))
+        graph_kwargs['symbolPen'] = [node.get('qt_pen', default) for node in node_list]
+    if any('size' in node for node in node_list):
+        graph_kwargs['size'] = np.array([node.get('size', 10) for node in node_list], dtype=float)
+
+    graph_item = pg.GraphItem()
+    graph_item.setData(pos=positions, **graph_kwargs)
     widget.item.addItem(graph_item)
+    # for hit-testing the nodes (see `graph`)
+    graph_item.node_keys = keys
+    graph_item.node_sizes = graph_kwargs.get('size', graph_item.scatter.opts['size'])
+    graph_item.node_index = GridIndex(positions)
+
+    labeled = [index for index, node in enumerate(node_list) if 'label' in node]
+    labels = _LabelsItem(positions[labeled], [node_list[index]['label'] for index in labeled]) if labeled else None
+    if labels is not None:
+        widget.item.addItem(labels)
+
+    def show_positions(new_positions):
+        graph_item.setData(pos=new_positions, **graph_kwargs)
+        graph_item.node_index.set_points(new_positions)
+        if labels is not None:
+            labels.set_positions(new_positions[labeled])
+        _last_layouts[widget] = dict(zip(keys, new_positions))
+
+    def store_layout(new_positions):
+        _layout_cache[structure] = new_positions
+        while len(_layout_cache) > LAYOUT_CACHE_SIZE:
+            _layout_cache.popitem(last=False)
+
+    task = None
+    if layout_needed:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            new_positions = _spring_layout(adj, positions, fixed, iterations)
+            store_layout(new_positions)
+            show_positions(new_positions)
+        else:
+            async def layout():
+                new_positions = await make_async_using_thread(_spring_layout)(adj, positions, fixed, iterations)
+                store_layout(new_positions)
+                show_positions(new_positions)
 
-    labels = []
-    for node in nodes.values():
-        if 'label' in node:
-            label = pg.TextItem(text=node['label'], anchor=(0.5, 0.5))
-            label.setPos(QPointF(*node['pos']))
-            widget.item.addItem(label)
-            labels.append(label)
-            pass
+            task = asyncio.ensure_future(layout())
+    else:
+        _last_layouts[widget] = dict(zip(keys, positions))
 
     yield graph_item
 
+    if task is not None:
+        task.cancel()
     widget.item.removeItem(graph_item)
-    for label in labels:
-        graph_item.item.removeItem(label)
+    if labels is not None:
+        widget.item.removeItem(labels)
 
 
 @reactive_finalizable
@@ -126,9 +241,6 @@ def _draw_labels(nodes: Mapping[Any, dict], widget=None):
         widget.item.removeItem(text)
 
 
-cnt = 0
-
-
 @reactive_finalizable(pass_args=['nodes', 'edges'])
 def graph(nodes: Mapping[Any, dict], edges: Sequence[dict] = [],
           widget=None, mouse_events: Set[str] = {'click'}, on_mouse_event: Callable = None):
@@ -142,31 +254,29 @@ def graph(nodes: Mapping[Any, dict], edges: Sequence[dict] = [],
     mouse_events = set(mouse_events)
     graph_item = _draw_graph(nodes, edges, widget)
     # labels = _draw_labels(nodes, widget)
-    print("nodes", nodes)
     use_move = {'move'} & mouse_events
     use_enter = {'enter'} & mouse_events
     use_exit = {'exit'} & mouse_events
     omm = None
-    global cnt
-    ccc = cnt
 
     if use_move or use_enter or use_exit:
         inside_keys = set()  # spots that we're inside
-        cnt += 1
 
         @ignore_errors
         def on_mouse_move(p: QPointF):
-            print("omm", ccc)
             raw_nodes = unwrapped(nodes)
-            spots = unwrapped(graph_item).scatter.pointsAt(widget.item.mapToView(p))  # type: Iterable[SpotItem]
-            new_inside_keys = set(spot.data()[0] for spot in spots)
+            raw_graph_item = unwrapped(graph_item)
+            view_box = widget.item.getViewBox()
+            p = view_box.mapSceneToView(p)
+            hits = raw_graph_item.node_index.near(p.x(), p.y(), np.asarray(raw_graph_item.node_sizes) / 2,
+                                                  view_box.viewPixelSize())
+            new_inside_keys = set(raw_graph_item.node_keys[index] for index in hits)
             if on_mouse_event is not None:
                 on_mouse_event(type='move', keys=new_inside_keys)
             for key in new_inside_keys:
                 node = raw_nodes.get(key)
                 if node is not None:
                     node_on_mouse_event = node.get('on_mouse_event')
-                    print('on_mouse_event', node_on_mouse_event)
                     if node_on_mouse_event:
                         if use_move:
                             node_on_mouse_event(type='move')  # fixme: more
@@ -193,7 +303,6 @@ def graph(nodes: Mapping[Any, dict], edges: Sequence[dict] = [],
         # finalizers.append(lambda: widget.sigSceneMouseMoved.disconnect(connection))
 
     yield graph_item
-    print("disconnect", ccc, omm)
     if omm:
         widget.sigSceneMouseMoved.disconnect(omm)
 
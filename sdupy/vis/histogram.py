@@ -0,0 +1,106 @@
+"""
+Histograms of large or growing data for `histogram_pg`, computed without a full pass over the data when only the
+binning or the newly appended values change.
+"""
+from typing import Tuple
+
+import numpy as np
+import pyqtgraph as pg
+
+
+def histogram_of_sorted(values: np.ndarray, bins=10, range=None, density=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The same as `np.histogram(values, bins, range, density)` for sorted `values`, but the counts are found by binary
+    search of the bin edges, so changing the binning costs `O(bins * log(len(values)))` instead of a pass over the data.
+    """
+    if range is None and values.size and not isinstance(bins, str):
+        first, last = values[0], values[-1]
+        if np.isnan(last):  # NaNs are sorted to the end
+            last = values[np.searchsorted(values, np.nan) - 1] if not np.isnan(first) else np.nan
+        range = (first, last) if np.isfinite(first) and np.isfinite(last) else None
+    if range is not None and np.ndim(bins) == 0 and not isinstance(bins, str):
+        edges = np.histogram_bin_edges(np.asarray(range, dtype=values.dtype), bins, range)
+    else:
+        edges = np.histogram_bin_edges(values, bins, range)  # e.g. bins='auto', which needs the data
+    bounds = np.searchsorted(values, edges, side='left')
+    bounds[-1] = np.searchsorted(values, edges[-1], side='right')  # the last bin includes its right edge
+    counts = np.diff(bounds)
+    if density:
+        return counts / np.diff(edges) / counts.sum(), edges
+    return counts, edges
+
+
+class IncrementalHistogram:
+    """
+    A histogram with fixed bins (`bins` equal bins over `range`, as in `np.histogram`), to which values are added with
+    `append` in a single pass over them. Values out of the range are not counted.
+    """
+
+    def __init__(self, bins: int, range: Tuple[float, float]):
+        self.bins = bins
+        self.range = tuple(range)
+        self.edges = np.histogram_bin_edges(np.zeros(0), bins, range)
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.size = 0  # number of values appended (including those out of the range)
+
+    def append(self, values: np.ndarray, weights: np.ndarray = None):
+        values = np.asarray(values)
+        counts, _ = np.histogram(values, self.edges, weights=weights)
+        if counts.dtype != self.counts.dtype:
+            self.counts = self.counts.astype(np.result_type(self.counts, counts))
+        self.counts += counts
+        self.size += values.size
+
+    def histogram(self, density=None) -> Tuple[np.ndarray, np.ndarray]:
+        if density:
+            return self.counts / np.diff(self.edges) / self.counts.sum(), self.edges
+        return self.counts, self.edges
+
+
+class HistogramItem(pg.BarGraphItem):
+    """
+    A `BarGraphItem` showing the histogram of some data. It's updated in place (`setOpts`) when the data changes.
+
+    See `set_histogram` for how the histogram is computed.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(x0=[], width=[], height=[], **kwargs)
+        self.incremental = None  # type: IncrementalHistogram | None
+        self.sorted = None  # type: np.ndarray | None  # sorted values of the current data, once it has been rebinned
+
+    def set_histogram(self, a, bins=10, range=None, density=None, weights=None, append_only=False, data_changed=True):
+        """
+        Show the histogram of `a`, with the arguments of `np.histogram`.
+
+        If `data_changed` is False, `a` is assumed to be the same data as in the previous call (e.g. only the binning
+        has changed). Then the values are sorted once and kept, so the following histograms are found by binary search
+        (see `histogram_of_sorted`). With `append_only`, `a` is assumed to be the previous data with some values
+        appended, and only these values are added to the counts (see `IncrementalHistogram`). In this mode `bins` must
+        be a number and the range, if not given, is set from the first data.
+        """
+        a = np.asarray(a)
+        if data_changed:
+            self.sorted = None
+        if append_only and np.ndim(bins) == 0 and not isinstance(bins, str):
+            a = a.ravel()
+            start = self.incremental.size if self.incremental is not None else 0
+            range = tuple(range) if range is not None else None
+            if (self.incremental is None or start > a.size or bins != self.incremental.bins or
+                    range not in (None, self.incremental.range)):
+                start = 0
+                if range is None:
+                    finite = a[np.isfinite(a)]
+                    range = (finite.min(), finite.max()) if finite.size else (0, 1)
+                self.incremental = IncrementalHistogram(bins, range)
+            self.incremental.append(a[start:], weights[start:] if weights is not None else None)
+            counts, edges = self.incremental.histogram(density)
+        else:
+            self.incremental = None
+            if data_changed or weights is not None:
+                counts, edges = np.histogram(a, bins, range, density, weights)
+            else:
+                if self.sorted is None:
+                    self.sorted = np.sort(a, axis=None)
+                counts, edges = histogram_of_sorted(self.sorted, bins, range, density)
+        self.setOpts(x0=edges[:-1], width=np.diff(edges), height=counts)
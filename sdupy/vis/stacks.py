@@ -0,0 +1,192 @@
+"""
+Lazily loaded stacks of frames (e.g. long recordings), which can be shown with `image_pg_adv` without loading them into
+memory as a whole.
+"""
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+class FrameStack:
+    """
+    A sequence of frames of the same shape and dtype, loaded on demand. Subclasses implement `__len__` and `get_frame`
+    and set `frame_shape` and `dtype`.
+
+    The stack mimics the parts of the ndarray interface used by `pg.ImageView` (the time axis is the first one).
+    """
+    frame_shape = None  # type: Tuple[int, ...]
+    dtype = None  # type: np.dtype
+
+    def __len__(self) -> int:
+        raise NotImplementedError()
+
+    def get_frame(self, index: int) -> np.ndarray:
+        raise NotImplementedError()
+
+    @property
+    def shape(self):
+        return (len(self),) + tuple(self.frame_shape)
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    @property
+    def size(self):
+        return int(np.prod(self.shape))
+
+    def __getitem__(self, index):
+        if isinstance(index, tuple):
+            return self.get_frame(int(index[0]))[index[1:]]
+        return self.get_frame(int(index))
+
+    def sample_frames(self, count=5) -> np.ndarray:
+        """
+        A few frames evenly spaced in the stack, e.g. for estimating the levels.
+        """
+        indices = np.unique(np.linspace(0, len(self) - 1, min(count, len(self))).astype(int))
+        return np.stack([self.get_frame(i) for i in indices])
+
+    def min(self):
+        return self.sample_frames().min()
+
+    def max(self):
+        return self.sample_frames().max()
+
+
+class ArrayStack(FrameStack):
+    """
+    Frames along the first axis of an array, e.g. `np.memmap`. Only the frames that are requested are read.
+    """
+
+    def __init__(self, array: np.ndarray):
+        self.array = array
+        self.frame_shape = array.shape[1:]
+        self.dtype = array.dtype
+
+    def __len__(self):
+        return len(self.array)
+
+    def get_frame(self, index):
+        return np.array(self.array[index])  # copy, so that a memmap is read here and not when the frame is shown
+
+
+def npy_stack(path: str) -> ArrayStack:
+    """
+    Frames from a `.npy` file, which is memory-mapped rather than loaded.
+    """
+    return ArrayStack(np.load(path, mmap_mode='r'))
+
+
+class ImageFilesStack(FrameStack):
+    """
+    Frames read from image files (one frame per file) with imageio.
+    """
+
+    def __init__(self, paths: Sequence[str]):
+        from imageio.v3 import imread
+
+        self._imread = imread
+        self.paths = list(paths)
+        first = self.get_frame(0)
+        self.frame_shape = first.shape
+        self.dtype = first.dtype
+
+    def __len__(self):
+        return len(self.paths)
+
+    def get_frame(self, index):
+        return np.asarray(self._imread(self.paths[index]))
+
+
+class PrefetchingStack(FrameStack):
+    """
+    Keeps the recently used frames of another stack in a bounded LRU cache and loads the frames around the last
+    requested one in background threads, so that playing or scrubbing through the stack doesn't wait for the loading
+    while the memory used stays constant.
+    """
+
+    def __init__(self, stack: FrameStack, cache_size=32, prefetch=4, max_workers=2):
+        assert prefetch < cache_size
+        self.stack = stack
+        self.frame_shape = stack.frame_shape
+        self.dtype = stack.dtype
+        self.cache_size = cache_size
+        self.prefetch = prefetch
+        self._cache = OrderedDict()
+        self._loading = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def __len__(self):
+        return len(self.stack)
+
+    def _store(self, index, frame):
+        with self._lock:
+            self._cache[index] = frame
+            self._cache.move_to_end(index)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+            self._loading.discard(index)
+
+    def _load(self, index):
+        try:
+            self._store(index, self.stack.get_frame(index))
+        except Exception:
+            logging.exception("cannot prefetch frame {}".format(index))
+            with self._lock:
+                self._loading.discard(index)
+
+    def get_frame(self, index):
+        with self._lock:
+            frame = self._cache.get(index)
+            if frame is not None:
+                self._cache.move_to_end(index)
+        if frame is None:
+            frame = self.stack.get_frame(index)
+            self._store(index, frame)
+        self._prefetch_around(index)
+        return frame
+
+    def _prefetch_around(self, index):
+        # the next frames are the most likely to be needed, but scrubbing may go backwards as well
+        candidates = ([index + i for i in range(1, self.prefetch + 1)] +
+                      [index - i for i in range(1, self.prefetch // 2 + 1)])
+        with self._lock:
+            to_load = [i for i in candidates
+                       if 0 <= i < len(self.stack) and i not in self._cache and i not in self._loading]
+            self._loading.update(to_load)
+        for i in to_load:
+            self._executor.submit(self._load, i)
+
+
+def is_frame_stack_source(source) -> bool:
+    """
+    Whether `source` should be shown as a lazily loaded stack (see `as_frame_stack`) rather than as an array in memory:
+    a `FrameStack`, a memory-mapped array, a path to a `.npy` file or a list (or a tuple) of paths to image files.
+    """
+    if isinstance(source, (FrameStack, np.memmap, str)):
+        return True
+    return isinstance(source, (list, tuple)) and len(source) > 0 and all(isinstance(i, str) for i in source)
+
+
+def as_frame_stack(source) -> FrameStack:
+    """
+    Make a prefetching frame stack from a `FrameStack`, an array (e.g. `np.memmap`), a path to a `.npy` file or a list
+    of paths to image files.
+    """
+    if isinstance(source, PrefetchingStack):
+        return source
+    if isinstance(source, FrameStack):
+        return PrefetchingStack(source)
+    if isinstance(source, np.ndarray):
+        return PrefetchingStack(ArrayStack(source))
+    if isinstance(source, str):
+        return PrefetchingStack(npy_stack(source))
+    if isinstance(source, Sequence) and all(isinstance(i, str) for i in source):
+        return PrefetchingStack(ImageFilesStack(source))
+    raise TypeError("cannot make a frame stack from {}".format(type(source)))
@@ -0,0 +1,107 @@
+"""
+Curves fed with samples arriving continuously, e.g. from an acquisition.
+"""
+from typing import Optional
+
+import numpy as np
+import pyqtgraph as pg
+
+
+class StreamBuffer:
+    """
+    A preallocated buffer of samples. Appending copies only the new samples; the buffer grows by doubling when needed.
+    If `max_samples` is given, only the last `max_samples` samples are kept (the buffer is twice as long and the kept
+    samples are moved to its start when it's full), so `data` is always a contiguous view.
+    """
+
+    def __init__(self, max_samples: Optional[int] = None, dtype=float, capacity=4096):
+        self.max_samples = max_samples
+        if max_samples is not None:
+            capacity = 2 * max_samples
+        self._data = np.empty(capacity, dtype=dtype)
+        self._start = 0
+        self._stop = 0
+
+    def __len__(self):
+        return self._stop - self._start
+
+    @property
+    def data(self) -> np.ndarray:
+        return self._data[self._start:self._stop]
+
+    def clear(self):
+        self._start = self._stop = 0
+
+    def append(self, values):
+        values = np.asarray(values)
+        if self.max_samples is not None:
+            values = values[-self.max_samples:]
+        if self._stop + len(values) > len(self._data):
+            keep = self.data
+            if self.max_samples is not None:
+                keep = keep[max(0, len(keep) + len(values) - self.max_samples):]
+                target = self._data
+            else:
+                target = np.empty(max(2 * len(self._data), len(keep) + len(values)), dtype=self._data.dtype)
+            target[:len(keep)] = keep
+            self._data = target
+            self._start, self._stop = 0, len(keep)
+        self._data[self._stop:self._stop + len(values)] = values
+        self._stop += len(values)
+        if self.max_samples is not None and len(self) > self.max_samples:
+            self._start = self._stop - self.max_samples
+
+
+class StreamingPlotDataItem(pg.PlotDataItem):
+    """
+    A `PlotDataItem` to which samples are appended (see `append`) instead of replacing the whole data, so the cost of an
+    update depends on the number of new samples only. With `max_samples`, only the last samples are shown (a scrolling
+    window).
+
+    If no `x` is given, the index of the sample since the start of the stream is used.
+
+    Use `enable_downsampling` after adding the item to a `PlotItem` (which applies its own settings to the item), so that
+    only the visible range with about two points per pixel is drawn.
+    """
+
+    def __init__(self, max_samples: Optional[int] = None, **kwargs):
+        kwargs.setdefault('skipFiniteCheck', True)
+        super().__init__(**kwargs)
+        self.opts['autoDownsampleFactor'] = 1.0  # about two points per pixel with the peak downsampling
+        self.max_samples = max_samples
+        self._x = StreamBuffer(max_samples)
+        self._y = StreamBuffer(max_samples)
+        self.samples_seen = 0  # number of samples appended since the last reset
+
+    def enable_downsampling(self):
+        self.setClipToView(True)
+        self.setDownsampling(auto=True, method='peak')
+
+    def reset(self):
+        self._x.clear()
+        self._y.clear()
+        self.samples_seen = 0
+
+    def append(self, y, x=None, update=True):
+        y = np.asarray(y)
+        if x is None:
+            x = np.arange(self.samples_seen, self.samples_seen + len(y))
+        self._x.append(x)
+        self._y.append(y)
+        self.samples_seen += len(y)
+        if update:
+            self.setData(self._x.data, self._y.data)
+
+    def set_stream(self, *args):
+        """
+        Show the signal (`y` or `x, y`) that has grown since the last call: only the samples after the ones seen before
+        are appended. If the signal is shorter than before, it's shown from the start.
+        """
+        if len(args) == 1:
+            x, y = None, args[0]
+        else:
+            x, y = args
+        if len(y) < self.samples_seen:
+            self.reset()
+        new = slice(self.samples_seen, None)
+        self.append(y[new], None if x is None else x[new])
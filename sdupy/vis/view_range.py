@@ -0,0 +1,75 @@
+"""
+The visible part of the data of a plot as a var, so that level-of-detail logic (decimation, tile loading, on-demand
+computation) can depend on it.
+"""
+from typing import NamedTuple
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtCore import QObject, pyqtSignal
+
+from sdupy.pyreactive import Var, var
+
+
+class ViewRange(NamedTuple):
+    xmin: float
+    xmax: float
+    ymin: float
+    ymax: float
+    pixel_width: float  # width of a pixel in the units of the data
+    pixel_height: float  # height of a pixel in the units of the data
+
+
+def view_range_pg(view_box: pg.ViewBox) -> ViewRange:
+    (xmin, xmax), (ymin, ymax) = view_box.viewRange()
+    pixel_width, pixel_height = view_box.viewPixelSize() if view_box.width() > 0 and view_box.height() > 0 \
+        else (np.nan, np.nan)
+    return ViewRange(xmin, xmax, ymin, ymax, abs(float(pixel_width)), abs(float(pixel_height)))
+
+
+def view_range_mpl(axes: plt.Axes) -> ViewRange:
+    xmin, xmax = sorted(axes.get_xlim())  # the limits are reversed for inverted axes (e.g. of images)
+    ymin, ymax = sorted(axes.get_ylim())
+    extent = axes.get_window_extent()
+    pixel_width = (xmax - xmin) / extent.width if extent.width > 0 else np.nan
+    pixel_height = (ymax - ymin) / extent.height if extent.height > 0 else np.nan
+    return ViewRange(float(xmin), float(xmax), float(ymin), float(ymax), float(pixel_width), float(pixel_height))
+
+
+class ViewRangeWatcher(QObject):
+    """
+    Keeps `var` equal to the range shown by a pyqtgraph view box or matplotlib axes (see `ViewRange`). While the view
+    is being panned or zoomed, the var is set at most `rate_limit` times per second, so the computations depending on
+    it don't fall behind.
+    """
+    changed = pyqtSignal()
+
+    def __init__(self, view, rate_limit: float = 30):
+        super().__init__()
+        self.view = view
+        if isinstance(view, plt.Axes):
+            self._get_range = lambda: view_range_mpl(view)
+            view.callbacks.connect('xlim_changed', self._changed)
+            view.callbacks.connect('ylim_changed', self._changed)
+            view.get_figure().canvas.mpl_connect('resize_event', self._changed)
+        else:
+            self._get_range = lambda: view_range_pg(view)
+            view.sigRangeChanged.connect(self._changed)
+            view.sigResized.connect(self._changed)
+        self.var = var(self._get_range())  # type: Var[ViewRange]
+        self._proxy = pg.SignalProxy(self.changed, rateLimit=rate_limit, slot=self._update)
+
+    def set_rate_limit(self, rate_limit: float):
+        """
+        Set the var at most `rate_limit` times per second from now on (e.g. when the watcher is reused by `view_range`).
+        """
+        self._proxy.rateLimit = rate_limit
+
+    def _changed(self, *args):
+        self.changed.emit()
+
+    def _update(self, *args):
+        value = self._get_range()
+        if not np.array_equal(value, self.var.__inner__, equal_nan=True):
+            self.var.set(value)
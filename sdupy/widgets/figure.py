@@ -12,6 +12,7 @@ from matplotlib.backend_bases import MouseEvent, key_press_handler
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas, \
     NavigationToolbar2QT as NavigationToolbar
 
+from sdupy.render_scheduler import request_render
 from .common.register import register_widget
 
 matplotlib.rcParams.update({'font.size': 6})
@@ -79,6 +80,11 @@ class Figure(QWidget):
 
         self.current_modifiers = set()
 
+        self.blit = False  # redraw only the animated artists over a cached background; see `set_blit`
+        self._background = None
+        self._background_state = None
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+
         self.axes = self.figure.add_subplot(111)
         self.axes.set_adjustable('datalim')  # use whole area when keeping aspect ratio of images
         self.resizeEvent(None)
@@ -131,11 +137,57 @@ class Figure(QWidget):
 
         self.draw()
 
+    def set_blit(self, enabled=True):
+        """
+        Enable or disable the blitting mode. In this mode the animated artists (see `Artist.set_animated`) are drawn
+        over a cached image of the rest of the figure, so updating them doesn't need the full redraw. The cache is
+        invalidated when the axes limits or the figure size change.
+
+        Artists plotted by `ReactiveAxes` (e.g. by `vis.plot_mpl`) are animated when they are plotted or updated with the
+        blitting enabled; until then they are redrawn with the whole figure.
+        """
+        self.blit = enabled
+        if not enabled:
+            for artist in self.animated_artists():
+                artist.set_animated(False)
+        self.invalidate_background()
+        self.draw()
+
+    def animated_artists(self):
+        artists = [a for ax in self.figure.get_axes() for a in ax.get_children() if a.get_animated()]
+        return sorted(artists, key=lambda a: a.get_zorder())
+
+    def invalidate_background(self):
+        self._background = None
+
+    def _view_state(self):
+        # the background is valid as long as the limits of the axes and the size of the figure are unchanged
+        return tuple(ax.viewLim.bounds for ax in self.figure.get_axes()) + (self.figure.bbox.bounds,)
+
+    def on_draw(self, event):
+        if self.blit:
+            self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+            self._background_state = self._view_state()
+            self._draw_animated()
+
+    def _draw_animated(self):
+        for artist in self.animated_artists():
+            artist.axes.draw_artist(artist)
+        self.canvas.blit(self.figure.bbox)
+
     def draw(self):
-        self.canvas.draw_idle()
+        request_render(self, (self, 'draw'), self.draw_now)
+
+    def draw_now(self):
+        if self.blit and self._background is not None and self._background_state == self._view_state():
+            self.canvas.restore_region(self._background)
+            self._draw_animated()
+        else:
+            self.canvas.draw_idle()
 
     def resizeEvent(self, a0: QtGui.QResizeEvent):
-        self.tight_layout()
+        self.invalidate_background()
+        request_render(self, (self, 'tight_layout'), self.tight_layout)
 
     def tight_layout(self):
         self.figure.tight_layout(pad=0.5)
@@ -1,12 +1,14 @@
 from typing import Any, Mapping, Tuple
 
 import networkx as nx
+import numpy as np
 from matplotlib import pyplot as plt
 from matplotlib.artist import Artist
 from matplotlib.backend_bases import MouseEvent
 from matplotlib.text import Text
 
 from sdupy import reactive_finalizable
+from sdupy.widgets.point_index import GridIndex
 
 """
 TODO: 
@@ -21,6 +23,7 @@ TODO:
 """
 
 HOVER_COLOR = 'blue'
+HOVER_MARGIN = 2  # pixels
 
 
 @reactive_finalizable
@@ -56,13 +59,43 @@ def display_graph(g: nx.Graph, ax: plt.Axes, pos: Mapping[Any, Tuple[float, floa
 
     patches = [make_node(node) for node in nodes]
 
-    node_for_artist = {patch: node for node, patch in zip(nodes, patches)}
-
     hovered_artists = set()
 
+    # anchors of the texts in display coordinates, rebuilt when the view changes (e.g. zoom)
+    anchors = GridIndex()
+    node_positions = np.array([pos_for_node(node) for node in nodes], dtype=float).reshape(-1, 2)
+    anchors_view = None
+    # boxes of the texts relative to their anchors, in pixels: x0, y0, x1, y1; measured again after each draw, since the
+    # boxes are laid out (and resized, e.g. when the dpi, the font or the text changes) when drawn
+    extents = None
+
+    def boxes_drawn(event):
+        nonlocal extents
+        extents = None
+
+    def candidates_at(event: MouseEvent):
+        nonlocal anchors_view, extents
+        view = (ax.transData.get_matrix().tobytes(), ax.bbox.bounds)
+        if view != anchors_view or extents is None:
+            anchors_view = view
+            display = ax.transData.transform(node_positions)
+            anchors.set_points(display)
+            if extents is None:
+                # the boxes are laid out when drawn, so measuring them is cheap (unlike measuring the texts)
+                boxes = np.array([patch.get_bbox_patch().get_window_extent().extents
+                                  for patch in patches]).reshape(-1, 4)
+                extents = boxes - np.tile(display, 2)
+                extents += [-HOVER_MARGIN, -HOVER_MARGIN, HOVER_MARGIN, HOVER_MARGIN]
+        if not len(extents):
+            return []
+        # texts whose box may contain the point
+        x0, y0 = extents[:, :2].min(axis=0)
+        x1, y1 = extents[:, 2:].max(axis=0)
+        return [patches[i] for i in anchors.in_box(event.x - x1, event.x - x0, event.y - y1, event.y - y0)]
+
     def on_plot_hover(event: MouseEvent):
         axes = None
-        for artist, node in node_for_artist.items():  # type: Tuple[Artist, Any]
+        for artist in set(candidates_at(event)) | hovered_artists:  # type: Artist
             if artist.contains(event)[0]:
                 if artist not in hovered_artists:
                     hover_artist(artist)
@@ -77,10 +110,12 @@ def display_graph(g: nx.Graph, ax: plt.Axes, pos: Mapping[Any, Tuple[float, floa
             axes.get_figure().canvas.draw_idle()
 
     connection_id = ax.figure.canvas.mpl_connect('motion_notify_event', on_plot_hover)
+    draw_connection_id = ax.figure.canvas.mpl_connect('draw_event', boxes_drawn)
 
     yield patches, id
 
     ax.figure.canvas.mpl_disconnect(connection_id)
+    ax.figure.canvas.mpl_disconnect(draw_connection_id)
     for patch in patches:
         patch.remove()
     ax.figure.canvas.draw_idle()
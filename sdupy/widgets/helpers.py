@@ -2,6 +2,7 @@ import logging
 from contextlib import suppress
 from typing import Sequence
 
+from PyQt5.QtCore import QEvent, QObject
 from PyQt5.QtWidgets import QWidget
 from pyqtgraph.parametertree import ParameterTree, Parameter
 
@@ -9,6 +10,7 @@ from sdupy.pyreactive import Wrapped, is_wrapper
 from sdupy.pyreactive.notifier import ScopedName
 from sdupy.pyreactive.refresher import logger as notify_logger
 from sdupy.pyreactive.var import Proxy
+from sdupy.render_scheduler import find_render_scheduler, request_render
 
 
 def paramtree_get_root_parameters(pt: ParameterTree) -> Sequence[Parameter]:
@@ -37,36 +39,88 @@ def paramtree_load_params(param_tree: ParameterTree, state: dict):
             i.restoreState(pickle.loads(bytes.fromhex(state[i.name()])), addChildren=False, removeChildren=False)
 
 
+class _VisibilityWatcher(QObject):
+    # calls `callback` on the events that may change whether a widget is visible
+    EVENTS = {QEvent.Show, QEvent.Hide, QEvent.Resize, QEvent.WindowStateChange}
+
+    def __init__(self, callback):
+        super().__init__()
+        self.callback = callback
+
+    def eventFilter(self, obj, event):
+        if event.type() in self.EVENTS:
+            self.callback()
+        return False
+
+
 class TriggerIfVisible(Proxy):
+    """
+    Pulls the value of `other_var` (once per frame, see `request_render`) when it changes and `widget` is visible.
+
+    While the widget is hidden (e.g. a dock in a background tab, a minimized window or a collapsed splitter), it doesn't
+    observe `other_var` at all, so nothing pulls it and the reactive functions it depends on are not run. When the
+    widget is shown again, it observes `other_var` again and pulls the latest value once.
+    """
+
     def __init__(self, other_var: Wrapped, widget: QWidget):
         with ScopedName('trig_if_vis'):
             super().__init__(other_var)
         self.widget = widget
         self._notifier.notify_func = self._trigger
-        self._other_var.__notifier__.add_observer(self._notifier)
+        self._other_var.__notifier__.remove_observer(self._notifier)  # observed only when visible
+        self._subscribed = False
         if hasattr(self.widget, 'visibilityChanged'):
-            self.widget.visibilityChanged.connect(self._trigger)
+            self.widget.visibilityChanged.connect(self._visibility_changed)
         else:
             logging.warning(f'widget {self.widget.objectName()} of type {self.widget.__class__.__name__} does not have visibilityChanged signal')
-        self._trigger()
+        self._watcher = _VisibilityWatcher(self._visibility_changed)
+        self._watched = [self.widget, self.widget.window()]
+        for obj in self._watched:
+            obj.installEventFilter(self._watcher)
+        self._visibility_changed()
 
     def _is_visible(self):
-        if hasattr(self.widget, 'visibleRegion2'):
-            return bool(self.widget.visibleRegion2().rects())
+        widget = self.widget
+        return widget.isVisible() and widget.width() > 0 and widget.height() > 0 and not widget.window().isMinimized()
+
+    def _visibility_changed(self, *args):
+        if self._other_var is None:
+            return
+        visible = self._is_visible()
+        if visible == self._subscribed:
+            return
+        self._subscribed = visible
+        if visible:
+            self._other_var.__notifier__.add_observer(self._notifier)
+            self._trigger()  # it may have changed while hidden
         else:
-            return bool(self.widget.visibleRegion().rects())
+            self._other_var.__notifier__.remove_observer(self._notifier)
+            scheduler = find_render_scheduler(self.widget)
+            if scheduler is not None:
+                scheduler.cancel(self._notifier)
 
     def _trigger(self):
         if self._is_visible():
+            # pull the value once per frame, no matter how many times it has been notified
+            request_render(self.widget, self._notifier, self._pull)
+        return True
+
+    def _pull(self):
+        if self._other_var is not None:
             with suppress(Exception):
                 notify_logger.debug('widget {} is visible; updating {}'.format(self.widget.objectName(),
                                                                               self._other_var.__notifier__.name))
                 self._other_var.__inner__  # trigger run even if the result is not used
-        return True
 
     def _cleanup(self):
-        self.widget.visibilityChanged.disconnect(self._trigger)
-        self._other_var.__notifier__.remove_observer(self._notifier)
+        if hasattr(self.widget, 'visibilityChanged'):
+            self.widget.visibilityChanged.disconnect(self._visibility_changed)
+        with suppress(RuntimeError):  # the widget may have been deleted
+            for obj in self._watched:
+                obj.removeEventFilter(self._watcher)
+        if self._subscribed:
+            self._other_var.__notifier__.remove_observer(self._notifier)
+            self._subscribed = False
         self._other_var = None
 
 
@@ -0,0 +1,144 @@
+"""
+Display levels and histograms of images estimated from a strided sample of the pixels, so that their cost doesn't
+depend on the image size.
+"""
+import weakref
+from typing import Callable, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+Levels = Tuple[float, float]
+
+_cache = {}  # (identity of the image, what) -> (key, value)
+
+
+def _image_identity(image: np.ndarray):
+    owner = image
+    while isinstance(owner.base, np.ndarray):
+        owner = owner.base
+    return owner, (id(owner), image.__array_interface__['data'][0], image.shape, image.strides, image.dtype.str)
+
+
+def cached_for_image(image: np.ndarray, what: Hashable, compute: Callable[[], object], key: Hashable = None):
+    """
+    Return `compute()`, cached for the memory of `image` (views of the same memory with the same layout share the entry)
+    and `key`, which must change whenever the image is modified in place (e.g. the version of the var holding it, see
+    `version`). Only the value for the latest key is kept, and it's dropped when the memory is freed.
+
+    Without a `key` nothing is cached, since an array modified in place cannot be told from the original one.
+    """
+    if key is None:
+        return compute()
+    owner, identity = _image_identity(image)
+    cache_key = (identity, what)
+    entry = _cache.get(cache_key)
+    if entry is not None and entry[0] == key:
+        return entry[1]
+    value = compute()
+    if entry is None:
+        try:
+            weakref.finalize(owner, _cache.pop, cache_key, None)
+        except TypeError:
+            return value  # cannot tell when the memory is freed, so don't cache
+    _cache[cache_key] = (key, value)
+    return value
+
+
+def sample_image(image: np.ndarray, max_samples=2 ** 16, channel_axis: Optional[int] = None) -> np.ndarray:
+    """
+    A strided view of `image` with at most `max_samples` pixels (per channel). Nothing is copied, so for a memory-mapped
+    image only the sampled pixels are read.
+    """
+    channels = image.shape[channel_axis] if channel_axis is not None else 1
+    while image.size > max_samples * channels:
+        sizes = list(image.shape)
+        if channel_axis is not None:
+            sizes[channel_axis] = 0
+        axis = int(np.argmax(sizes))
+        index = [slice(None)] * image.ndim
+        index[axis] = slice(None, None, 2)
+        image = image[tuple(index)]
+    return image
+
+
+def _channels(sample: np.ndarray, channel_axis: Optional[int]) -> List[np.ndarray]:
+    if channel_axis is None:
+        channels = [sample]
+    else:
+        channels = [sample.take(i, axis=channel_axis) for i in range(sample.shape[channel_axis])]
+    result = []
+    for channel in channels:
+        channel = np.asarray(channel).ravel()
+        if channel.dtype.kind == 'f':
+            channel = channel[np.isfinite(channel)]
+        result.append(channel)
+    return result
+
+
+def _value_counts(values: np.ndarray):
+    # counts of each value of an integer array (much faster than sorting, as needed for percentiles)
+    if values.dtype.kind not in 'iu' or values.size == 0:
+        return None
+    low, high = int(values.min()), int(values.max())
+    if high - low > 2 ** 20:
+        return None
+    # signed values are widened, since e.g. `30000 - (-30000)` wraps in int16 (unsigned ones can't wrap: low is the min)
+    offsets = values.astype(np.int64) - low if values.dtype.kind == 'i' else values - values.dtype.type(low)
+    return low, np.bincount(offsets.astype(np.intp, copy=False), minlength=high - low + 1)
+
+
+def estimate_levels(image: np.ndarray, percentiles=(0.1, 99.9), max_samples=2 ** 16,
+                    channel_axis: Optional[int] = None, key: Hashable = None) -> List[Levels]:
+    """
+    The display levels of `image`, one pair per channel: the given percentiles of a strided sample of the pixels, so
+    that a few outliers (e.g. hot pixels) don't make the whole image dark. The result is cached for `key` (see
+    `cached_for_image`).
+    """
+
+    def compute():
+        levels = []
+        for values in _channels(sample_image(image, max_samples, channel_axis), channel_axis):
+            if values.size == 0:
+                levels.append((0.0, 0.0))
+                continue
+            counts = _value_counts(values)
+            if counts is not None:
+                offset, counts = counts
+                cumulative = np.cumsum(counts)
+                low, high = np.searchsorted(cumulative, np.asarray(percentiles) / 100 * cumulative[-1]) + offset
+            else:
+                low, high = np.percentile(values, percentiles)
+            if low == high:
+                low, high = values.min(), values.max()
+            levels.append((float(low), float(high)))
+        return levels
+
+    return cached_for_image(image, ('levels', percentiles, max_samples, channel_axis), compute, key)
+
+
+def sampled_histogram(image: np.ndarray, max_samples=2 ** 16, channel_axis: Optional[int] = None,
+                      key: Hashable = None) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Histograms (left bin edges and counts, like `pg.ImageItem.getHistogram`) of a strided sample of the pixels, one
+    per channel. The result is cached for `key` (see `cached_for_image`).
+    """
+
+    def compute():
+        histograms = []
+        for values in _channels(sample_image(image, max_samples, channel_axis), channel_axis):
+            if values.size == 0:
+                histograms.append((np.zeros(0), np.zeros(0)))
+                continue
+            counts = _value_counts(values)
+            if counts is not None:
+                # integer bins, as many as needed but at most about 500
+                low, counts = counts
+                step = max(1, -(-len(counts) // 500))
+                starts = np.arange(0, len(counts), step)
+                histograms.append((starts + float(low), np.add.reduceat(counts, starts)))
+            else:
+                counts, edges = np.histogram(values, bins=500 if values.min() != values.max() else 1)
+                histograms.append((edges[:-1], counts))
+        return histograms
+
+    return cached_for_image(image, ('histogram', max_samples, channel_axis), compute, key)
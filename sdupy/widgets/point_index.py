@@ -0,0 +1,108 @@
+"""
+Spatial index of 2D points for hit-testing (e.g. hovering over the nodes of a graph or the points of a scatter plot),
+so that a query costs about the same regardless of the number of points.
+"""
+from typing import Optional, Tuple, Union
+
+import numpy as np
+
+
+class GridIndex:
+    """
+    Points bucketed into a uniform grid of about `points_per_cell` points per cell. The points are sorted by the cell
+    (row-major), so the points of consecutive cells of a row form a contiguous range and a box query looks at a few
+    ranges only.
+
+    The index is built lazily by the first query after `set_points`, so points that change often (e.g. a layout being
+    computed) cost nothing until they are actually queried. Non-finite points are never returned.
+    """
+
+    def __init__(self, points: np.ndarray = None, points_per_cell=4):
+        self.points_per_cell = points_per_cell
+        self._points = np.zeros((0, 2))
+        self._order = None  # type: Optional[np.ndarray]  # indices of the points, sorted by the cell
+        self._starts = None  # type: Optional[np.ndarray]  # cell -> first position in `_order`
+        self._origin = np.zeros(2)
+        self._cell_size = np.ones(2)
+        self._cells = (1, 1)  # columns, rows
+        if points is not None:
+            self.set_points(points)
+
+    def __len__(self):
+        return len(self._points)
+
+    @property
+    def points(self) -> np.ndarray:
+        return self._points
+
+    def set_points(self, points: np.ndarray):
+        self._points = np.asarray(points, dtype=float).reshape(-1, 2)
+        self._order = None
+
+    def _build(self):
+        finite = np.flatnonzero(np.isfinite(self._points).all(axis=1))
+        points = self._points[finite]
+        if len(points):
+            low, high = points.min(axis=0), points.max(axis=0)
+        else:
+            low, high = np.zeros(2), np.ones(2)
+        extent = np.where(high > low, high - low, 1.0)
+        cells = max(1, len(points) // self.points_per_cell)
+        columns = int(np.clip(np.ceil(np.sqrt(cells * extent[0] / extent[1])), 1, cells))
+        rows = int(np.clip(np.ceil(cells / columns), 1, cells))
+        self._origin = low
+        self._cell_size = extent / (columns, rows) * (1 + 1e-9)  # so that the maximum falls in the last cell
+        self._cells = (columns, rows)
+        cell = self._cell_of(points)
+        order = np.argsort(cell, kind='stable')
+        self._order = finite[order]
+        self._starts = np.searchsorted(cell[order], np.arange(columns * rows + 1))
+
+    def _cell_of(self, points):
+        ix, iy = self._cell_coords(points[:, 0], points[:, 1])
+        return iy * self._cells[0] + ix
+
+    def _cell_coords(self, x, y):
+        columns, rows = self._cells
+        ix = np.clip(np.floor((x - self._origin[0]) / self._cell_size[0]), 0, columns - 1).astype(np.intp)
+        iy = np.clip(np.floor((y - self._origin[1]) / self._cell_size[1]), 0, rows - 1).astype(np.intp)
+        return ix, iy
+
+    def in_box(self, xmin, xmax, ymin, ymax) -> np.ndarray:
+        """
+        Indices of the points inside the box (bounds included), in no particular order.
+        """
+        if self._order is None:
+            self._build()
+        if not len(self._order) or xmin > xmax or ymin > ymax:
+            return np.zeros(0, dtype=np.intp)
+        (ix0, ix1), (iy0, iy1) = self._cell_coords(np.array([xmin, xmax]), np.array([ymin, ymax]))
+        columns = self._cells[0]
+        ranges = [self._order[self._starts[row * columns + ix0]:self._starts[row * columns + ix1 + 1]]
+                  for row in range(iy0, iy1 + 1)]
+        candidates = np.concatenate(ranges) if len(ranges) > 1 else ranges[0]
+        x, y = self._points[candidates, 0], self._points[candidates, 1]
+        return candidates[(x >= xmin) & (x <= xmax) & (y >= ymin) & (y <= ymax)]
+
+    def near(self, x, y, radius: Union[float, np.ndarray], pixel_size: Tuple[float, float] = (1.0, 1.0),
+             limit: int = None) -> np.ndarray:
+        """
+        Indices of the points not further than `radius` from `(x, y)`, the nearest first (at most `limit` of them).
+
+        Distances are measured in pixels of `pixel_size` (the size of a pixel in the units of the points, e.g.
+        `ViewBox.viewPixelSize()`), so that the points drawn as symbols of a fixed size on the screen can be hit-tested.
+        `radius` is either one for all the points or an array with a radius for each point.
+        """
+        radius = np.asarray(radius, dtype=float)
+        max_radius = float(radius.max()) if radius.size else 0.0
+        rx, ry = max_radius * pixel_size[0], max_radius * pixel_size[1]
+        candidates = self.in_box(x - rx, x + rx, y - ry, y + ry)
+        dx = (self._points[candidates, 0] - x) / pixel_size[0]
+        dy = (self._points[candidates, 1] - y) / pixel_size[1]
+        distance = np.hypot(dx, dy)
+        hit = distance <= (radius[candidates] if radius.ndim else radius)
+        candidates, distance = candidates[hit], distance[hit]
+        if limit is not None and len(candidates) > limit:
+            nearest = np.argpartition(distance, limit - 1)[:limit]
+            candidates, distance = candidates[nearest], distance[nearest]
+        return candidates[np.argsort(distance, kind='stable')]
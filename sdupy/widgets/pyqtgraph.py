@@ -3,9 +3,11 @@ import os
 import logging
 import time
 import weakref
+from concurrent.futures import ThreadPoolExecutor
 from inspect import iscoroutinefunction
 from typing import Callable, Optional
 
+import numpy as np
 import pyqtgraph as pg
 from PyQt5 import QtCore
 from PyQt5.QtCore import Qt, QMimeData
@@ -19,6 +21,8 @@ from pyqtgraph.widgets.DataFilterWidget import EnumFilterItem
 
 from sdupy.utils import ignore_errors, make_async_using_thread, make_sync
 from sdupy.widgets.helpers import paramtree_dump_params, paramtree_load_params
+from sdupy.widgets.image_levels import estimate_levels, sampled_histogram
+from sdupy.widgets.point_index import GridIndex
 from . import register_widget
 
 
@@ -163,9 +167,24 @@ def index_to_str(index):
 
 @register_widget("pyqtgraph image view")
 class PgImage(pg.ImageView):
+    """
+    The levels are estimated from a strided sample of the image with percentile clipping and the histogram is computed
+    from a sample in a background thread and shown when ready (see `sdupy.widgets.image_levels`), so that the cost of
+    an update doesn't grow with the image size.
+    """
+    sigHistogramReady = QtCore.pyqtSignal(int, object)  # generation, histograms (or None on error)
+
     def __init__(self, parent, name):
         super().__init__(parent, view=pg.PlotItem())
         self.view.setAspectLocked(True)
+        self.stack = None  # set if the image is a lazily loaded frame stack (see `sdupy.vis.stacks`)
+        self._histogram_executor = ThreadPoolExecutor(max_workers=1)
+        self._histogram_generation = 0
+        self._histogram_busy = False
+        self._histogram_next = None  # (generation, image, per channel) to compute when the worker is free
+        self.imageItem.sigImageChanged.disconnect(self.ui.histogram.imageChanged)
+        self.imageItem.sigImageChanged.connect(self._image_changed)
+        self.sigHistogramReady.connect(self._histogram_ready)
         self._show_cursor_proxy = None
         self.cursor_pos_label = None
         self.show_cursor_pos()
@@ -180,6 +199,98 @@ class PgImage(pg.ImageView):
         self.pos_label.setText('')
         self.ui.gridLayout.addWidget(self.pos_label, 2, 0, 2, 1)
 
+    def setImage(self, img, *args, **kwargs):
+        """
+        Besides arrays, it accepts frame stacks (see `sdupy.vis.stacks`) - the frames are loaded only when shown.
+        """
+        self.stack = img if hasattr(img, 'get_frame') else None
+        # the ROI plot would need all the frames of a stack
+        if self.stack is not None:
+            self.ui.roiBtn.setChecked(False)
+        self.ui.roiBtn.setEnabled(self.stack is None)
+        super().setImage(img, *args, **kwargs)
+        if self.stack is not None and self.axes['t'] != 0:
+            raise ValueError("the time axis of a frame stack must be the first one, got axes {}".format(self.axes))
+
+    def getProcessedImage(self):
+        if self.stack is None:
+            return super().getProcessedImage()
+        if self.imageDisp is None:
+            # the levels are estimated from a few frames; normalization is not supported for stacks
+            self.imageDisp = self.stack.sample_frames()
+            self._imageLevels = self.quickMinMax(self.imageDisp)
+            self.levelMin = min([level[0] for level in self._imageLevels])
+            self.levelMax = max([level[1] for level in self._imageLevels])
+        return self.imageDisp
+
+    def quickMinMax(self, data):
+        return estimate_levels(data, channel_axis=self.axes['c'])
+
+    def _image_changed(self):
+        image = self.imageItem.image
+        if image is None:
+            return
+        histogram = self.ui.histogram
+        if histogram.levelMode == 'mono':
+            histogram.region.setRegion(self.imageItem.getLevels())
+        self._histogram_generation += 1
+        self._histogram_next = (self._histogram_generation, image, histogram.levelMode != 'mono')
+        if not self._histogram_busy:
+            self._submit_histogram()
+
+    def _submit_histogram(self):
+        generation, image, per_channel = self._histogram_next
+        self._histogram_next = None
+        self._histogram_busy = True
+        self._histogram_executor.submit(self._compute_histogram, generation, image, per_channel)
+
+    def _compute_histogram(self, generation, image, per_channel):
+        histograms = None
+        channel_axis = image.ndim - 1 if per_channel and image.ndim == 3 else None
+        try:
+            histograms = sampled_histogram(image, channel_axis=channel_axis)
+        except Exception:
+            logging.exception("cannot compute the histogram")
+        try:
+            self.sigHistogramReady.emit(generation, histograms)
+        except RuntimeError:
+            pass  # the widget has been deleted
+
+    def _histogram_ready(self, generation, histograms):
+        self._histogram_busy = False
+        if self._histogram_next is not None:
+            self._submit_histogram()  # a newer image came in the meantime
+        if histograms is None:
+            return
+        histogram = self.ui.histogram
+        if histogram.levelMode == 'mono':
+            for plot in histogram.plots[1:]:
+                plot.setVisible(False)
+            histogram.plots[0].setVisible(True)
+            histogram.plot.setData(*histograms[0])
+        else:
+            histogram.plots[0].setVisible(False)
+            for i in range(1, 5):
+                histogram.plots[i].setVisible(len(histograms) >= i)
+                if len(histograms) >= i:
+                    histogram.plots[i].setData(*histograms[i - 1])
+            histogram._showRegions()
+
+    def updateImage(self, autoHistogramRange=True):
+        if self.stack is None:
+            return super().updateImage(autoHistogramRange)
+        self.getProcessedImage()
+        if autoHistogramRange:
+            self.ui.histogram.setHistogramRange(self.levelMin, self.levelMax)
+        if self.axes['t'] != 0:
+            return  # see `setImage`
+        # transpose the frame into the order expected by ImageItem, like `ImageView.updateImage` does with the image
+        axorder = ['x', 'y', 'c'] if self.imageItem.axisOrder == 'col-major' else ['y', 'x', 'c']
+        frame = self.stack.get_frame(self.currentIndex)
+        frame = frame.transpose([self.axes[ax] - 1 for ax in axorder if self.axes[ax] is not None])
+        self.ui.roiPlot.show()
+        self.imageItem.updateImage(frame)
+
     def show_cursor_pos(self, show=True):
         if self._show_cursor_proxy:
             self._show_cursor_proxy.disconnect()
@@ -237,10 +348,16 @@ class PgImage(pg.ImageView):
 
 @register_widget("pyqtgraph scatter plot")
 class PgScatter(pg.ScatterPlotWidget):
+    info_points = 5  # the maximum number of points described by the info label
+
     def __init__(self, parent, name):
         super().__init__(parent)
         self._show_cursor_proxy = None
         self.state_to_load = {}
+        self._point_index = GridIndex()
+        self._indexed_xy = None
+        self._info_data = None
+        self._info_cache = {}  # index of a point in `data` -> its description
 
         self.info_label = pg.TextItem(border=QColor(128, 128, 128))
         self.info_label.setPos(60, 60)
@@ -262,7 +379,43 @@ class PgScatter(pg.ScatterPlotWidget):
             colormap_state=self.colorMap.saveState()
         )
 
+    def _points_at(self, view_point) -> np.ndarray:
+        # indices of the visible points under the cursor, the nearest first
+        xy = self._visibleXY
+        if self._indexed_xy is not xy:
+            self._indexed_xy = xy
+            self._point_index.set_points(np.column_stack(xy) if xy is not None else np.zeros((0, 2)))
+        if xy is None or self.scatterPlot is None:
+            return np.zeros(0, dtype=int)
+        radius = np.asarray(self.scatterPlot.opts['symbolSize'], dtype=float) / 2
+        if radius.ndim and len(radius) != len(self._point_index):
+            radius = radius.max()
+        return self._point_index.near(view_point.x(), view_point.y(), radius,
+                                      self.plot.plotItem.vb.viewPixelSize(), limit=self.info_points + 1)
+
+    def _point_info(self, visible_index) -> str:
+        index = int(self._visibleIndices[visible_index])
+        if self._info_data is not self.data:
+            self._info_data = self.data
+            self._info_cache.clear()
+        text = self._info_cache.get(index)
+        if text is None:
+            text = ''.join('{}: {}\n'.format(k, v)
+                           for k, v in sorted(zip(self.fields.keys(), self._visibleData[visible_index])))
+            self._info_cache[index] = text
+        return text
+
+    def _info_text(self, view_point) -> str:
+        points = self._points_at(view_point)
+        text = ''.join(self._point_info(i) + '\n' for i in points[:self.info_points])
+        if len(points) > self.info_points:
+            text += '...\n'
+        return text
+
     def show_info(self, show=True):
+        """
+        Show the fields of the points under the cursor (at most `info_points` of them, the nearest first).
+        """
         if self._show_cursor_proxy:
             self._show_cursor_proxy.disconnect()
             self._show_cursor_proxy = None
@@ -274,14 +427,7 @@ class PgScatter(pg.ScatterPlotWidget):
             def mouseMoved(evt):
                 view_point = plot_item.vb.mapSceneToView(evt[0])
                 if self.scatterPlot is not None:
-                    points = self.scatterPlot.scatter.pointsAt(view_point)
-                    text = ''
-                    for p in points:
-                        for k, v in sorted(zip(self.fields.keys(), p.data())):
-                            text += '{}: {}\n'.format(k, v)
-                        text += '\n'
-                    self.info_label.setText(text)
-                    # print(text)
+                    self.info_label.setText(self._info_text(view_point))
 
             self._show_cursor_proxy = pg.SignalProxy(plot_item.scene().sigMouseMoved, rateLimit=15, slot=mouseMoved)
 
@@ -0,0 +1,263 @@
+import logging
+import math
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt5 import QtCore
+from PyQt5.QtCore import QRectF, QTimer
+
+TileKey = Tuple[int, int, int, int]  # generation, level, tile row, tile column
+
+
+def estimate_image_levels(image: np.ndarray, samples=512):
+    """
+    Estimate the display levels from a strided sample of at most `samples` x `samples` pixels, so that only a small part
+    of a huge (e.g. memory-mapped) image is read.
+    """
+    step_y = max(1, image.shape[0] // samples)
+    step_x = max(1, image.shape[1] // samples)
+    sample = np.asarray(image[::step_y, ::step_x])
+    if sample.dtype == np.uint8:
+        return 0, 255
+    return float(np.nanmin(sample)), float(np.nanmax(sample))
+
+
+def block_mean(image: np.ndarray, factor=2) -> np.ndarray:
+    """
+    Means of the `factor` x `factor` blocks of a row-major image (the blocks at the bottom and right edges may be
+    smaller). Integer images are rounded back to their dtype.
+    """
+    # repeating the last row and column doesn't change the means of the smaller blocks
+    padding = [(0, -size % factor) for size in image.shape[:2]] + [(0, 0)] * (image.ndim - 2)
+    if any(after for _, after in padding):
+        image = np.pad(image, padding, mode='edge')
+    rows, cols = image.shape[0] // factor, image.shape[1] // factor
+    blocks = image.reshape((rows, factor, cols, factor) + image.shape[2:])
+    means = blocks.mean(axis=(1, 3), dtype=np.result_type(image.dtype, np.float32))
+    if np.issubdtype(image.dtype, np.integer):
+        return np.rint(means).astype(image.dtype)
+    return means.astype(image.dtype, copy=False)
+
+
+class PyramidImageItem(pg.GraphicsObject):
+    """
+    Displays a (possibly huge, e.g. memory-mapped) row-major image as a pyramid of tiles. Level 0 is the image and
+    each next level is made of the means of 2 x 2 blocks of the previous one. Only the tiles intersecting the view are
+    computed, at the level matching the screen resolution, in background threads. Computed tiles are kept in a LRU
+    cache. The coarsest level (the whole image in one tile) is always shown below the others, so there is something to
+    see while the finer tiles are computed.
+
+    The levels given to the constructor are used for all the images; otherwise they are estimated for each image given
+    to `setImage` without levels. The threads are stopped when the item is removed from its scene (or call `shutdown`).
+    """
+
+    sigTileReady = QtCore.pyqtSignal(object, object)  # key, tile
+    max_visible_tiles = 64
+
+    def __init__(self, image: np.ndarray = None, tile_size=512, levels=None, lut=None, max_workers=2,
+                 cache_size=256):
+        super().__init__()
+        self.tile_size = tile_size
+        self.cache_size = cache_size
+        self.max_workers = max_workers
+        self.image = None  # type: Optional[np.ndarray]
+        self.fixed_levels = levels
+        self.levels = levels
+        self.lut = lut
+        self._generation = 0
+        self._cache = OrderedDict()  # TileKey -> np.ndarray, filled by the worker threads
+        self._cache_lock = threading.Lock()
+        self._pending = set()  # TileKey
+        self._tile_items = {}  # TileKey -> pg.ImageItem
+        self._spare_items = []
+        self._executor = None  # type: Optional[ThreadPoolExecutor]
+        self._executor_finalizer = None
+        self._update_timer = QTimer()
+        self._update_timer.setSingleShot(True)
+        self._update_timer.timeout.connect(self.update_tiles)
+        self.sigTileReady.connect(self._tile_ready)
+        if image is not None:
+            self.setImage(image)
+
+    def setImage(self, image: np.ndarray, levels=None, lut=None):
+        self.prepareGeometryChange()
+        self.image = image
+        self._generation += 1
+        with self._cache_lock:
+            self._cache.clear()
+        self._pending.clear()
+        for key in list(self._tile_items):
+            self._release_item(key)
+        if levels is not None:
+            self.levels = levels
+        elif self.fixed_levels is not None:
+            self.levels = self.fixed_levels
+        else:
+            self.levels = estimate_image_levels(image)
+        if lut is not None:
+            self.lut = lut
+        self.informViewBoundsChanged()
+        self.update_tiles()
+
+    def shutdown(self):
+        """
+        Stop the threads computing the tiles. They are started again when tiles are needed.
+        """
+        if self._executor is not None:
+            self._executor_finalizer()
+            self._executor = None
+            self._pending.clear()
+
+    def itemChange(self, change, value):
+        if change == self.GraphicsItemChange.ItemSceneHasChanged and value is None:
+            self.shutdown()
+        return super().itemChange(change, value)
+
+    def _submit(self, key: TileKey):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            # the threads don't keep the item alive, so stop them when it is collected
+            self._executor_finalizer = weakref.finalize(self, self._executor.shutdown, wait=False,
+                                                        cancel_futures=True)
+        self._pending.add(key)
+        self._executor.submit(self._compute_tile, self.image, key)
+
+    def max_level(self):
+        return max(0, math.ceil(math.log2(max(self.image.shape[:2]) / self.tile_size)))
+
+    def boundingRect(self):
+        if self.image is None:
+            return QRectF()
+        return QRectF(0, 0, self.image.shape[1], self.image.shape[0])
+
+    def paint(self, painter, *args):
+        pass  # the tiles are painted by the child items
+
+    def viewRangeChanged(self):
+        # viewRect() may be stale here, so update a bit later (it also merges subsequent changes)
+        self._update_timer.start(0)
+
+    def viewTransformChanged(self):
+        self._update_timer.start(0)
+
+    def _view_rect(self):
+        # GraphicsItem.viewRect() may be stale, so map the range of the view box directly
+        view_box = self.getViewBox()
+        if view_box is None:
+            return self.boundingRect()
+        return self.mapRectFromItem(view_box.childGroup, view_box.viewRect())
+
+    def level_for_view(self):
+        view_box = self.getViewBox()
+        if view_box is None or view_box.width() <= 0 or view_box.height() <= 0:
+            return self.max_level()
+        rect = self._view_rect()
+        pixel_size = min(rect.width() / view_box.width(), rect.height() / view_box.height())
+        level = int(math.floor(math.log2(pixel_size))) if pixel_size > 0 else 0
+        level = min(max(level, 0), self.max_level())
+        while level < self.max_level() and len(self.visible_tiles(level)) > self.max_visible_tiles:
+            level += 1  # e.g. the item is transformed in a way we don't expect
+        return level
+
+    def _tiles_shape(self, image, level):
+        span = self.tile_size << level
+        return -(-image.shape[0] // span), -(-image.shape[1] // span)
+
+    def visible_tiles(self, level):
+        rect = self._view_rect().intersected(self.boundingRect())
+        span = self.tile_size << level
+        n_rows, n_cols = self._tiles_shape(self.image, level)
+        rows = range(max(0, int(rect.top()) // span), min(n_rows, int(rect.bottom()) // span + 1))
+        cols = range(max(0, int(rect.left()) // span), min(n_cols, int(rect.right()) // span + 1))
+        return [(self._generation, level, row, col) for row in rows for col in cols]
+
+    def pending_tiles(self):
+        return len(self._pending)
+
+    def update_tiles(self):
+        if self.image is None:
+            return
+        top = self.max_level()
+        level = self.level_for_view()
+        wanted = [(self._generation, top, 0, 0)] + (self.visible_tiles(level) if level != top else [])
+        for key in list(self._tile_items):
+            if key not in wanted:
+                self._release_item(key)
+        for key in wanted:
+            tile = self._cached_tile(key)
+            if tile is not None:
+                self._show_tile(key, tile)
+            elif key not in self._pending:
+                self._submit(key)
+
+    def _tile_region(self, key: TileKey):
+        _, level, row, col = key
+        span = self.tile_size << level
+        return slice(row * span, (row + 1) * span, 1 << level), slice(col * span, (col + 1) * span, 1 << level)
+
+    def _cached_tile(self, key: TileKey) -> Optional[np.ndarray]:
+        with self._cache_lock:
+            tile = self._cache.get(key)
+            if tile is not None:
+                self._cache.move_to_end(key)
+            return tile
+
+    def _tile(self, image, key: TileKey) -> np.ndarray:
+        """
+        Get the tile from the cache or compute it (from the tiles of the previous level). Called in the worker threads.
+        """
+        tile = self._cached_tile(key)
+        if tile is not None:
+            return tile
+        generation, level, row, col = key
+        if level == 0:
+            tile = np.array(image[self._tile_region(key)])
+        else:
+            n_rows, n_cols = self._tiles_shape(image, level - 1)
+            halves = [np.concatenate([self._tile(image, (generation, level - 1, r, c))
+                                      for c in (2 * col, 2 * col + 1) if c < n_cols], axis=1)
+                      for r in (2 * row, 2 * row + 1) if r < n_rows]
+            tile = block_mean(np.concatenate(halves, axis=0))
+        with self._cache_lock:
+            if generation == self._generation:
+                self._cache[key] = tile
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return tile
+
+    def _compute_tile(self, image, key: TileKey):
+        try:
+            self.sigTileReady.emit(key, self._tile(image, key))
+        except RuntimeError:
+            pass  # the item has been deleted
+        except Exception:
+            logging.exception("cannot compute tile {}".format(key))
+
+    def _tile_ready(self, key: TileKey, tile: np.ndarray):
+        if key[0] != self._generation:
+            return  # the image has been changed in the meantime
+        self._pending.discard(key)
+        if key[1] == self.max_level() or key in self.visible_tiles(self.level_for_view()):
+            self._show_tile(key, tile)
+
+    def _show_tile(self, key: TileKey, tile: np.ndarray):
+        if key in self._tile_items:
+            return
+        item = self._spare_items.pop() if self._spare_items else pg.ImageItem(axisOrder='row-major', parent=self)
+        item.setImage(tile, autoLevels=False, levels=self.levels, lut=self.lut)
+        rows, cols = self._tile_region(key)
+        step = rows.step
+        item.setRect(QRectF(cols.start, rows.start, tile.shape[1] * step, tile.shape[0] * step))
+        item.setZValue(-key[1])  # finer levels on top
+        item.show()
+        self._tile_items[key] = item
+
+    def _release_item(self, key: TileKey):
+        item = self._tile_items.pop(key)
+        item.hide()
+        self._spare_items.append(item)
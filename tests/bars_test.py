@@ -0,0 +1,34 @@
+import unittest
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+from sdupy.vis.bars import BarsItem
+
+app = QApplication.instance() or QApplication([])
+
+
+class BarsItemTest(unittest.TestCase):
+    def test_geometry_updated(self):
+        item = BarsItem()
+        item.set_bars(x=np.arange(3), height=[1, 2, 3], width=0.5)
+        self.assertEqual((-0.25, 0, 2.5, 3), item.boundingRect().getRect())
+        item.set_bars(x0=np.arange(2), x1=np.arange(2) + 1, height=[4, 5])
+        self.assertIsNone(item.opts['x'])  # not kept from the previous bars
+        self.assertIsNone(item.opts['width'])
+        self.assertEqual((0, 0, 2, 5), item.boundingRect().getRect())
+
+    def test_same_brushes_not_converted_again(self):
+        item = BarsItem()
+        brushes = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
+        item.set_bars(x=np.arange(3), height=[1, 2, 3], width=1, brushes=brushes)
+        converted = item._brushes
+        self.assertEqual(1, item.style_updates)
+        item.set_bars(x=np.arange(3), height=[3, 2, 1], width=1, brushes=list(brushes))
+        self.assertIs(converted, item._brushes)
+        self.assertEqual(1, item.style_updates)
+        item.set_bars(x=np.arange(3), height=[3, 2, 1], width=1, brushes=brushes[::-1])
+        self.assertIsNot(converted, item._brushes)
+        item.set_bars(x=np.arange(3), height=[3, 2, 1], width=1)
+        self.assertIsNone(item._brushes)  # back to the default single brush
+        self.assertEqual(3, item.style_updates)
@@ -0,0 +1,33 @@
+import unittest
+
+import numpy as np
+
+from sdupy.vis.decimation import MinMaxPyramid
+
+
+class MinMaxPyramidTest(unittest.TestCase):
+    def setUp(self):
+        self.y = np.random.default_rng(0).normal(size=10007)
+
+    def test_append_same_as_build(self):
+        built = MinMaxPyramid(self.y)
+        appended = MinMaxPyramid(self.y[:1000])
+        for start, stop in [(1000, 1001), (1001, 5000), (5000, len(self.y))]:
+            appended.append(self.y[start:stop])
+        self.assertEqual(built.levels(), appended.levels())
+        for level in range(1, built.levels()):
+            np.testing.assert_array_equal(built.points(pixels=10007 // 4 ** level)[1],
+                                          appended.points(pixels=10007 // 4 ** level)[1])
+
+    def test_keeps_peaks(self):
+        self.y[1234] = 100
+        self.y[5678] = -100
+        x, y = MinMaxPyramid(self.y, x=np.arange(len(self.y)) * 0.1).points(100, 900, pixels=50)
+        self.assertLessEqual(len(y), 2 * 50 + 4)
+        self.assertEqual(100, y.max())
+        self.assertEqual(-100, y.min())
+
+    def test_zoomed_in_shows_samples(self):
+        x, y = MinMaxPyramid(self.y).points(10, 20, pixels=1000)
+        np.testing.assert_array_equal(np.arange(9, 22), x)
+        np.testing.assert_array_equal(self.y[9:22], y)
@@ -0,0 +1,56 @@
+import os
+import tempfile
+
+import asynctest
+from PyQt5.QtGui import QImage
+from PyQt5.QtWidgets import QApplication, QLabel, QVBoxLayout, QWidget
+
+from sdupy.export import PngSequenceSink, export_frames, settle, sweep
+from sdupy.pyreactive import reactive, var
+from sdupy.render_scheduler import RenderScheduler
+from sdupy.widgets.helpers import trigger_if_visible
+
+app = QApplication.instance() or QApplication([])
+
+
+class ExportTest(asynctest.TestCase):
+    def setUp(self):
+        self.window = QWidget()
+        self.window.render_scheduler = RenderScheduler(self.window)
+        self.label = QLabel(self.window)
+        QVBoxLayout(self.window).addWidget(self.label)
+        self.window.resize(120, 80)
+        self.window.show()
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.window.close()
+        self.dir.cleanup()
+
+    async def test_settle_flushes_pending_renders(self):
+        rendered = []
+        self.window.render_scheduler.schedule('key', lambda: rendered.append(1))
+        self.assertEqual(1, self.window.render_scheduler.pending())
+        await settle(self.window)
+        self.assertEqual([1], rendered)
+        self.assertEqual(0, self.window.render_scheduler.pending())
+
+    async def test_png_sequence(self):
+        frame = var(0)
+        shown = []
+
+        @reactive
+        def show(value):
+            self.label.setText('frame {}'.format(value))
+            shown.append(value)
+
+        trigger = trigger_if_visible(show(frame), self.label)
+        stats = await export_frames(self.window, sweep(frame, range(3)), PngSequenceSink(self.dir.name, max_workers=2))
+        trigger._cleanup()
+
+        self.assertEqual(3, stats.frames)
+        self.assertEqual([0, 1, 2], shown)
+        files = sorted(os.listdir(self.dir.name))
+        self.assertEqual(['frame_000000.png', 'frame_000001.png', 'frame_000002.png'], files)
+        image = QImage(os.path.join(self.dir.name, files[0]))
+        self.assertEqual((self.window.width(), self.window.height()), (image.width(), image.height()))
@@ -0,0 +1,113 @@
+import importlib
+import unittest
+from unittest import mock
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt5.QtCore import QRectF
+from PyQt5.QtGui import QTransform
+from PyQt5.QtWidgets import QApplication
+
+from sdupy.pyreactive import unwrap
+
+graph = importlib.import_module('sdupy.vis.graph')  # `sdupy.vis.graph` is also a function
+
+app = QApplication.instance() or QApplication([])
+
+
+def make_nodes(count, fixed=()):
+    nodes = {i: dict(edges=[(i + 1) % count]) for i in range(count)}
+    for i in fixed:
+        nodes[i]['pos'] = (10. * i, 5.)
+    return nodes
+
+
+class DrawGraphTest(unittest.TestCase):
+    def setUp(self):
+        graph._layout_cache.clear()
+        self.widgets = []
+        self.results = []
+
+    def tearDown(self):
+        for res in self.results:
+            res._cleanup()
+        for widget in self.widgets:
+            widget.close()
+
+    def draw(self, nodes, widget=None):
+        if widget is None:
+            widget = pg.PlotWidget()
+            widget.item = widget.getPlotItem()
+            self.widgets.append(widget)
+        res = graph._draw_graph(nodes, [], widget)
+        self.results.append(res)
+        return unwrap(res), widget
+
+    def positions(self, item):
+        return item.pos.copy()
+
+    def test_cached_for_the_same_structure(self):
+        first, _ = self.draw(make_nodes(10))
+        with mock.patch.object(graph, '_spring_layout', wraps=graph._spring_layout) as layout:
+            second, _ = self.draw(make_nodes(10))  # another widget, so no previous positions
+            layout.assert_not_called()
+            self.draw(make_nodes(11))
+            layout.assert_called_once()
+        np.testing.assert_array_equal(self.positions(first), self.positions(second))
+
+    def test_warm_start_from_previous_positions(self):
+        first, widget = self.draw(make_nodes(20))
+        nodes = make_nodes(20)
+        nodes[20] = dict(edges=[0])
+        with mock.patch.object(graph, '_spring_layout', wraps=graph._spring_layout) as layout:
+            self.draw(nodes, widget)
+        (adj, initial, fixed, iterations), _ = layout.call_args
+        self.assertEqual(graph.WARM_START_ITERATIONS, iterations)
+        np.testing.assert_array_equal(self.positions(first), initial[:20])
+
+    def test_fixed_nodes_stay(self):
+        item, _ = self.draw(make_nodes(10, fixed=[0, 3]))
+        positions = self.positions(item)
+        np.testing.assert_array_equal([[0, 5], [30, 5]], positions[[0, 3]])
+
+    def test_all_fixed_without_layout(self):
+        with mock.patch.object(graph, '_spring_layout') as layout:
+            item, _ = self.draw(make_nodes(3, fixed=[0, 1, 2]))
+        layout.assert_not_called()
+        np.testing.assert_array_equal([[0, 5], [10, 5], [20, 5]], self.positions(item))
+
+
+class InitialPositionsTest(unittest.TestCase):
+    def test_previous_and_neighbours(self):
+        adj = np.array([[2, 0], [3, 1]])
+        given = np.array([[0, 0], [0, 0], [0, 0], [7, 7]], dtype=float)
+        fixed = np.array([False, False, False, True])
+        previous = {'a': np.array([1., 1.]), 'b': np.array([2., 2.])}
+        positions, reused = graph._initial_positions(['a', 'b', 'c', 'd'], adj, given, fixed, previous)
+        self.assertEqual(2, reused)
+        np.testing.assert_array_equal([[1, 1], [2, 2], [7, 7]], positions[[0, 1, 3]])
+        np.testing.assert_allclose([1, 1], positions[2], atol=0.5)  # next to its only neighbour
+
+
+class LabelsItemTest(unittest.TestCase):
+    def setUp(self):
+        self.item = graph._LabelsItem(np.array([[0., 0.], [10., 5.], [20., 10.]]), ['a', 'b', 'c'])
+        self.painter = mock.Mock()
+        self.painter.transform.return_value = QTransform()
+
+    def paint(self, view):
+        with mock.patch.object(self.item, 'viewRect', return_value=view):
+            self.item.paint(self.painter)
+        return [args[2] for args, _ in self.painter.drawText.call_args_list]
+
+    def test_bounding_rect(self):
+        self.assertEqual(QRectF(0, 0, 20, 10), self.item.boundingRect())
+        self.item.set_positions(np.array([[1., 1.], [2., 3.], [3., 2.]]))
+        self.assertEqual(QRectF(1, 1, 2, 2), self.item.boundingRect())
+
+    def test_only_visible_labels_drawn(self):
+        self.assertEqual(['a', 'b'], self.paint(QRectF(-1, -1, 12, 7)))
+
+    def test_too_many_labels_not_drawn(self):
+        with mock.patch.object(graph, 'MAX_VISIBLE_LABELS', 2):
+            self.assertEqual([], self.paint(QRectF(-1, -1, 30, 30)))
@@ -0,0 +1,51 @@
+import unittest
+
+import matplotlib
+import networkx as nx
+from matplotlib.backend_bases import MouseEvent
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from sdupy.pyreactive import var
+from sdupy.pyreactive.common import unwrap
+from sdupy.widgets.graph import HOVER_COLOR, display_graph
+
+
+class DisplayGraphTest(unittest.TestCase):
+    def setUp(self):
+        self.figure = Figure()
+        FigureCanvasAgg(self.figure)
+        self.axes = self.figure.add_subplot()
+        self.axes.set_xlim(0, 10)
+        self.axes.set_ylim(0, 10)
+        graph = nx.Graph()
+        graph.add_nodes_from(['a', 'b'])
+        self.res = display_graph(var(graph), self.axes, dict(a=(2, 2), b=(8, 8)))
+        self.texts, _ = unwrap(self.res)
+        self.figure.canvas.draw()
+
+    def tearDown(self):
+        self.res._cleanup()
+
+    def hover(self, x, y):
+        x, y = self.axes.transData.transform((x, y))
+        self.figure.canvas.callbacks.process('motion_notify_event',
+                                             MouseEvent('motion_notify_event', self.figure.canvas, x, y))
+
+    def hovered(self, text):
+        return matplotlib.colors.same_color(HOVER_COLOR, text.get_bbox_patch().get_facecolor())
+
+    def test_hover(self):
+        self.hover(2, 2)
+        self.assertTrue(self.hovered(self.texts[0]))
+        self.assertFalse(self.hovered(self.texts[1]))
+
+    def test_hover_resized_box(self):
+        text = self.texts[0]
+        self.hover(0, 0)  # measures the boxes
+        box = text.get_bbox_patch().get_window_extent()
+        text.set_fontsize(40)
+        self.figure.canvas.draw()
+        x, y = self.axes.transData.inverted().transform((box.x1 + 20, box.y1 + 20))
+        self.hover(x, y)
+        self.assertTrue(self.hovered(text))
@@ -0,0 +1,61 @@
+import unittest
+
+import numpy as np
+
+from PyQt5.QtWidgets import QApplication
+
+from sdupy.vis.histogram import HistogramItem, IncrementalHistogram, histogram_of_sorted
+
+app = QApplication.instance() or QApplication([])
+
+
+class HistogramTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.arrays = [rng.normal(size=10000), rng.normal(size=(100, 100)).astype(np.float32),
+                       rng.integers(0, 50, size=10000), np.full(10, 3.0)]
+
+    def test_same_as_numpy(self):
+        for a in self.arrays:
+            for bins, range in [(10, None), (37, None), (100, (-1, 1)), (np.linspace(-2, 40, 9), None), ('auto', None)]:
+                for density in [None, True]:
+                    expected = np.histogram(a, bins, range, density)
+                    result = histogram_of_sorted(np.sort(a, axis=None), bins, range, density)
+                    np.testing.assert_array_equal(expected[1], result[1])
+                    np.testing.assert_allclose(expected[0], result[0])
+
+    def test_nans_ignored_with_range(self):
+        a = np.array([np.nan, 1, 2, 3, np.nan])
+        np.testing.assert_array_equal([1, 2], histogram_of_sorted(np.sort(a), 2, (0, 3))[0])
+        np.testing.assert_array_equal([1, 2], histogram_of_sorted(np.sort(a), 2)[0])
+
+    def test_incremental_same_as_numpy(self):
+        a = self.arrays[0]
+        histogram = IncrementalHistogram(25, (-2, 2))
+        for start in range(0, len(a), 999):
+            histogram.append(a[start:start + 999])
+        expected = np.histogram(a, 25, (-2, 2))
+        np.testing.assert_array_equal(expected[0], histogram.counts)
+        np.testing.assert_array_equal(expected[1], histogram.edges)
+        self.assertEqual(len(a), histogram.size)
+
+
+class HistogramItemTest(unittest.TestCase):
+    def test_rebinned_from_sorted(self):
+        a = np.random.default_rng(0).normal(size=1000)
+        item = HistogramItem()
+        item.set_histogram(a, 5)
+        self.assertIsNone(item.sorted)
+        item.set_histogram(a, 7, data_changed=False)
+        np.testing.assert_array_equal(np.histogram(a, 7)[0], item.opts['height'])
+        self.assertIsNotNone(item.sorted)
+
+    def test_changed_in_place(self):
+        a = np.random.default_rng(0).uniform(0, 5, size=1000)
+        item = HistogramItem()
+        item.set_histogram(a, 5, (0, 5))
+        item.set_histogram(a, 10, (0, 5), data_changed=False)
+        a[:] = 2.5
+        item.set_histogram(a, 5, (0, 5))
+        np.testing.assert_array_equal([0, 0, 1000, 0, 0], item.opts['height'])
+        self.assertIsNone(item.sorted)
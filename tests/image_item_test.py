@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+from pyqtgraph import ImageItem
+from PyQt5.QtWidgets import QApplication
+
+from sdupy.vis._helpers import image_to_mpl, image_to_pg, update_pg_image_item
+
+app = QApplication.instance() or QApplication([])
+
+
+class ImageConversionTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.images = [rng.integers(0, 256, size=(6, 8, 3), dtype=np.uint8),
+                       rng.integers(0, 256, size=(6, 8, 1), dtype=np.uint8),
+                       rng.integers(0, 256, size=(6, 8), dtype=np.uint8)]
+
+    @staticmethod
+    def copied_mpl(image):
+        # the conversion made before the views, with fancy indexing
+        if image.ndim == 3 and image.shape[2] == 3:
+            return image[..., [2, 1, 0]]
+        if image.ndim == 3:
+            return image[:, :, 0]
+        return image
+
+    def copied_pg(self, image, do_flip):
+        image = self.copied_mpl(image)
+        if do_flip:
+            image = image[::-1].copy()
+        return np.ascontiguousarray(np.swapaxes(image, 0, 1))
+
+    def test_mpl_views(self):
+        for image in self.images:
+            converted = image_to_mpl(image)
+            np.testing.assert_array_equal(self.copied_mpl(image), converted)
+            self.assertTrue(np.shares_memory(image, converted))
+
+    def test_pg_views(self):
+        for image in self.images:
+            for do_flip in [True, False]:
+                converted = image_to_pg(image, do_flip=do_flip)
+                np.testing.assert_array_equal(self.copied_pg(image, do_flip), converted)
+                self.assertTrue(np.shares_memory(image, converted))
+
+    def test_rgb_unchanged(self):
+        image = self.images[0]
+        self.assertIs(image, image_to_mpl(image, is_bgr=False))
+        np.testing.assert_array_equal(image[::-1].swapaxes(0, 1), image_to_pg(image, is_bgr=False))
+
+
+class UpdateImageItemTest(unittest.TestCase):
+    def setUp(self):
+        self.item = ImageItem(axisOrder='row-major')
+        self.image = np.zeros((10, 20), dtype=np.uint8)
+
+    def test_extent_removed(self):
+        update_pg_image_item(self.item, self.image, extent=(0, 1, 0, 1))
+        self.assertEqual((0, 0, 1, 1), self.item.mapRectToParent(self.item.boundingRect()).getRect())
+        update_pg_image_item(self.item, self.image)
+        self.assertEqual((0, 0, 20, 10), self.item.mapRectToParent(self.item.boundingRect()).getRect())
+
+    def test_lut_removed(self):
+        lut = np.zeros((256, 3), dtype=np.uint8)
+        update_pg_image_item(self.item, self.image, lut=lut)
+        self.assertIs(lut, self.item.lut)
+        update_pg_image_item(self.item, self.image)
+        self.assertIsNone(self.item.lut)
@@ -0,0 +1,51 @@
+import unittest
+
+import numpy as np
+
+from sdupy.widgets.image_levels import estimate_levels, sampled_histogram, sample_image
+
+
+class ImageLevelsTest(unittest.TestCase):
+    def setUp(self):
+        self.image = np.random.default_rng(0).integers(100, 1000, (1000, 1500), dtype=np.uint16)
+        self.image[::97, ::89] = 65535  # hot pixels
+
+    def test_sample_is_a_view(self):
+        sample = sample_image(self.image, max_samples=10000)
+        self.assertLessEqual(sample.size, 10000)
+        self.assertIs(self.image, sample.base)
+
+    def test_outliers_clipped(self):
+        (low, high), = estimate_levels(self.image)
+        self.assertLess(abs(low - 100), 5)
+        self.assertLess(abs(high - 1000), 5)
+
+    def test_channels(self):
+        rgb = np.stack([self.image, self.image // 2, self.image // 4], axis=2)
+        levels = estimate_levels(rgb, percentiles=(0, 100), channel_axis=2)
+        self.assertEqual([(100, 65535), (50, 32767), (25, 16383)], levels)
+        self.assertEqual(3, len(sampled_histogram(rgb, channel_axis=2)))
+
+    def test_cached_per_image_and_key(self):
+        self.assertIs(estimate_levels(self.image, key=1), estimate_levels(self.image, key=1))
+        self.assertIs(estimate_levels(self.image, key=1), estimate_levels(self.image[:], key=1))  # the same memory
+        self.assertIsNot(estimate_levels(self.image, key=1), estimate_levels(self.image.copy(), key=1))
+        self.assertIsNot(estimate_levels(self.image), estimate_levels(self.image))  # not cached without a key
+
+    def test_modified_in_place(self):
+        estimate_levels(self.image, key=1)
+        self.image[:] = 39
+        self.assertEqual([(39, 39)], estimate_levels(self.image, key=2))
+
+    def test_signed(self):
+        image = np.array([-30000, 0, 30000] * 100, np.int16).reshape(30, 10)
+        self.assertEqual([(-30000, 30000)], estimate_levels(image, percentiles=(0, 100)))
+        image = np.array([-100, 0, 100] * 100, np.int8).reshape(30, 10)
+        self.assertEqual([(-100, 100)], estimate_levels(image, percentiles=(0, 100)))
+        (edges, counts), = sampled_histogram(image)
+        self.assertEqual(image.size, counts.sum())
+
+    def test_histogram_counts_all_samples(self):
+        (edges, counts), = sampled_histogram(self.image, max_samples=10000)
+        self.assertEqual(sample_image(self.image, max_samples=10000).size, counts.sum())
+        self.assertLessEqual(len(edges), 501)
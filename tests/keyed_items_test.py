@@ -0,0 +1,84 @@
+import unittest
+
+import asynctest
+
+from sdupy.pyreactive import unwrap, var, wait_for_var
+from sdupy.vis._helpers import KeyedItems, update_keyed_items_pg_unroll
+
+
+class RecordingView:
+    def __init__(self):
+        self.items = []
+        self.auto_range = [True, False]
+
+    def addItem(self, item):
+        self.items.append(item)
+
+    def removeItem(self, item):
+        self.items.remove(item)
+
+    def autoRangeEnabled(self):
+        return list(self.auto_range)
+
+    def disableAutoRange(self):
+        self.auto_range = [False, False]
+
+    def enableAutoRange(self, x, y):
+        self.auto_range = [x, y]
+
+
+class Item:
+    def setZValue(self, z):
+        self.z = z
+
+
+class KeyedItemsTest(unittest.TestCase):
+    def setUp(self):
+        self.view = RecordingView()
+        self.holder = KeyedItems(self.view, zvalue=3)
+        self.items = {i: Item() for i in range(1000)}
+        self.holder.update(self.items)
+
+    def test_only_changed_items_touch_the_scene(self):
+        items = dict(self.items)
+        del items[0]
+        items[1] = Item()
+        items['new'] = Item()
+        self.holder.update(items)
+        self.assertEqual(dict(added=2, removed=2, kept=998), self.holder.last_ops)
+        self.assertCountEqual(items.values(), self.view.items)
+        self.assertEqual(3, items['new'].z)
+
+    def test_unchanged_keeps_auto_range(self):
+        self.holder.update(dict(self.items))
+        self.assertEqual(dict(added=0, removed=0, kept=1000), self.holder.last_ops)
+        self.assertEqual([True, False], self.view.auto_range)
+
+    def test_zvalue_changed(self):
+        self.holder.zvalue = 5
+        self.holder.update(dict(self.items))
+        self.assertEqual(5, self.items[0].z)
+
+    def test_clear(self):
+        self.holder.clear()
+        self.assertEqual([], self.view.items)
+        self.assertEqual(1000, self.holder.total_ops['removed'])
+
+
+class WrappedKeyedItemsTest(asynctest.TestCase):
+    async def test_wrapped_items(self):
+        view = RecordingView()
+        holder = KeyedItems(view, zvalue=3)
+        first, second = Item(), Item()
+        item = var(first)
+        res = update_keyed_items_pg_unroll(holder, {'a': item, 'b': Item()})
+        self.assertIs(holder, unwrap(res))
+        self.assertIn(first, view.items)
+        self.assertEqual(3, first.z)
+
+        item.set(second)
+        await wait_for_var(res)
+        unwrap(res)
+        self.assertIn(second, view.items)
+        self.assertNotIn(first, view.items)
+        self.assertEqual(dict(added=1, removed=1, kept=1), holder.last_ops)
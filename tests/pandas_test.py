@@ -0,0 +1,77 @@
+import asynctest
+import pandas as pd
+
+from sdupy.pyreactive import reactive, unwrap, wait_for_var
+from sdupy.pyreactive.wrappers.pandas import DataFrame
+
+
+class ColumnNotifications(asynctest.TestCase):
+    def setUp(self):
+        self.calls = []
+        self.df = DataFrame(pd.DataFrame(dict(a=[1., 2.], b=[3., 4.])))
+
+    def column_sum(self, name):
+        @reactive
+        def column_sum(column):
+            self.calls.append(name)
+            return column.sum()
+
+        return column_sum(self.df[name])
+
+    async def test_only_changed_column_recomputed(self):
+        sum_a = self.column_sum('a')
+        sum_b = self.column_sum('b')
+        self.assertEqual((3., 7.), (unwrap(sum_a), unwrap(sum_b)))
+        self.df['b'] = [5., 6.]
+        await wait_for_var()
+        self.assertEqual(3., unwrap(sum_a))
+        self.assertEqual(11., unwrap(sum_b))
+        self.assertEqual(['a', 'b', 'b'], self.calls)
+
+    async def test_set_notifies_all(self):
+        sum_a = self.column_sum('a')
+        length = reactive(len)(self.df)
+        self.df.set(pd.DataFrame(dict(a=[1., 1., 1.])))
+        await wait_for_var()
+        self.assertEqual(3., unwrap(sum_a))
+        self.assertEqual(3, unwrap(length))
+
+    async def test_append(self):
+        rows = self.df.appended_rows()
+        self.df.append(dict(a=[5.], b=[6.]))
+        await wait_for_var()
+        self.assertEqual(range(2, 3), unwrap(rows))
+        self.df['a'] = 0.
+        await wait_for_var()
+        self.assertEqual(range(3, 3), unwrap(rows))
+
+    async def test_append_continues_index(self):
+        self.df.append(dict(a=[5.], b=[6.]))
+        self.assertEqual([0, 1, 2], list(unwrap(self.df).index))
+        self.assertEqual(5., unwrap(self.df).loc[2, 'a'])
+
+    async def test_append_keeps_labels(self):
+        df = DataFrame(pd.DataFrame(dict(a=[1., 2.]), index=['x', 'y']))
+        df.append(pd.DataFrame(dict(a=[3.]), index=['z']))
+        self.assertEqual(['x', 'y', 'z'], list(unwrap(df).index))
+
+    async def test_new_column(self):
+        columns = self.df.columns()
+        self.df['c'] = 1
+        await wait_for_var()
+        self.assertEqual(['a', 'b', 'c'], list(unwrap(columns)))
+
+    async def test_append_new_columns(self):
+        columns = self.df.columns()
+        self.assertEqual(['a', 'b'], list(unwrap(columns)))
+        self.df.append(dict(a=[5.], c=[6.]))
+        await wait_for_var()
+        self.assertEqual(['a', 'b', 'c'], list(unwrap(columns)))
+
+    async def test_append_to_empty(self):
+        df = DataFrame()
+        columns = df.columns()
+        self.assertEqual([], list(unwrap(columns)))
+        df.append(dict(a=[1.], b=[2.]))
+        await wait_for_var()
+        self.assertEqual(['a', 'b'], list(unwrap(columns)))
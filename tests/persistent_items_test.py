@@ -0,0 +1,38 @@
+import unittest
+
+import numpy as np
+from PyQt5 import sip
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from sdupy.vis.globals import obtain_persistent_item, persistent_items
+
+app = QApplication.instance() or QApplication([])
+
+
+class PersistentItemsTest(unittest.TestCase):
+    def setUp(self):
+        self.widget = QWidget()
+
+    def test_same_key_same_item(self):
+        item = obtain_persistent_item(self.widget, ('f', 'label'), object)
+        self.assertIs(item, obtain_persistent_item(self.widget, ('f', 'label'), object))
+        self.assertIsNot(item, obtain_persistent_item(self.widget, ('g', 'label'), object))
+        self.assertIsNot(item, obtain_persistent_item(QWidget(), ('f', 'label'), object))
+
+    def test_made_again_when_options_change(self):
+        discarded = []
+        options = dict(pen='r', data=np.arange(3))
+        item = obtain_persistent_item(self.widget, 'key', object, options, discarded.append)
+        self.assertIs(item, obtain_persistent_item(self.widget, 'key', object, dict(pen='r', data=np.arange(3)),
+                                                   discarded.append))
+        new_item = obtain_persistent_item(self.widget, 'key', object, dict(pen='g', data=np.arange(3)),
+                                          discarded.append)
+        self.assertIsNot(item, new_item)
+        self.assertEqual([item], discarded)
+
+    def test_dropped_with_widget(self):
+        obtain_persistent_item(self.widget, 'key', object)
+        self.assertIn(id(self.widget), persistent_items)
+        widget_id = id(self.widget)
+        sip.delete(self.widget)
+        self.assertNotIn(widget_id, persistent_items)
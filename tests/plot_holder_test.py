@@ -0,0 +1,85 @@
+import unittest
+
+import asynctest
+import matplotlib.pyplot as plt
+from PyQt5.QtWidgets import QApplication
+
+from sdupy.pyreactive import reactive, var, wait_for_var
+from sdupy.pyreactive.common import unwrap
+from sdupy.pyreactive.wrappers.axes import PlotHolder, ReactiveAxes, default_remove_plot, update_plot, \
+    update_scatter
+from sdupy.widgets.figure import Figure
+
+app = QApplication.instance() or QApplication([])
+
+
+class PlotHolderTest(unittest.TestCase):
+    def setUp(self):
+        self.figure = Figure(None, 'figure')
+        self.holder = PlotHolder(plt.Axes.plot, default_remove_plot, update_plot, ())
+
+    def tearDown(self):
+        self.holder.remove(draw=False)
+        self.figure.close()
+
+    def test_updated_in_place(self):
+        line, = self.holder.plot(self.figure.axes, ([1, 2, 3],), {})
+        self.assertIs(line, self.holder.plot(self.figure.axes, ([3, 2, 1],), {})[0])
+        self.assertEqual([3, 2, 1], list(line.get_ydata()))
+
+    def test_blit_enabled_after_plot(self):
+        line, = self.holder.plot(self.figure.axes, ([1, 2, 3],), {})
+        self.figure.set_blit(True)
+        self.assertFalse(line.get_animated())
+        self.figure.canvas.draw()  # caches the background, with the line
+        self.assertIsNotNone(self.figure._background)
+        self.holder.plot(self.figure.axes, ([3, 2, 1],), {})
+        self.assertTrue(line.get_animated())
+        self.assertIsNone(self.figure._background)  # redrawn without the line, which is drawn over it from now on
+
+    def test_scatter_colors_dropped(self):
+        holder = PlotHolder(plt.Axes.scatter, default_remove_plot, update_scatter, ['s', 'c'])
+        points = holder.plot(self.figure.axes, ([1, 2], [3, 4]), dict(c=[1, 2]))
+        self.assertIs(points, holder.plot(self.figure.axes, ([1, 2], [4, 3]), dict(c=[2, 1])))
+        default_points = holder.plot(self.figure.axes, ([1, 2], [4, 3]), {})
+        self.assertIsNot(points, default_points)  # made again with the default colors
+        self.assertNotIn(points, self.figure.axes.collections)
+        self.assertIsNone(default_points.get_array())
+        holder.remove(draw=False)
+
+
+class ReactivePlotTest(asynctest.TestCase):
+    def setUp(self):
+        self.figure = Figure(None, 'figure')
+        self.axes = ReactiveAxes(self.figure.axes)
+
+    def tearDown(self):
+        self.figure.close()
+
+    async def test_updated_in_place_and_removed_when_released(self):
+        data = var([1, 2, 3])
+        res = self.axes.plot(data)
+        line, = unwrap(res)
+        data.set([3, 2, 1])
+        await wait_for_var(res)
+        self.assertIs(line, unwrap(res)[0])
+        self.assertIn(line, self.figure.axes.lines)
+        res._cleanup()
+        self.assertNotIn(line, self.figure.axes.lines)
+
+    async def test_removed_when_input_fails(self):
+        data = var([1, 2, 3])
+        res = self.axes.plot(checked(data))
+        line, = unwrap(res)
+        data.set(None)
+        await wait_for_var(res)
+        with self.assertRaises(Exception):
+            unwrap(res)
+        self.assertEqual([], list(self.figure.axes.lines))
+
+
+@reactive
+def checked(data):
+    if data is None:
+        raise ValueError("no data")
+    return data
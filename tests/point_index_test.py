@@ -0,0 +1,43 @@
+import unittest
+
+import numpy as np
+
+from sdupy.widgets.point_index import GridIndex
+
+
+class GridIndexTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.points = rng.normal(size=(5000, 2)) * [100, 1]
+        self.points[10] = np.nan
+        self.queries = rng.normal(size=(50, 2)) * [100, 1]
+        self.index = GridIndex(self.points)
+
+    def test_in_box_same_as_scan(self):
+        x, y = self.points[:, 0], self.points[:, 1]
+        for qx, qy in self.queries:
+            expected = np.flatnonzero((x >= qx - 20) & (x <= qx + 20) & (y >= qy - 0.5) & (y <= qy + 0.5))
+            np.testing.assert_array_equal(expected, np.sort(self.index.in_box(qx - 20, qx + 20, qy - 0.5, qy + 0.5)))
+
+    def test_near_in_pixels(self):
+        pixel_size = (0.5, 0.01)
+        for qx, qy in self.queries:
+            distance = np.hypot((self.points[:, 0] - qx) / pixel_size[0], (self.points[:, 1] - qy) / pixel_size[1])
+            expected = np.flatnonzero(distance <= 30)
+            found = self.index.near(qx, qy, 30, pixel_size)
+            np.testing.assert_array_equal(expected, np.sort(found))
+            self.assertTrue(np.all(np.diff(distance[found]) >= 0))  # the nearest first
+
+    def test_near_with_radius_per_point_and_limit(self):
+        radius = np.full(len(self.points), 0.0)
+        radius[::2] = 1e6
+        found = self.index.near(0, 0, radius, limit=3)
+        self.assertEqual(3, len(found))
+        self.assertTrue(np.all(found % 2 == 0))
+
+    def test_set_points(self):
+        self.index.near(0, 0, 1)
+        self.index.set_points([[5, 5], [100, 100]])
+        np.testing.assert_array_equal([1], self.index.near(101, 101, 2))
+        self.index.set_points(np.zeros((0, 2)))
+        self.assertEqual(0, len(self.index.near(0, 0, 10)))
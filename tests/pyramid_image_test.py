@@ -0,0 +1,59 @@
+import unittest
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication, QGraphicsScene
+
+from sdupy.widgets.pyramid_image import PyramidImageItem, block_mean
+
+app = QApplication.instance() or QApplication([])
+
+
+class BlockMeanTest(unittest.TestCase):
+    def test_odd_shape(self):
+        image = np.arange(15, dtype=np.float32).reshape(3, 5)
+        np.testing.assert_array_equal([[3, 5, 6.5], [10.5, 12.5, 14]], block_mean(image))
+
+    def test_integer_rounded(self):
+        image = np.array([[0, 1], [1, 1]], dtype=np.uint8)
+        self.assertEqual(np.uint8, block_mean(image).dtype)
+        np.testing.assert_array_equal([[1]], block_mean(image))
+
+    def test_channels(self):
+        image = np.ones((4, 4, 3), dtype=np.uint8)
+        self.assertEqual((2, 2, 3), block_mean(image).shape)
+
+
+class PyramidImageItemTest(unittest.TestCase):
+    def setUp(self):
+        self.item = PyramidImageItem(tile_size=4)
+
+    def tearDown(self):
+        self.item.shutdown()
+
+    def test_levels_from_block_means(self):
+        image = np.random.default_rng(0).random((10, 14))
+        self.item.setImage(image)
+        top = self.item._tile(image, (self.item._generation, self.item.max_level(), 0, 0))
+        np.testing.assert_allclose(block_mean(block_mean(image)), top)
+
+    def test_levels_estimated_for_each_image(self):
+        self.item.setImage(np.full((8, 8), 5.) + np.eye(8))
+        self.assertEqual((5, 6), self.item.levels)
+        self.item.setImage(np.full((8, 8), 10.) + np.eye(8))
+        self.assertEqual((10, 11), self.item.levels)
+
+    def test_fixed_levels(self):
+        item = PyramidImageItem(levels=(0, 1))
+        item.setImage(np.full((8, 8), 5.))
+        self.assertEqual((0, 1), item.levels)
+        item.setImage(np.full((8, 8), 5.), levels=(2, 3))
+        self.assertEqual((2, 3), item.levels)
+        item.shutdown()
+
+    def test_threads_stopped_when_removed(self):
+        scene = QGraphicsScene()
+        scene.addItem(self.item)
+        self.item.setImage(np.zeros((16, 16)))
+        self.assertIsNotNone(self.item._executor)
+        scene.removeItem(self.item)
+        self.assertIsNone(self.item._executor)
@@ -2,14 +2,15 @@ import asyncio
 import gc
 
 import asynctest
+import numpy as np
 
-from sdupy.pyreactive import wait_for_var
-from sdupy.pyreactive.common import Wrapped, unwrap, unwrap_exception, unwrapped
+from sdupy.pyreactive import copy_on_write, settings, updating, wait_for_var
+from sdupy.pyreactive.common import Wrapped, unwrap, unwrap_exception, unwrapped, version
 from sdupy.pyreactive.decorators import reactive, reactive_finalizable
 # from sdupy.reactive.decorators import reactive, reactive_finalizable, var_from_gen
 # from sdupy.reactive.var import Observable, var, Wrapper
 from sdupy.pyreactive.notifier import Notifier
-from sdupy.pyreactive.var import var
+from sdupy.pyreactive.var import const, var, volatile
 
 
 class NotifierTests(asynctest.TestCase):
@@ -411,6 +412,33 @@ class DepOnlyArgs(asynctest.TestCase):
         self.assertEqual(3, called_times2)
 
 
+dep_only_calls = []
+
+
+@reactive
+def plus_one(a):
+    return a + 1
+
+
+@reactive(dep_only_args=['d'])
+def record_dep_only_call(a):
+    dep_only_calls.append(a)
+    return a
+
+
+class DepOnlyResult(asynctest.TestCase):
+    async def test_every_change_passed(self):
+        # the result of `plus_one` is never pulled, it's only observed
+        dep_only_calls.clear()
+        a = var(0)
+        res = volatile(record_dep_only_call(var(0), d=plus_one(a)))
+        await wait_for_var(res)
+        for i in range(4):
+            a @= i + 1
+            await wait_for_var(res)
+        self.assertEqual(5, len(dep_only_calls))
+
+
 @reactive
 def func_with_default(a, param_with_default=some_observable):
     global called_times2
@@ -483,6 +511,205 @@ class PassArgs(asynctest.TestCase):
         self.assertEqual(2, called_times2)
 
 
+class Versions(asynctest.TestCase):
+    async def test_var(self):
+        a = var(2)
+        v = version(a)
+        a @= 3
+        self.assertGreater(version(a), v)
+
+    async def test_raw_and_const(self):
+        self.assertEqual(0, version(5))
+        self.assertEqual(0, version(const(5)))
+
+    async def test_reactive_result(self):
+        a = var(2)
+        res = my_sum(a, 5)
+        await wait_for_var(res)
+        v = version(res)
+        unwrap(res)
+        await wait_for_var(res)
+        self.assertEqual(v, version(res))
+
+        a @= 6
+        await wait_for_var(res)
+        self.assertGreater(version(res), v)
+        self.assertEqual(11, unwrap(res))
+
+
+changes_seen = []
+
+
+@reactive(changes=True)
+def sum_with_changes(a, b, changes=None):
+    changes_seen.append(changes)
+    return a + b
+
+
+class ChangesArg(asynctest.TestCase):
+    def setUp(self):
+        changes_seen.clear()
+
+    async def test_raw(self):
+        self.assertEqual(7, sum_with_changes(2, 5))
+        self.assertEqual([None], changes_seen)
+
+    async def test_vars(self):
+        a = var(2)
+        b = var(5)
+        res = sum_with_changes(a, b)
+        self.assertEqual(7, unwrap(res))
+        self.assertEqual({'a', 'b'}, changes_seen[-1].changed)
+        self.assertIsNone(changes_seen[-1].previous)
+
+        b @= 3
+        await wait_for_var(res)
+        self.assertEqual(5, unwrap(res))
+        self.assertEqual({'b'}, changes_seen[-1].changed)
+        self.assertEqual(7, changes_seen[-1].previous)
+
+
+    async def test_var_positional(self):
+        a = var(2)
+        res = sum_of_all(None, a, 3, 4, 5)
+        self.assertEqual(14, unwrap(res))
+        self.assertEqual({'a', '2', '3', '4', 'append_only'}, changes_seen[-1].changed)
+
+        a @= 3
+        await wait_for_var(res)
+        self.assertEqual(15, unwrap(res))
+        self.assertEqual({'a'}, changes_seen[-1].changed)
+
+    async def test_dep_only_args(self):
+        a = var(2)
+        trigger = var(0)
+        res = sum_with_trigger(a, 5, trigger=trigger)
+        self.assertEqual(7, unwrap(res))
+        self.assertEqual({'a', 'b', 'trigger'}, changes_seen[-1].changed)
+
+        trigger @= 1
+        await wait_for_var(res)
+        self.assertEqual(7, unwrap(res))
+        self.assertEqual({'trigger'}, changes_seen[-1].changed)
+
+    async def test_other_deps(self):
+        a = var(2)
+        res = sum_with_other_deps(a, 5)
+        self.assertEqual(7, unwrap(res))
+        self.assertEqual({'a', 'b', 'other_deps'}, changes_seen[-1].changed)
+
+        other_dep.__notifier__.notify_observers()
+        await wait_for_var(res)
+        self.assertEqual(7, unwrap(res))
+        self.assertEqual({'other_deps'}, changes_seen[-1].changed)
+
+    async def test_finalizable(self):
+        a = var(2)
+        res = sum_in_list(a, 5)
+        first = unwrap(res)
+        self.assertEqual([7], first)
+
+        a @= 3
+        await wait_for_var(res)
+        self.assertIs(first, unwrap(res))  # reused
+        self.assertEqual([8], first)
+        self.assertEqual({'a'}, changes_seen[-1].changed)
+
+
+@reactive(pass_args=['item'], changes=True)
+def sum_of_all(item, a, *args, append_only=False, changes=None):
+    changes_seen.append(changes)
+    return a + sum(args)
+
+
+@reactive(dep_only_args=['trigger'], changes=True)
+def sum_with_trigger(a, b, changes=None):
+    changes_seen.append(changes)
+    return a + b
+
+
+other_dep = var()
+
+
+@reactive(other_deps=[other_dep], changes=True)
+def sum_with_other_deps(a, b, changes=None):
+    changes_seen.append(changes)
+    return a + b
+
+
+@reactive_finalizable(changes=True)
+def sum_in_list(a, b, changes=None):
+    changes_seen.append(changes)
+    res = changes.previous if changes.previous is not None else []
+    res[:] = [a + b]
+    yield res
+
+
+@reactive
+def first_item(a):
+    return a[0]
+
+
+class ReadonlyArrays(asynctest.TestCase):
+    def setUp(self):
+        settings.readonly_arrays = True
+
+    def tearDown(self):
+        settings.readonly_arrays = False
+
+    async def test_readonly_view(self):
+        a = var(np.zeros(3))
+        res = reactive(lambda x: x.flags.writeable)(a)
+        self.assertFalse(unwrap(res))
+        self.assertTrue(unwrap(a).flags.writeable)
+
+    async def test_copy_on_write(self):
+        a = var(np.zeros(3))
+        res = first_item(a)
+        self.assertEqual(0, unwrap(res))
+        previous = unwrap(a)
+        with copy_on_write(a) as array:
+            array[0] = 5
+        await wait_for_var(res)
+        self.assertEqual(5, unwrap(res))
+        self.assertEqual(0, previous[0])
+
+
+@reactive
+def item_at(a, index):
+    return a[index]
+
+
+class DetectArrayMutations(asynctest.TestCase):
+    def setUp(self):
+        settings.detect_array_mutations = True
+
+    def tearDown(self):
+        settings.detect_array_mutations = False
+
+    async def test_modified_in_place(self):
+        a = var(np.zeros(3))
+        index = var(0)
+        res = item_at(a, index)
+        self.assertEqual(0, unwrap(res))
+        unwrap(a)[1] = 5  # without notifying
+        index @= 1
+        await wait_for_var(res)
+        with self.assertLogs(level='ERROR') as logs:
+            self.assertEqual(5, unwrap(res))
+        self.assertIn("passed as 'a' to 'item_at'", logs.output[0])
+
+    async def test_notified(self):
+        a = var(np.zeros(3))
+        res = item_at(a, 1)
+        self.assertEqual(0, unwrap(res))
+        with updating(a) as array:
+            array[1] = 5
+        await wait_for_var(res)
+        with self.assertNoLogs(level='ERROR'):
+            self.assertEqual(5, unwrap(res))
+
+
 # ====================================================================
 
 @reactive
@@ -0,0 +1,77 @@
+import unittest
+
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from sdupy.render_scheduler import RenderScheduler, find_render_scheduler, request_render
+
+app = QApplication.instance() or QApplication([])
+
+
+class RenderSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.window = QWidget()
+        self.scheduler = RenderScheduler(self.window, fps=60, background_fps=2)
+        self.rendered = []
+
+    def tearDown(self):
+        self.window.close()
+
+    def render(self, name):
+        return lambda: self.rendered.append(name)
+
+    def test_requests_merged(self):
+        self.scheduler.schedule('a', self.render('a1'))
+        self.scheduler.schedule('b', self.render('b'))
+        self.scheduler.schedule('a', self.render('a2'))
+        self.assertEqual(2, self.scheduler.pending())
+        self.assertEqual(1, self.scheduler.dropped_frames)
+        self.scheduler.flush()
+        self.assertEqual(['a2', 'b'], self.rendered)
+        self.assertEqual(0, self.scheduler.pending())
+        self.assertEqual(1, self.scheduler.frames)
+
+    def test_cancel(self):
+        self.scheduler.schedule('a', self.render('a'))
+        self.scheduler.schedule('b', self.render('b'))
+        self.scheduler.cancel('a')
+        self.scheduler.cancel('unknown')
+        self.scheduler.flush()
+        self.assertEqual(['b'], self.rendered)
+
+    def test_scheduled_while_flushing(self):
+        def render_a():
+            self.rendered.append('a')
+            self.scheduler.schedule('a', self.render('a again'))  # already rendered in this frame
+            self.scheduler.schedule('b', self.render('b'))
+
+        self.scheduler.schedule('a', render_a)
+        self.scheduler.flush()
+        self.assertEqual(['a', 'b'], self.rendered)
+        self.assertEqual(1, self.scheduler.pending())  # deferred to the next frame
+        self.scheduler.flush()
+        self.assertEqual(['a', 'b', 'a again'], self.rendered)
+
+    def test_errors_dont_stop_the_frame(self):
+        self.scheduler.schedule('a', lambda: 1 / 0)
+        self.scheduler.schedule('b', self.render('b'))
+        with self.assertLogs(level='ERROR'):
+            self.scheduler.flush()
+        self.assertEqual(['b'], self.rendered)
+
+    def test_background_fps(self):
+        self.assertEqual(2, self.scheduler.current_fps())  # hidden
+        self.window.show()
+        self.assertEqual(60, self.scheduler.current_fps())
+        self.window.showMinimized()
+        self.assertEqual(2, self.scheduler.current_fps())
+
+    def test_request_render(self):
+        child = QWidget(self.window)
+        self.window.render_scheduler = self.scheduler
+        self.assertIs(self.scheduler, find_render_scheduler(child))
+        request_render(child, 'a', self.render('a'))
+        self.assertEqual([], self.rendered)
+        self.scheduler.flush()
+        self.assertEqual(['a'], self.rendered)
+        request_render(QWidget(), 'b', self.render('b'))  # no scheduler: immediately
+        self.assertEqual(['a', 'b'], self.rendered)
@@ -0,0 +1,19 @@
+import unittest
+
+import numpy as np
+
+from sdupy.vis._helpers import scatter_data_to_array
+
+
+class ScatterDataToArrayTest(unittest.TestCase):
+    def test_records(self):
+        data, fields = scatter_data_to_array([dict(x=1.5, kind='a'), dict(x=2.5, kind='b')])
+        np.testing.assert_array_equal([1.5, 2.5], data['x'])
+        np.testing.assert_array_equal(['a', 'b'], data['kind'])
+        self.assertEqual(dict(mode='enum', values=['a', 'b']), dict(fields)['kind'])
+
+    def test_records_with_missing_numbers(self):
+        data, fields = scatter_data_to_array([dict(x=1, y=2), dict(x=3), dict(x=5, y=6)])
+        self.assertEqual('f', data['y'].dtype.kind)
+        np.testing.assert_array_equal([2, np.nan, 6], data['y'])
+        self.assertIn('y', dict(fields))
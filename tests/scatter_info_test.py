@@ -0,0 +1,62 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+from PyQt5.QtCore import QPointF
+from PyQt5.QtWidgets import QApplication
+
+from sdupy.vis._helpers import scatter_data_to_array
+from sdupy.widgets.pyqtgraph import PgScatter
+
+app = QApplication.instance() or QApplication([])
+
+
+class ScatterInfoTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.widget = PgScatter(None, 'scatter')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.widget.close()
+
+    def setUp(self):
+        self.set_data(n=np.arange(10) * 10)
+        # one unit per pixel, so the symbols (10 pixels wide) hit the points up to 5 units away
+        patcher = mock.patch.object(self.widget.plot.plotItem.vb, 'viewPixelSize', return_value=(1.0, 1.0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def set_data(self, n):
+        data, fields = scatter_data_to_array(dict(x=np.arange(10.), y=np.zeros(10), n=n))
+        self.widget.setFields(fields or [('x', {}), ('y', {}), ('n', {})])
+        self.widget.setData(data)
+        self.widget.fieldList.item(0).setSelected(True)  # plot y over x
+        self.widget.fieldList.item(1).setSelected(True)
+
+    def described(self, text):
+        return [int(line[3:]) for line in text.splitlines() if line.startswith('n: ')]
+
+    def test_nearest_first(self):
+        self.assertEqual([30, 40, 20], self.described(self.widget._info_text(QPointF(3.2, 4.8))))
+        self.assertEqual([30, 40, 20], [int(self.widget._visibleData[i]['n'])
+                                        for i in self.widget._points_at(QPointF(3.2, 4.8))])
+
+    def test_limited(self):
+        text = self.widget._info_text(QPointF(3.2, 0))
+        self.assertEqual([30, 40, 20, 50, 10], self.described(text))
+        self.assertTrue(text.endswith('\n...\n'))
+        self.assertEqual(self.widget.info_points + 1, len(self.widget._points_at(QPointF(3.2, 0))))
+
+        text = self.widget._info_text(QPointF(9, 4.8))
+        self.assertEqual([90, 80], self.described(text))
+        self.assertNotIn('...', text)
+
+    def test_nothing_near(self):
+        self.assertEqual('', self.widget._info_text(QPointF(30, 30)))
+
+    def test_cache_invalidated_with_data(self):
+        self.assertEqual('n: 30\nx: 3.0\ny: 0.0\n', self.widget._point_info(3))
+        self.assertIn(3, self.widget._info_cache)
+        self.set_data(n=np.arange(10) * 100)
+        self.assertEqual('n: 300\nx: 3.0\ny: 0.0\n', self.widget._point_info(3))
@@ -0,0 +1,65 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication, QDockWidget
+
+from sdupy.vis.stacks import PrefetchingStack, as_frame_stack, is_frame_stack_source
+from sdupy.widgets.pyqtgraph import PgImage
+
+app = QApplication.instance() or QApplication([])
+
+
+class PgImageStackTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # one widget for all the tests, since garbage-collecting `ImageView`s may crash
+        cls.dock = QDockWidget()
+        cls.image = PgImage(cls.dock, 'image')
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'stack.npy')
+        np.save(self.path, np.arange(10 * 4 * 6, dtype=np.float32).reshape(10, 4, 6))
+
+    def tearDown(self):
+        self.image.setImage(np.zeros((1, 1)))
+        self.dir.cleanup()
+
+    def test_memmap_is_a_stack(self):
+        self.assertIsInstance(as_frame_stack(np.load(self.path, mmap_mode='r')), PrefetchingStack)
+        self.assertIsInstance(as_frame_stack(self.path), PrefetchingStack)
+
+    def test_stack_sources(self):
+        self.assertTrue(is_frame_stack_source(np.load(self.path, mmap_mode='r')))
+        self.assertTrue(is_frame_stack_source(as_frame_stack(self.path)))
+        self.assertTrue(is_frame_stack_source(self.path))
+        self.assertTrue(is_frame_stack_source(['a.png', 'b.png']))
+        self.assertTrue(is_frame_stack_source(('a.png', 'b.png')))
+        self.assertFalse(is_frame_stack_source(np.load(self.path)))
+        self.assertFalse(is_frame_stack_source([]))
+        self.assertFalse(is_frame_stack_source([[0, 1], [2, 3]]))
+
+    def shown_frame(self):
+        image = self.image.imageItem.image
+        return image if self.image.imageItem.axisOrder == 'row-major' else image.T
+
+    def test_current_frame_shown(self):
+        self.image.setImage(as_frame_stack(self.path), axes=dict(t=0, y=1, x=2))
+        self.image.setCurrentIndex(3)
+        np.testing.assert_array_equal(np.load(self.path)[3], self.shown_frame())
+        self.assertFalse(self.image.ui.roiBtn.isEnabled())
+
+    def test_axes_respected(self):
+        self.image.setImage(as_frame_stack(self.path), axes=dict(t=0, x=1, y=2))
+        np.testing.assert_array_equal(np.load(self.path)[0].T, self.shown_frame())
+
+    def test_roi_enabled_for_arrays(self):
+        self.image.setImage(as_frame_stack(self.path), axes=dict(t=0, y=1, x=2))
+        self.image.setImage(np.load(self.path), axes=dict(t=0, y=1, x=2))
+        self.assertTrue(self.image.ui.roiBtn.isEnabled())
+
+    def test_time_axis_must_be_first(self):
+        with self.assertRaises(ValueError):
+            self.image.setImage(as_frame_stack(self.path), axes=dict(t=1, y=0, x=2))
@@ -0,0 +1,27 @@
+import unittest
+
+import numpy as np
+
+from sdupy.vis.streaming import StreamBuffer
+
+
+class StreamBufferTest(unittest.TestCase):
+    def append_chunks(self, buffer):
+        rng = np.random.default_rng(0)
+        appended = np.zeros(0)
+        for i in range(200):
+            chunk = rng.normal(size=rng.integers(0, 150))
+            buffer.append(chunk)
+            appended = np.concatenate([appended, chunk])
+            yield appended
+
+    def test_unbounded_keeps_everything(self):
+        buffer = StreamBuffer(capacity=4)
+        for appended in self.append_chunks(buffer):
+            np.testing.assert_array_equal(appended, buffer.data)
+
+    def test_bounded_keeps_last_samples(self):
+        buffer = StreamBuffer(max_samples=100)
+        for appended in self.append_chunks(buffer):
+            np.testing.assert_array_equal(appended[-100:], buffer.data)
+        self.assertEqual(200, len(buffer._data))  # never reallocated
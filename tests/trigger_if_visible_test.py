@@ -0,0 +1,77 @@
+import asynctest
+from PyQt5.QtWidgets import QApplication, QWidget
+
+from sdupy.pyreactive import reactive, var, wait_for_var
+from sdupy.render_scheduler import RenderScheduler
+from sdupy.widgets.helpers import trigger_if_visible
+
+app = QApplication.instance() or QApplication([])
+
+calls = []
+
+
+@reactive
+def record_call(a):
+    calls.append(a)
+    return a
+
+
+class TriggerIfVisibleTest(asynctest.TestCase):
+    def setUp(self):
+        calls.clear()
+        self.widget = QWidget()
+        self.widget.resize(100, 100)
+        self.a = var(0)
+        self.res = record_call(self.a)
+
+    def tearDown(self):
+        self.trigger._cleanup()
+        self.widget.close()
+
+    async def change(self, value):
+        self.a @= value
+        await wait_for_var()
+        app.processEvents()
+
+    async def test_visible(self):
+        self.widget.show()
+        self.trigger = trigger_if_visible(self.res, self.widget)
+        self.assertTrue(self.trigger._subscribed)
+        self.assertEqual([0], calls)
+        await self.change(1)
+        self.assertEqual([0, 1], calls)
+
+    async def test_hidden_then_shown(self):
+        self.trigger = trigger_if_visible(self.res, self.widget)
+        self.assertFalse(self.trigger._subscribed)
+        await self.change(1)
+        await self.change(2)
+        self.assertEqual([], calls)
+        self.widget.show()
+        self.assertTrue(self.trigger._subscribed)
+        self.assertEqual([2], calls)  # the latest value, once
+
+    async def test_hidden_after_shown(self):
+        self.widget.show()
+        self.trigger = trigger_if_visible(self.res, self.widget)
+        self.widget.hide()
+        self.assertFalse(self.trigger._subscribed)
+        await self.change(1)
+        self.assertEqual([0], calls)
+
+    async def test_collapsed(self):
+        self.widget.show()
+        self.trigger = trigger_if_visible(self.res, self.widget)
+        self.widget.resize(0, 100)
+        self.assertFalse(self.trigger._subscribed)
+
+    async def test_pending_render_cancelled_when_hidden(self):
+        self.widget.render_scheduler = RenderScheduler(self.widget)
+        self.widget.show()
+        self.trigger = trigger_if_visible(self.res, self.widget)
+        self.widget.render_scheduler.flush()
+        self.a @= 1
+        await wait_for_var()
+        self.assertEqual(1, self.widget.render_scheduler.pending())
+        self.widget.hide()
+        self.assertEqual(0, self.widget.render_scheduler.pending())
@@ -0,0 +1,39 @@
+import asynctest
+
+from sdupy.pyreactive import reactive_map, unwrap, wait_for_var
+from sdupy.pyreactive.var import var
+
+
+class ReactiveMap(asynctest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+    def double(self, x):
+        self.calls.append(x)
+        return 2 * x
+
+    async def test_raw(self):
+        self.assertEqual([2, 4], reactive_map(self.double, [1, 2]))
+
+    async def test_recompute_only_changed(self):
+        a, b, c = 'a', 'b', 'c'
+        collection = var([a, b])
+        res = reactive_map(self.double, collection)
+        self.assertEqual(['aa', 'bb'], unwrap(res))
+        self.assertEqual(['a', 'b'], self.calls)
+
+        collection @= [a, c]
+        await wait_for_var(res)
+        self.assertEqual(['aa', 'cc'], unwrap(res))
+        self.assertEqual(['a', 'b', 'c'], self.calls)
+
+    async def test_key(self):
+        records = [dict(id=1), dict(id=2), dict(id=3)]
+        collection = var(records)
+        res = reactive_map(lambda r: self.double(r['id']), collection, key=lambda r: r['id'])
+        self.assertEqual([2, 4, 6], unwrap(res))
+
+        collection @= [dict(id=0)] + records[1:]
+        await wait_for_var(res)
+        self.assertEqual([0, 4, 6], unwrap(res))
+        self.assertEqual([1, 2, 3, 0], self.calls)
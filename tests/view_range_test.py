@@ -0,0 +1,50 @@
+import unittest
+
+import matplotlib.figure
+from PyQt5.QtWidgets import QApplication
+
+from sdupy.pyreactive import unwrap
+from sdupy.pyreactive.wrappers.axes import ReactiveAxes
+from sdupy.pyreactive.wrapping import get_subnotifier
+from sdupy.vis.view_range import ViewRange, ViewRangeWatcher, view_range_mpl
+
+app = QApplication.instance() or QApplication([])  # for the timers of the watcher
+
+
+class ViewRangeTest(unittest.TestCase):
+    def setUp(self):
+        figure = matplotlib.figure.Figure(figsize=(4, 2), dpi=100)
+        self.axes = figure.add_axes((0, 0, 1, 1))
+        self.axes.set_xlim(0, 400)
+        self.axes.set_ylim(0, 100)
+
+    def test_mpl(self):
+        self.assertEqual(ViewRange(0, 400, 0, 100, 1, 0.5), view_range_mpl(self.axes))
+
+    def test_mpl_inverted(self):
+        self.axes.set_ylim(100, 0)
+        self.assertEqual(ViewRange(0, 400, 0, 100, 1, 0.5), view_range_mpl(self.axes))
+
+    def test_watcher_follows_limits(self):
+        watcher = ViewRangeWatcher(self.axes)
+        self.axes.set_xlim(100, 200)
+        watcher._proxy.flush()
+        self.assertEqual(ViewRange(100, 200, 0, 100, 0.25, 0.5), unwrap(watcher.var))
+        self.axes.set_ylim(10, 20)
+        watcher._proxy.flush()
+        self.assertEqual((10, 20), unwrap(watcher.var)[2:4])
+
+    def test_rate_limit(self):
+        watcher = ViewRangeWatcher(self.axes, rate_limit=5)
+        self.assertEqual(5, watcher._proxy.rateLimit)
+        watcher.set_rate_limit(60)
+        self.assertEqual(60, watcher._proxy.rateLimit)
+
+    def test_reactive_axes_ylim(self):
+        axes = ReactiveAxes(self.axes)
+        xlim, ylim = get_subnotifier(axes, 'xlim').version, get_subnotifier(axes, 'ylim').version
+        unwrap(axes.set_ylim(5, 6))
+        self.assertEqual((5, 6), tuple(self.axes.get_ylim()))
+        self.assertEqual((0, 400), tuple(self.axes.get_xlim()))
+        self.assertEqual(xlim, get_subnotifier(axes, 'xlim').version)
+        self.assertEqual(ylim + 1, get_subnotifier(axes, 'ylim').version)